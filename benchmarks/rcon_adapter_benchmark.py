@@ -0,0 +1,229 @@
+# benchmarks/rcon_adapter_benchmark.py
+"""
+Пропускная способность и задержки RconClientAdapter против локального
+fake RCON сервера (tests/fake_rcon_server.py).
+
+Сервер запускается отдельным процессом, поэтому CPU на команду - это
+только клиентская сторона (адаптер, пул, протокол).
+
+Запуск из корня проекта:
+    python -m benchmarks.rcon_adapter_benchmark --commands 5000 --concurrency 32 \\
+        --mix "list:5,say hi:3,time query daytime:2" --latency 0.002 \\
+        --output benchmarks/results/current.json --compare benchmarks/results/previous.json
+
+По умолчанию ограничение частоты и кэш ответов отключены, чтобы мерить
+сам адаптер; --realistic оставляет настройки из конфигурации.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from infrastructure.adapters.rcon_client import RconClientAdapter
+from infrastructure.adapters.rcon_pool import rcon_pool
+from infrastructure.adapters.rcon_cache import rcon_response_cache
+from infrastructure.adapters.rcon_limiter import rcon_limiters
+from infrastructure.adapters.rcon_circuit_breaker import rcon_breakers
+
+FAKE_SERVER = Path(__file__).resolve().parent.parent / "tests" / "fake_rcon_server.py"
+PASSWORD = "benchmark"
+
+
+def parse_mix(value: str) -> List[Tuple[str, int]]:
+    """'list:5,say hi:3' -> [('list', 5), ('say hi', 3)]"""
+    mix = []
+    for item in value.split(","):
+        command, _, weight = item.rpartition(":")
+        if not command:
+            command, weight = weight, "1"
+        mix.append((command.strip(), int(weight)))
+    return mix
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def start_server(port: int, latency: float, jitter: float) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [
+            sys.executable, str(FAKE_SERVER),
+            "--port", str(port),
+            "--password", PASSWORD,
+            "--latency", str(latency),
+            "--jitter", str(jitter),
+        ],
+        stdout=subprocess.DEVNULL
+    )
+
+    for _ in range(100):
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            await writer.wait_closed()
+            return process
+        except OSError:
+            await asyncio.sleep(0.05)
+
+    process.kill()
+    raise RuntimeError("Fake RCON сервер не запустился")
+
+
+def percentile(values: List[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+async def run_load(client: RconClientAdapter, commands: int, concurrency: int,
+                   mix: List[Tuple[str, int]], seed: int) -> Tuple[List[float], Dict[str, int]]:
+    """Выполняет commands команд в concurrency параллельных потоков"""
+    rng = random.Random(seed)
+    names = [command for command, _ in mix]
+    weights = [weight for _, weight in mix]
+    plan = rng.choices(names, weights=weights, k=commands)
+
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    position = 0
+
+    async def worker():
+        nonlocal position
+        while position < len(plan):
+            command = plan[position]
+            position += 1
+
+            started = time.perf_counter()
+            try:
+                await client.execute_command(command)
+            except Exception as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+async def benchmark(args) -> dict:
+    if not args.realistic:
+        rcon_response_cache.ttls = {}
+        rcon_limiters.rate = 0
+        rcon_limiters.concurrency = max(args.concurrency, rcon_pool.max_size)
+        rcon_limiters.queue_size = args.concurrency + 1
+
+    port = free_port()
+    server = await start_server(port, args.latency, args.jitter)
+    try:
+        client = RconClientAdapter("127.0.0.1", port, PASSWORD)
+        mix = parse_mix(args.mix)
+
+        # Прогрев: соединения пула уже открыты, как в работающем боте
+        await run_load(client, min(args.commands, args.concurrency * 4), args.concurrency, mix, args.seed)
+        opened_before = rcon_pool.opened
+
+        cpu_started = time.process_time()
+        started = time.perf_counter()
+        latencies, errors = await run_load(client, args.commands, args.concurrency, mix, args.seed)
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_started
+    finally:
+        await rcon_pool.close_all()
+        rcon_breakers.stop()
+        server.terminate()
+        server.wait()
+
+    completed = len(latencies)
+    return {
+        "label": args.label,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {
+            "commands": args.commands,
+            "concurrency": args.concurrency,
+            "mix": args.mix,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "realistic": args.realistic,
+            "pool_max_size": rcon_pool.max_size,
+        },
+        "results": {
+            "completed": completed,
+            "errors": errors,
+            "duration_s": round(elapsed, 3),
+            "throughput_per_s": round(completed / elapsed, 1) if elapsed else 0,
+            "latency_ms": {
+                "mean": round(statistics.fmean(latencies) * 1000, 3) if latencies else 0,
+                "p50": round(percentile(latencies, 50) * 1000, 3),
+                "p90": round(percentile(latencies, 90) * 1000, 3),
+                "p99": round(percentile(latencies, 99) * 1000, 3),
+                "max": round(max(latencies) * 1000, 3) if latencies else 0,
+            },
+            "connections_opened": rcon_pool.opened,
+            "connections_opened_under_load": rcon_pool.opened - opened_before,
+            "cpu_ms_per_command": round(cpu / args.commands * 1000, 4) if args.commands else 0,
+        },
+    }
+
+
+def compare(current: dict, previous: dict) -> List[str]:
+    """Изменение ключевых метрик относительно прошлого запуска"""
+    lines = [f"Сравнение с '{previous.get('label')}' ({previous.get('timestamp')}):"]
+    metrics = [
+        ("throughput_per_s", lambda r: r["throughput_per_s"], True),
+        ("p50_ms", lambda r: r["latency_ms"]["p50"], False),
+        ("p99_ms", lambda r: r["latency_ms"]["p99"], False),
+        ("cpu_ms_per_command", lambda r: r["cpu_ms_per_command"], False),
+    ]
+    for name, get, higher_is_better in metrics:
+        before, after = get(previous["results"]), get(current["results"])
+        if not before:
+            continue
+        change = (after - before) / before * 100
+        worse = change < 0 if higher_is_better else change > 0
+        marker = "⚠️" if worse and abs(change) >= 10 else "  "
+        lines.append(f"   {marker} {name:20} {before:>10} -> {after:<10} ({change:+.1f}%)")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк RconClientAdapter")
+    parser.add_argument("--commands", type=int, default=2000, help="Количество команд")
+    parser.add_argument("--concurrency", type=int, default=16, help="Параллельных отправителей")
+    parser.add_argument("--mix", default="list:5,say hi:3,time query daytime:2",
+                        help="Смесь команд с весами: 'команда:вес,...'")
+    parser.add_argument("--latency", type=float, default=0.0, help="Задержка сервера на команду, с")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Случайная добавка к задержке, с")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--realistic", action="store_true",
+                        help="Оставить кэш и ограничение частоты из настроек")
+    parser.add_argument("--label", default="local", help="Метка запуска (версия, ветка)")
+    parser.add_argument("--output", type=Path, help="Куда сохранить результат в JSON")
+    parser.add_argument("--compare", type=Path, help="JSON прошлого запуска для сравнения")
+    args = parser.parse_args()
+
+    result = asyncio.run(benchmark(args))
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    if args.compare:
+        previous: Optional[dict] = json.loads(args.compare.read_text(encoding="utf-8"))
+        print("\n".join(compare(result, previous)))
+
+
+if __name__ == "__main__":
+    main()
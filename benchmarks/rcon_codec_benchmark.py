@@ -0,0 +1,140 @@
+# benchmarks/rcon_codec_benchmark.py
+"""
+Сравнение кодека RCON пакетов с реализацией из библиотеки rcon.
+
+Запуск из корня проекта:
+    python -m benchmarks.rcon_codec_benchmark [--packets 100000]
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from io import BytesIO
+
+from rcon.source.proto import LittleEndianSignedInt32, Packet, Type
+
+from infrastructure.adapters.rcon_codec import (
+    SERVERDATA_EXECCOMMAND,
+    SERVERDATA_RESPONSE_VALUE,
+    PacketReader,
+    encode_packet,
+)
+
+COMMAND = b"list"
+# Фрагмент длинного ответа (help, список игроков) - максимальный пакет Minecraft
+RESPONSE_PAYLOAD = b"x" * 4096
+# Сколько пакетов приходит за один вызов data_received
+PACKETS_PER_READ = 4
+
+
+def encode_rcon():
+    def run(count: int):
+        for request_id in range(1, count + 1):
+            bytes(Packet(LittleEndianSignedInt32(request_id), Type.SERVERDATA_EXECCOMMAND, COMMAND))
+    return run
+
+
+def encode_codec():
+    def run(count: int):
+        for request_id in range(1, count + 1):
+            encode_packet(request_id, SERVERDATA_EXECCOMMAND, COMMAND)
+    return run
+
+
+def make_chunk() -> bytes:
+    return b"".join(
+        bytes(encode_packet(request_id, SERVERDATA_RESPONSE_VALUE, RESPONSE_PAYLOAD))
+        for request_id in range(1, PACKETS_PER_READ + 1)
+    )
+
+
+def decode_rcon():
+    """Прежний путь: общий bytearray, срез и Packet.read(BytesIO(...)) на каждый пакет"""
+    chunk = make_chunk()
+    buffer = bytearray()
+
+    def run(count: int):
+        for _ in range(count // PACKETS_PER_READ):
+            buffer.extend(chunk)
+            offset = 0
+            while len(buffer) - offset >= 4:
+                size = int.from_bytes(buffer[offset:offset + 4], "little", signed=True)
+                if len(buffer) - offset < 4 + size:
+                    break
+                packet = Packet.read(BytesIO(buffer[offset:offset + 4 + size]))
+                offset += 4 + size
+                len(packet.payload)
+            del buffer[:offset]
+    return run
+
+
+def decode_codec():
+    chunk = make_chunk()
+    reader = PacketReader()
+
+    def run(count: int):
+        for _ in range(count // PACKETS_PER_READ):
+            reader.feed(chunk)
+            for _, _, payload in reader.read_packets():
+                len(payload)
+    return run
+
+
+def measure(factory, count: int) -> dict:
+    """Время на пакет и пик дополнительной памяти на одно чтение из сокета"""
+    run = factory()
+    run(min(count, 1000))  # прогрев, буферы уже выделены
+
+    started = time.perf_counter()
+    run(count)
+    elapsed = time.perf_counter() - started
+
+    # Отдельный прогон под трассировкой (tracemalloc сильно замедляет код):
+    # сколько памяти сверх уже выделенных буферов нужно на одно чтение
+    tracemalloc.start()
+    run(PACKETS_PER_READ)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "packets_per_sec": round(count / elapsed),
+        "us_per_packet": round(elapsed / count * 1_000_000, 3),
+        "peak_bytes_per_read": peak,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк кодека RCON пакетов")
+    parser.add_argument("--packets", type=int, default=100_000, help="Количество пакетов в прогоне")
+    parser.add_argument("--json", action="store_true", help="Вывести результат в JSON")
+    args = parser.parse_args()
+
+    results = {
+        "encode": {
+            "rcon.source": measure(encode_rcon, args.packets),
+            "rcon_codec": measure(encode_codec, args.packets),
+        },
+        "decode": {
+            "rcon.source": measure(decode_rcon, args.packets),
+            "rcon_codec": measure(decode_codec, args.packets),
+        },
+    }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    for operation, variants in results.items():
+        print(f"{operation}:")
+        for name, stats in variants.items():
+            print(
+                f"   {name:12} {stats['packets_per_sec']:>10} пакетов/с  "
+                f"{stats['us_per_packet']:>8} мкс/пакет  "
+                f"{stats['peak_bytes_per_read']:>8} байт на чтение"
+            )
+        baseline, codec = variants["rcon.source"], variants["rcon_codec"]
+        print(f"   ускорение: x{baseline['us_per_packet'] / codec['us_per_packet']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
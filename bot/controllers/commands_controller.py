@@ -1,26 +1,25 @@
 # bot/controllers/commands_controller.py
+from typing import Optional
+
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 
 from domain.services.command_validator import CommandValidator, CommandType
-from infrastructure.adapters.rcon_client import RconClientAdapter
-from infrastructure.adapters.crypto import CryptoService
 from bot.keyboards.commands_menu import get_commands_keyboard, get_confirmation_keyboard
+from bot.utils.auth import resolve_auth
+from bot.utils.players import query_player_list
+from domain.services.session_manager import AuthContext
 
 router = Router()
 command_validator = CommandValidator()
-crypto = CryptoService()
 
 
 @router.message(Command("commands"))
-async def cmd_commands(message: Message):
+async def cmd_commands(message: Message, auth: Optional[AuthContext] = None):
     """Меню быстрых команд"""
-    # Получаем session_manager из бота
-    session_manager = getattr(message.bot, 'session_manager', None)
-
-    if not session_manager or not await session_manager.is_authorized(message.from_user.id):
+    if not await resolve_auth(message.bot, message.from_user.id, auth):
         await message.answer("🔒 Сначала авторизуйтесь через /start")
         return
 
@@ -43,37 +42,23 @@ async def cmd_commands(message: Message):
 
 
 @router.message(Command("list"))
-async def cmd_list(message: Message):
+async def cmd_list(message: Message, auth: Optional[AuthContext] = None):
     """Команда list - список игроков"""
-    # Получаем session_manager из бота
-    session_manager = getattr(message.bot, 'session_manager', None)
-
-    if not session_manager:
-        await message.answer("❌ Ошибка системы: менеджер сессий не доступен")
-        return
-
-    # Проверяем авторизацию
-    if not await session_manager.is_authorized(message.from_user.id):
+    auth = await resolve_auth(message.bot, message.from_user.id, auth)
+    if not auth:
         await message.answer("🔒 Сначала авторизуйтесь через /start")
         return
 
-    # Получаем информацию о сервере
-    server_info = await session_manager.get_server(message.from_user.id)
-    if not server_info:
-        await message.answer("❌ Сервер не найден. Пожалуйста, авторизуйтесь заново.")
+    # RCON клиент сессии (кэшируется вместе с сессией)
+    rcon_client = auth.rcon_client
+
+    # Если на сервере включен Query, список берется без RCON
+    players_text = await query_player_list(rcon_client.host)
+    if players_text:
+        await message.answer(players_text, parse_mode="Markdown")
         return
 
     try:
-        # Дешифруем пароль
-        password = crypto.decrypt(server_info["encrypted_password"])
-
-        # Выполняем команду
-        rcon_client = RconClientAdapter(
-            server_info["host"],
-            server_info["port"],
-            password
-        )
-
         await message.answer("⏳ Получаю список игроков...")
         result = await rcon_client.execute_command("list")
 
@@ -89,17 +74,15 @@ async def cmd_list(message: Message):
 
 
 @router.message(Command("save"))
-async def cmd_save(message: Message):
+async def cmd_save(message: Message, auth: Optional[AuthContext] = None):
     """Команда save-all - сохранить мир"""
-    await execute_simple_command(message, "save-all", "💾 Мир сохранен")
+    await execute_simple_command(message, "save-all", "💾 Мир сохранен", auth)
 
 
 @router.message(Command("stop"))
-async def cmd_stop(message: Message, state: FSMContext):
+async def cmd_stop(message: Message, state: FSMContext, auth: Optional[AuthContext] = None):
     """Команда stop - остановить сервер (требует подтверждения)"""
-    session_manager = getattr(message.bot, 'session_manager', None)
-
-    if not session_manager or not await session_manager.is_authorized(message.from_user.id):
+    if not await resolve_auth(message.bot, message.from_user.id, auth):
         await message.answer("🔒 Сначала авторизуйтесь через /start")
         return
 
@@ -118,9 +101,9 @@ async def cmd_stop(message: Message, state: FSMContext):
 
 
 @router.callback_query(F.data == "confirm_stop")
-async def confirm_stop(callback: CallbackQuery, state: FSMContext):
+async def confirm_stop(callback: CallbackQuery, state: FSMContext, auth: Optional[AuthContext] = None):
     """Подтверждение остановки сервера"""
-    await execute_simple_command(callback.message, "stop", "🛑 Сервер остановлен")
+    await execute_simple_command(callback.message, "stop", "🛑 Сервер остановлен", auth)
     await state.clear()
     await callback.answer("✅ Сервер остановлен")
 
@@ -134,7 +117,7 @@ async def cancel_stop(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(Command("time"))
-async def cmd_time(message: Message):
+async def cmd_time(message: Message, auth: Optional[AuthContext] = None):
     """Установка времени"""
     args = message.text.split()[1:] if len(message.text.split()) > 1 else []
 
@@ -143,11 +126,11 @@ async def cmd_time(message: Message):
         return
 
     command = f"time {' '.join(args)}"
-    await execute_simple_command(message, command, f"⏰ Время установлено: {' '.join(args)}")
+    await execute_simple_command(message, command, f"⏰ Время установлено: {' '.join(args)}", auth)
 
 
 @router.message(Command("weather"))
-async def cmd_weather(message: Message):
+async def cmd_weather(message: Message, auth: Optional[AuthContext] = None):
     """Установка погоды"""
     args = message.text.split()[1:] if len(message.text.split()) > 1 else []
 
@@ -156,11 +139,11 @@ async def cmd_weather(message: Message):
         return
 
     command = f"weather {' '.join(args)}"
-    await execute_simple_command(message, command, f"🌤️ Погода установлена: {' '.join(args)}")
+    await execute_simple_command(message, command, f"🌤️ Погода установлена: {' '.join(args)}", auth)
 
 
 @router.message(Command("say"))
-async def cmd_say(message: Message):
+async def cmd_say(message: Message, auth: Optional[AuthContext] = None):
     """Сообщение от сервера"""
     args = message.text.split()[1:] if len(message.text.split()) > 1 else []
 
@@ -169,11 +152,11 @@ async def cmd_say(message: Message):
         return
 
     command = f"say {' '.join(args)}"
-    await execute_simple_command(message, command, f"📢 Сообщение отправлено")
+    await execute_simple_command(message, command, f"📢 Сообщение отправлено", auth)
 
 
 @router.message(Command("gamemode"))
-async def cmd_gamemode(message: Message):
+async def cmd_gamemode(message: Message, auth: Optional[AuthContext] = None):
     """Смена режима игры"""
     args = message.text.split()[1:] if len(message.text.split()) > 1 else []
 
@@ -182,20 +165,15 @@ async def cmd_gamemode(message: Message):
         return
 
     command = f"gamemode {' '.join(args)}"
-    await execute_simple_command(message, command, f"🎮 Режим игры изменен")
+    await execute_simple_command(message, command, f"🎮 Режим игры изменен", auth)
 
 
-async def execute_simple_command(message: Message, command: str, success_message: str):
+async def execute_simple_command(message: Message, command: str, success_message: str,
+                                 auth: Optional[AuthContext] = None):
     """Выполнение простой команды"""
-    # Получаем session_manager из бота
-    session_manager = getattr(message.bot, 'session_manager', None)
-
-    if not session_manager:
-        await message.answer("❌ Ошибка системы: менеджер сессий не доступен")
-        return
-
     # Проверяем авторизацию
-    if not await session_manager.is_authorized(message.from_user.id):
+    auth = await resolve_auth(message.bot, message.from_user.id, auth)
+    if not auth:
         await message.answer("🔒 Сначала авторизуйтесь через /start")
         return
 
@@ -209,23 +187,10 @@ async def execute_simple_command(message: Message, command: str, success_message
     if command_validator.is_dangerous_command(command):
         await message.answer(f"⚠️ Команда '{command}' является опасной. Будьте осторожны!")
 
-    # Получаем информацию о сервере
-    server_info = await session_manager.get_server(message.from_user.id)
-    if not server_info:
-        await message.answer("❌ Сервер не найден. Пожалуйста, авторизуйтесь заново.")
-        return
+    # RCON клиент сессии (кэшируется вместе с сессией)
+    rcon_client = auth.rcon_client
 
     try:
-        # Дешифруем пароль
-        password = crypto.decrypt(server_info["encrypted_password"])
-
-        # Выполняем команду
-        rcon_client = RconClientAdapter(
-            server_info["host"],
-            server_info["port"],
-            password
-        )
-
         await message.answer(f"⏳ Выполняю команду: `{command}`", parse_mode="Markdown")
         result = await rcon_client.execute_command(command)
 
@@ -241,7 +206,7 @@ async def execute_simple_command(message: Message, command: str, success_message
 
 
 @router.callback_query(F.data.startswith("cmd_"))
-async def quick_command(callback: CallbackQuery):
+async def quick_command(callback: CallbackQuery, auth: Optional[AuthContext] = None):
     """Обработка быстрых команд из меню"""
     command_map = {
         "cmd_list": "list",
@@ -259,19 +224,19 @@ async def quick_command(callback: CallbackQuery):
         message.from_user = callback.from_user
 
         if cmd_key == "cmd_list":
-            await cmd_list(message)
+            await cmd_list(message, auth)
         elif cmd_key == "cmd_save":
-            await cmd_save(message)
+            await cmd_save(message, auth)
         elif cmd_key == "cmd_time":
-            await cmd_time(message)
+            await cmd_time(message, auth)
         elif cmd_key == "cmd_weather":
-            await cmd_weather(message)
+            await cmd_weather(message, auth)
 
     await callback.answer()
 
 
 @router.callback_query(F.data == "refresh_commands")
-async def refresh_commands(callback: CallbackQuery):
+async def refresh_commands(callback: CallbackQuery, auth: Optional[AuthContext] = None):
     """Обновление меню команд"""
-    await cmd_commands(callback.message)
+    await cmd_commands(callback.message, auth)
     await callback.answer("🔄 Меню обновлено")
\ No newline at end of file
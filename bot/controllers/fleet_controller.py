@@ -0,0 +1,180 @@
+# bot/controllers/fleet_controller.py
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional
+
+from aiogram import Router
+from aiogram.types import Message
+from aiogram.filters import Command, CommandObject
+from aiogram.exceptions import TelegramBadRequest
+
+from bot.utils.auth import resolve_auth
+from loggers import logger
+from config.settings import settings
+from domain.services.command_validator import CommandValidator
+from domain.services.session_manager import AuthContext
+from infrastructure.adapters.rcon_client import RconClientAdapter
+from infrastructure.adapters.crypto import CryptoService
+
+router = Router()
+command_validator = CommandValidator()
+
+
+@dataclass
+class FleetServer:
+    """Сервер пользователя (копия полей модели, чтобы не держать сессию БД)"""
+    id: int
+    name: str
+    host: str
+    port: int
+    encrypted_password: bytes
+
+
+@dataclass
+class FleetResult:
+    server: FleetServer
+    success: bool
+    output: str
+    elapsed: float
+
+
+async def execute_on_servers(servers: List[FleetServer], command: str, crypto: CryptoService,
+                             concurrency: int) -> AsyncIterator[FleetResult]:
+    """
+    Выполняет команду на всех серверах параллельно (не больше concurrency
+    одновременно) и отдает результаты по мере готовности.
+
+    crypto - тот же CryptoService, которым зашифрованы пароли серверов
+    (SessionManager.crypto).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(server: FleetServer) -> FleetResult:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                password = crypto.decrypt(server.encrypted_password)
+                client = RconClientAdapter(server.host, server.port, password)
+                success, output = await client.send_command(command)
+            except Exception as e:
+                success, output = False, f"Ошибка: {e}"
+            return FleetResult(server, success, output, time.perf_counter() - started)
+
+    tasks = [asyncio.create_task(run(server)) for server in servers]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def format_fleet_report(command: str, servers: List[FleetServer], results: dict,
+                        elapsed: Optional[float] = None) -> str:
+    """Текст сообщения с результатами по серверам"""
+    lines = [f"📡 {command} → {len(servers)} серв.", ""]
+
+    for server in servers:
+        result: Optional[FleetResult] = results.get(server.id)
+        if result is None:
+            lines.append(f"⏳ {server.name}")
+            continue
+
+        output = result.output.strip().splitlines()[0][:100] if result.output.strip() else "готово"
+        icon = "✅" if result.success else "❌"
+        lines.append(f"{icon} {server.name} ({result.elapsed * 1000:.0f} мс): {output}")
+
+    if elapsed is not None:
+        failed = sum(1 for result in results.values() if not result.success)
+        lines.append("")
+        lines.append(f"⏱ Готово за {elapsed:.2f}с, ошибок: {failed}/{len(servers)}")
+
+    return "\n".join(lines)
+
+
+async def _load_user_servers(session_manager, user_id: int) -> List[FleetServer]:
+    async with session_manager.database.session_scope() as repos:
+        servers = await repos['servers'].get_user_servers(user_id)
+        return [
+            FleetServer(
+                id=server.id,
+                name=server.name or f"{server.host}:{server.port}",
+                host=server.host,
+                port=server.port,
+                encrypted_password=server.encrypted_password
+            )
+            for server in servers
+        ]
+
+
+async def run_fleet_command(message: Message, command: str, auth: Optional[AuthContext] = None):
+    """Выполнение команды на всех серверах пользователя"""
+    session_manager = getattr(message.bot, 'session_manager', None)
+
+    if not await resolve_auth(message.bot, message.from_user.id, auth):
+        await message.answer("🔒 Сначала авторизуйтесь через /start")
+        return
+
+    command = command.strip()
+    is_valid, _, error = command_validator.validate_command(command)
+    if not is_valid:
+        await message.answer(f"❌ {error}")
+        return
+
+    if command_validator.is_dangerous_command(command.lower()):
+        await message.answer("⛔ Опасные команды нельзя выполнять сразу на всех серверах")
+        return
+
+    servers = await _load_user_servers(session_manager, message.from_user.id)
+    if not servers:
+        await message.answer("❌ У вас нет сохраненных серверов")
+        return
+
+    results = {}
+    started = time.perf_counter()
+    status_message = await message.answer(format_fleet_report(command, servers, results))
+    last_edit = time.monotonic()
+
+    results_stream = execute_on_servers(servers, command, session_manager.crypto, settings.FLEET_MAX_CONCURRENCY)
+    async for result in results_stream:
+        results[result.server.id] = result
+
+        # Telegram ограничивает частоту правок сообщения - обновляем не чаще интервала
+        if len(results) < len(servers) and time.monotonic() - last_edit >= settings.FLEET_EDIT_INTERVAL:
+            await _edit_report(status_message, format_fleet_report(command, servers, results))
+            last_edit = time.monotonic()
+
+    elapsed = time.perf_counter() - started
+    await _edit_report(status_message, format_fleet_report(command, servers, results, elapsed))
+    logger.info(
+        f"📡 Пользователь {message.from_user.id}: '{command}' на {len(servers)} серверах за {elapsed:.2f}с"
+    )
+
+
+async def _edit_report(status_message: Message, text: str):
+    try:
+        await status_message.edit_text(text)
+    except TelegramBadRequest as e:
+        # "message is not modified" и подобные - не критично
+        logger.debug(f"Не удалось обновить сообщение: {e}")
+
+
+@router.message(Command("fleet"))
+async def cmd_fleet(message: Message, command: CommandObject, auth: Optional[AuthContext] = None):
+    """Команда на всех серверах: /fleet save-all"""
+    if not command.args:
+        await message.answer("Использование: /fleet <команда>\nНапример: /fleet save-all")
+        return
+
+    await run_fleet_command(message, command.args, auth)
+
+
+@router.message(Command("broadcast"))
+async def cmd_broadcast(message: Message, command: CommandObject, auth: Optional[AuthContext] = None):
+    """Сообщение на всех серверах: /broadcast <текст>"""
+    if not command.args:
+        await message.answer("Использование: /broadcast <текст>")
+        return
+
+    await run_fleet_command(message, f"say {command.args}", auth)
@@ -16,6 +16,9 @@ async def cmd_help(message: Message):
         "• /list - Список игроков\n"
         "• /save - Сохранить мир\n"
         "• /stop - Остановить сервер\n\n"
+        "*Все серверы сразу:*\n"
+        "• /fleet <команда> - Команда на всех серверах\n"
+        "• /broadcast <текст> - Сообщение на всех серверах\n\n"
         "Для навигации также используйте кнопки меню."
     )
 
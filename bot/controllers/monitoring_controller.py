@@ -1,69 +1,77 @@
+from typing import Optional
+
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
+from aiogram.exceptions import TelegramBadRequest
 
 from bot.keyboards.monitoring_menu import get_monitoring_keyboard
+from bot.utils.auth import resolve_auth
+from bot.utils.players import query_player_list
+from bot.utils.status import format_status_lines, get_server_snapshot
+from config.settings import settings
+from domain.services.session_manager import AuthContext
 
 router = Router()
 
 
-@router.message(Command("monitor"))
-async def cmd_monitor(message: Message):
-    """Мониторинг сервера"""
-    # Получаем session_manager из бота
-    session_manager = getattr(message.bot, 'session_manager', None)
-
-    if not session_manager:
-        await message.answer("❌ Ошибка системы: менеджер сессий не доступен")
-        return
+async def build_monitor_text(bot, user_id: int, refresh: bool = False,
+                             auth: Optional[AuthContext] = None) -> str:
+    """Текст мониторинга сервера текущей сессии"""
+    auth = await resolve_auth(bot, user_id, auth)
+    if not auth:
+        return "🔒 Сначала авторизуйтесь через /start"
 
-    if not await session_manager.is_authorized(message.from_user.id):
-        await message.answer("🔒 Сначала авторизуйтесь через /start")
-        return
+    snapshot = await get_server_snapshot(bot, auth.server, refresh=refresh)
+    if snapshot is None:
+        return "❌ Мониторинг серверов не запущен"
 
-    # Заглушка - здесь будет реальный мониторинг
-    text = (
+    return (
         "📊 *Мониторинг сервера*\n\n"
-        "🟢 Статус: Online\n"
-        "👥 Игроки: 5/20\n"
-        "⚡ TPS: 19.8\n"
-        "💾 Память: 1.2/4.0 GB\n"
-        "⏰ Аптайм: 12ч 34м\n"
-        "🌡️ CPU: 45%\n\n"
-        "_Данные обновляются каждые 5 минут_"
+        f"{format_status_lines(snapshot)}\n"
+        f"_Данные обновляются каждые {settings.MONITORING_INTERVAL_MINUTES} мин_"
     )
 
+
+@router.message(Command("monitor"))
+async def cmd_monitor(message: Message, auth: Optional[AuthContext] = None):
+    """Мониторинг сервера"""
     await message.answer(
-        text,
+        await build_monitor_text(message.bot, message.from_user.id, auth=auth),
         parse_mode="Markdown",
         reply_markup=get_monitoring_keyboard()
     )
 
 
 @router.callback_query(F.data == "monitoring")
-async def monitoring_callback(callback: CallbackQuery):
+async def monitoring_callback(callback: CallbackQuery, auth: Optional[AuthContext] = None):
     """Колбэк для мониторинга"""
-    await cmd_monitor(callback.message)
+    await callback.message.answer(
+        await build_monitor_text(callback.bot, callback.from_user.id, auth=auth),
+        parse_mode="Markdown",
+        reply_markup=get_monitoring_keyboard()
+    )
     await callback.answer()
 
 
 @router.callback_query(F.data == "refresh_monitor")
-async def refresh_monitor_callback(callback: CallbackQuery):
-    """Обновление данных мониторинга"""
-    await cmd_monitor(callback.message)
+async def refresh_monitor_callback(callback: CallbackQuery, auth: Optional[AuthContext] = None):
+    """Обновление данных мониторинга: опрашиваем сервер сейчас"""
+    try:
+        await callback.message.edit_text(
+            await build_monitor_text(callback.bot, callback.from_user.id, refresh=True, auth=auth),
+            parse_mode="Markdown",
+            reply_markup=get_monitoring_keyboard()
+        )
+    except TelegramBadRequest:
+        pass
     await callback.answer("🔄 Данные обновлены")
 
 
 @router.message(Command("stats"))
-async def cmd_stats(message: Message):
+async def cmd_stats(message: Message, auth: Optional[AuthContext] = None):
     """Статистика сервера"""
-    session_manager = getattr(message.bot, 'session_manager', None)
-
-    if not session_manager:
-        await message.answer("❌ Ошибка системы: менеджер сессий не доступен")
-        return
-
-    if not await session_manager.is_authorized(message.from_user.id):
+    if not await resolve_auth(message.bot, message.from_user.id, auth):
         await message.answer("🔒 Сначала авторизуйтесь через /start")
         return
 
@@ -81,26 +89,25 @@ async def cmd_stats(message: Message):
 
 
 @router.message(Command("players"))
-async def cmd_players(message: Message):
+async def cmd_players(message: Message, auth: Optional[AuthContext] = None):
     """Информация об игроках"""
-    session_manager = getattr(message.bot, 'session_manager', None)
-
-    if not session_manager:
-        await message.answer("❌ Ошибка системы: менеджер сессий не доступен")
+    auth = await resolve_auth(message.bot, message.from_user.id, auth)
+    if not auth:
+        await message.answer("🔒 Сначала авторизуйтесь через /start")
         return
 
-    if not await session_manager.is_authorized(message.from_user.id):
-        await message.answer("🔒 Сначала авторизуйтесь через /start")
+    rcon_client = auth.rcon_client
+
+    # Query отдает полный список одной датаграммой, RCON - запасной путь
+    text = await query_player_list(rcon_client.host)
+    if text:
+        await message.answer(text, parse_mode="Markdown")
         return
 
-    text = (
-        "👥 *Игроки онлайн*\n\n"
-        "1. Player1 (2ч 15м)\n"
-        "2. Player2 (1ч 30м)\n"
-        "3. Player3 (45м)\n"
-        "4. Player4 (20м)\n"
-        "5. Player5 (5м)\n\n"
-        "Всего: 5/20 игроков"
-    )
+    try:
+        result = await rcon_client.execute_command("list")
+    except Exception as e:
+        await message.answer(f"❌ Ошибка получения списка игроков: {str(e)[:200]}")
+        return
 
-    await message.answer(text, parse_mode="Markdown")
\ No newline at end of file
+    await message.answer(f"👥 *Игроки онлайн*\n```\n{result or 'Нет данных'}\n```", parse_mode="Markdown")
@@ -1,34 +1,27 @@
 # bot/controllers/sessions_controller.py
+from typing import Optional
+
 from aiogram import Router, F
 from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
 
+from bot.utils.auth import resolve_auth
+from domain.services.session_manager import AuthContext
+
 router = Router()
 
 
 @router.message(Command("sessions"))
-async def cmd_sessions(message: Message):
+async def cmd_sessions(message: Message, auth: Optional[AuthContext] = None):
     """Управление сессиями"""
-    # Получаем session_manager из бота
-    session_manager = getattr(message.bot, 'session_manager', None)
-
-    if not session_manager:
-        await message.answer("❌ Ошибка системы: менеджер сессий не доступен")
-        return
-
-    if not await session_manager.is_authorized(message.from_user.id):
+    auth = await resolve_auth(message.bot, message.from_user.id, auth)
+    if not auth:
         await message.answer("🔒 Сначала авторизуйтесь через /start")
         return
 
-    session = await session_manager.get_session(message.from_user.id)
-    server_info = await session_manager.get_server(message.from_user.id)
-
-    if not session or not server_info:
-        await message.answer("❌ Сессия не найдена")
-        return
-
-    remaining = await session_manager.get_remaining_time(message.from_user.id)
-    expires_str = session["expires_at"].strftime("%d.%m.%Y %H:%M")
+    server_info = auth.server
+    remaining = auth.remaining_time
+    expires_str = auth.session["expires_at"].strftime("%d.%m.%Y %H:%M")
 
     text = (
         f"🔑 *Управление сессией*\n\n"
@@ -64,9 +57,9 @@ async def cmd_logout(message: Message):
 
 
 @router.callback_query(F.data == "session_info")
-async def session_info_callback(callback: CallbackQuery):
+async def session_info_callback(callback: CallbackQuery, auth: Optional[AuthContext] = None):
     """Информация о сессии через callback"""
-    await cmd_sessions(callback.message)
+    await cmd_sessions(callback.message, auth)
     await callback.answer()
 
 
@@ -1,25 +1,80 @@
+from typing import Optional
+
 from aiogram import Router, F
-from aiogram.types import CallbackQuery
+from aiogram.types import CallbackQuery, Message
+from aiogram.filters import Command
+from aiogram.exceptions import TelegramBadRequest
 from bot.keyboards.status_menu import get_status_keyboard
+from bot.utils.auth import resolve_auth
+from bot.utils.status import format_status_lines, get_server_snapshot
+from domain.services.session_manager import AuthContext
+from infrastructure.adapters.rcon_circuit_breaker import rcon_breakers
+from infrastructure.adapters.rcon_limiter import rcon_limiters
 
 router = Router()
 
 
-@router.callback_query(F.data == "status")
-async def status_callback(callback: CallbackQuery):
-    status_text = (
+def format_breaker_state(breaker: dict) -> str:
+    """Строка о доступности RCON по состоянию предохранителя"""
+    if breaker["state"] == "open":
+        return f"🔴 RCON: недоступен, повторная проверка через {breaker['retry_after']}с"
+    elif breaker["state"] == "half_open":
+        return "🟡 RCON: восстанавливается"
+    return "🔌 RCON: доступен"
+
+
+def format_queue_state(queue: Optional[dict]) -> str:
+    """Строка об очереди команд бота к серверу (пусто, если очередь не копится)"""
+    if not queue or not (queue["queued"] or queue["rejected"] or queue["timed_out"]):
+        return ""
+    return (
+        f"\n📥 Очередь команд: {queue['queued']} ждут, {queue['active']} выполняются, "
+        f"среднее ожидание {queue['avg_wait_ms']:.0f} мс, "
+        f"отклонено {queue['rejected'] + queue['timed_out']}"
+    )
+
+
+async def build_status_text(bot, user_id: int, auth: Optional[AuthContext] = None) -> str:
+    """Текст статуса сервера текущей сессии"""
+    auth = await resolve_auth(bot, user_id, auth)
+    if not auth:
+        return "🔒 Сначала авторизуйтесь через /start"
+
+    server_info = auth.server
+
+    snapshot = await get_server_snapshot(bot, server_info)
+    if snapshot is None:
+        return "❌ Мониторинг серверов не запущен"
+
+    breaker = rcon_breakers.get_info(server_info["host"], server_info["port"])
+    queue = rcon_limiters.get_info(server_info["host"], server_info["port"])
+    return (
         "📊 *Статус сервера*\n\n"
-        "🟢 Сервер: Online\n"
-        "👥 Игроки: 0/20\n"
-        "⚡ TPS: 20.0\n"
-        "💾 Память: 0.5/2.0 GB\n"
-        "⏰ Аптайм: 0ч 5м\n\n"
-        "_Функционал в разработке_"
+        f"{format_status_lines(snapshot)}"
+        f"{format_breaker_state(breaker)}"
+        f"{format_queue_state(queue)}"
     )
 
-    await callback.message.edit_text(
-        status_text,
+
+@router.message(Command("status"))
+async def cmd_status(message: Message, auth: Optional[AuthContext] = None):
+    """Статус сервера"""
+    await message.answer(
+        await build_status_text(message.bot, message.from_user.id, auth),
         parse_mode="Markdown",
         reply_markup=get_status_keyboard()
     )
-    await callback.answer()
\ No newline at end of file
+
+
+@router.callback_query(F.data == "status")
+async def status_callback(callback: CallbackQuery, auth: Optional[AuthContext] = None):
+    try:
+        await callback.message.edit_text(
+            await build_status_text(callback.bot, callback.from_user.id, auth),
+            parse_mode="Markdown",
+            reply_markup=get_status_keyboard()
+        )
+    except TelegramBadRequest:
+        # Статус в кэше не изменился - сообщение уже актуально
+        pass
+    await callback.answer()
@@ -6,7 +6,12 @@ from aiogram.fsm.context import FSMContext
 
 
 class AuthMiddleware(BaseMiddleware):
-    """Middleware для проверки авторизации"""
+    """
+    Middleware для проверки авторизации.
+
+    Сессия, сервер и RCON клиент пользователя получаются один раз и
+    передаются обработчикам в data["auth"] (AuthContext).
+    """
 
     def __init__(self, session_manager):
         super().__init__()
@@ -50,7 +55,8 @@ class AuthMiddleware(BaseMiddleware):
                     return await handler(event, data)
 
         # Проверяем авторизацию через session_manager
-        if not await self.session_manager.is_authorized(user_id):
+        auth = await self.session_manager.get_auth_context(user_id)
+        if auth is None:
             if isinstance(event, Message):
                 await event.answer("🔒 Требуется авторизация. Используйте /start")
             elif isinstance(event, CallbackQuery):
@@ -60,4 +66,5 @@ class AuthMiddleware(BaseMiddleware):
                 )
             return
 
+        data['auth'] = auth
         return await handler(event, data)
\ No newline at end of file
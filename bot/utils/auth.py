@@ -0,0 +1,20 @@
+# bot/utils/auth.py
+from typing import Optional
+
+from domain.services.session_manager import AuthContext
+
+
+async def resolve_auth(bot, user_id: int, auth: Optional[AuthContext] = None) -> Optional[AuthContext]:
+    """
+    Авторизация пользователя для обработчика.
+
+    Обычно ее уже получил AuthMiddleware (параметр auth обработчика);
+    заново ищем только если обработчик вызван напрямую, минуя middleware.
+    """
+    if auth is not None:
+        return auth
+
+    session_manager = getattr(bot, 'session_manager', None)
+    if not session_manager:
+        return None
+    return await session_manager.get_auth_context(user_id)
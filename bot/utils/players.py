@@ -0,0 +1,47 @@
+# bot/utils/players.py
+from typing import List, Optional
+
+from loggers import logger
+from config.settings import settings
+from infrastructure.adapters.query_client import QueryClientAdapter, QueryError
+
+
+def format_player_list(online: int, max_players: int, players: List[str]) -> str:
+    """Текст со списком игроков"""
+    if not players:
+        return f"👥 На сервере нет игроков (0/{max_players})"
+
+    # Ники часто содержат "_", который ломает Markdown
+    lines = [
+        f"{index}. " + "".join("\\" + char if char in "_*`[" else char for char in name)
+        for index, name in enumerate(players, 1)
+    ]
+    return (
+        "👥 *Игроки онлайн*\n\n"
+        + "\n".join(lines)
+        + f"\n\nВсего: {online}/{max_players} игроков"
+    )
+
+
+async def query_player_list(host: str) -> Optional[str]:
+    """
+    Список игроков через UDP Query, без нагрузки на RCON.
+
+    Returns:
+        готовый текст или None, если Query выключен или не ответил -
+        тогда список нужно получить по RCON
+    """
+    if not settings.QUERY_ENABLED:
+        return None
+
+    client = QueryClientAdapter(host)
+    if not client.is_available:
+        return None
+
+    try:
+        online, max_players, players = await client.get_players()
+    except QueryError as e:
+        logger.debug(f"Query недоступен, используем RCON: {e}")
+        return None
+
+    return format_player_list(online, max_players, players)
@@ -0,0 +1,90 @@
+# bot/utils/status.py
+from typing import Optional
+
+from config.settings import settings
+from domain.services.status_monitor import MonitoredServer, StatusSnapshot
+
+
+def escape_markdown(text: str) -> str:
+    return "".join("\\" + char if char in "_*`[" else char for char in text)
+
+
+def format_age(seconds: float) -> str:
+    """Возраст данных: "только что", "3 мин назад", "2 ч назад" """
+    if seconds < 60:
+        return "только что"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} мин назад"
+    return f"{int(seconds // 3600)} ч назад"
+
+
+def format_status_lines(snapshot: StatusSnapshot) -> str:
+    """Строки статуса сервера из последнего опроса"""
+    status, details = snapshot.status, snapshot.details
+
+    if not status.is_online:
+        error = escape_markdown(details.get("error") or "нет ответа")
+        return (
+            "🔴 Сервер: Offline\n"
+            f"⚠️ {error}\n"
+            f"🕒 Обновлено: {format_age(snapshot.age)}\n"
+        )
+
+    lines = ["🟢 Сервер: Online"]
+
+    if "players" in details.get("sources", {}):
+        lines.append(f"👥 Игроки: {status.player_count}/{status.max_players}")
+    else:
+        lines.append("👥 Игроки: нет данных")
+
+    if details.get("tps") is not None:
+        if status.tps < settings.TPS_CRITICAL_THRESHOLD:
+            marker = " 🔴"
+        elif status.tps < settings.TPS_WARNING_THRESHOLD:
+            marker = " ⚠️"
+        else:
+            marker = ""
+        mspt = f" ({status.mspt:.1f} мс/тик)" if status.mspt is not None else ""
+        lines.append(f"⚡ TPS: {status.tps:.1f}{mspt}{marker}")
+
+    if details.get("memory") is not None:
+        used = f"{status.memory_used_mb / 1024:.1f}"
+        total = f"{status.memory_total_mb / 1024:.1f}" if status.memory_total_mb else "?"
+        lines.append(f"💾 Память: {used}/{total} GB")
+
+    if status.uptime_seconds:
+        lines.append(f"⏰ Аптайм: {status.uptime_seconds // 3600}ч {status.uptime_seconds % 3600 // 60}м")
+
+    if details.get("version") and "version" in details.get("sources", {}):
+        lines.append(f"🏷 Версия: {escape_markdown(details['version'])}")
+
+    if details.get("latency_ms") is not None:
+        lines.append(f"📶 Пинг: {details['latency_ms']:.0f} мс")
+
+    lines.append(f"🕒 Обновлено: {format_age(snapshot.age)}")
+    return "\n".join(lines) + "\n"
+
+
+async def get_server_snapshot(bot, server_info: dict, refresh: bool = False) -> Optional[StatusSnapshot]:
+    """
+    Статус сервера из кэша фонового мониторинга.
+
+    Если сервер еще не опрашивался (только что добавлен) или нужен свежий
+    статус (refresh), сервер опрашивается сразу.
+
+    Returns:
+        снимок статуса или None, если мониторинг не запущен
+    """
+    status_monitor = getattr(bot, 'status_monitor', None)
+    if not status_monitor:
+        return None
+
+    snapshot = status_monitor.get(server_info["id"])
+    if snapshot is None or refresh:
+        snapshot = await status_monitor.refresh(MonitoredServer(
+            id=server_info["id"],
+            host=server_info["host"],
+            port=server_info["port"],
+            encrypted_password=server_info["encrypted_password"]
+        ))
+    return snapshot
@@ -41,11 +41,36 @@ class Settings:
         self.RCON_TIMEOUT = self._get_int("RCON_TIMEOUT", 10)
         self.RCON_MAX_RETRIES = self._get_int("RCON_MAX_RETRIES", 3)
         self.RCON_RETRY_DELAY = self._get_int("RCON_RETRY_DELAY", 1)
+        self.RCON_RETRY_MAX_DELAY = self._get_float("RCON_RETRY_MAX_DELAY", 5.0)
+        self.RCON_COMMAND_DEADLINE = self._get_float("RCON_COMMAND_DEADLINE", 15.0)
         self.RCON_DEFAULT_PORT = self._get_int("RCON_DEFAULT_PORT", 25575)
+        self.RCON_POOL_MAX_SIZE = self._get_int("RCON_POOL_MAX_SIZE", 4)
+        self.RCON_POOL_IDLE_TIMEOUT = self._get_int("RCON_POOL_IDLE_TIMEOUT", 300)
+        self.RCON_MAX_RESPONSE_BYTES = self._get_int("RCON_MAX_RESPONSE_BYTES", 1024 * 1024)
+        self.RCON_DETAILED_CHECK = self._get_bool("RCON_DETAILED_CHECK", False)
+        self.RCON_STATUS_DEADLINE = self._get_float("RCON_STATUS_DEADLINE", 5.0)
+        self.RCON_CACHE_MAX_ENTRIES = self._get_int("RCON_CACHE_MAX_ENTRIES", 1024)
+        self.RCON_CACHE_TTL_SERVER_INFO = self._get_float("RCON_CACHE_TTL_SERVER_INFO", 5.0)
+        self.RCON_CACHE_TTL_WORLD_MANAGEMENT = self._get_float("RCON_CACHE_TTL_WORLD_MANAGEMENT", 2.0)
+        self.RCON_BREAKER_FAILURE_THRESHOLD = self._get_int("RCON_BREAKER_FAILURE_THRESHOLD", 3)
+        self.RCON_BREAKER_RESET_TIMEOUT = self._get_int("RCON_BREAKER_RESET_TIMEOUT", 30)
+        self.RCON_RATE_LIMIT = self._get_float("RCON_RATE_LIMIT", 10.0)
+        self.RCON_RATE_BURST = self._get_int("RCON_RATE_BURST", 20)
+        self.RCON_MAX_CONCURRENCY = self._get_int("RCON_MAX_CONCURRENCY", 4)
+        self.RCON_QUEUE_SIZE = self._get_int("RCON_QUEUE_SIZE", 32)
+        self.FLEET_MAX_CONCURRENCY = self._get_int("FLEET_MAX_CONCURRENCY", 8)
+        self.FLEET_EDIT_INTERVAL = self._get_float("FLEET_EDIT_INTERVAL", 1.0)
+        self.DNS_CACHE_TTL = self._get_int("DNS_CACHE_TTL", 300)
+        self.DNS_NEGATIVE_CACHE_TTL = self._get_int("DNS_NEGATIVE_CACHE_TTL", 30)
 
         # ================= СЕССИИ ===================
         self.SESSION_DURATION_HOURS = self._get_int("SESSION_DURATION_HOURS", 6)
         self.SESSION_AUTO_RENEW = self._get_bool("SESSION_AUTO_RENEW", True)
+        self.SESSION_CACHE_MAX_SIZE = self._get_int("SESSION_CACHE_MAX_SIZE", 10000)
+        self.SESSION_CACHE_PURGE_INTERVAL = self._get_int("SESSION_CACHE_PURGE_INTERVAL", 60)
+        self.SESSION_NEGATIVE_CACHE_TTL = self._get_float("SESSION_NEGATIVE_CACHE_TTL", 10.0)
+        self.SESSION_NEGATIVE_CACHE_MAX_SIZE = self._get_int("SESSION_NEGATIVE_CACHE_MAX_SIZE", 10000)
+        self.SESSION_ACTIVITY_FLUSH_INTERVAL = self._get_float("SESSION_ACTIVITY_FLUSH_INTERVAL", 5.0)
 
         # ================= БЕЗОПАСНОСТЬ =============
         self.ENCRYPTION_KEY = self._get("ENCRYPTION_KEY", None)
@@ -59,6 +84,17 @@ class Settings:
 
         # ================= МОНИТОРИНГ ===============
         self.MONITORING_INTERVAL_MINUTES = self._get_int("MONITORING_INTERVAL_MINUTES", 5)
+        self.MONITORING_MAX_CONCURRENCY = self._get_int("MONITORING_MAX_CONCURRENCY", 10)
+        self.MONITORING_MIN_INTERVAL_SECONDS = self._get_float("MONITORING_MIN_INTERVAL_SECONDS", 30.0)
+        self.MONITORING_IDLE_FACTOR = self._get_float("MONITORING_IDLE_FACTOR", 3.0)
+        self.STATUS_USE_SLP = self._get_bool("STATUS_USE_SLP", False)
+        self.MINECRAFT_GAME_PORT = self._get_int("MINECRAFT_GAME_PORT", 25565)
+        self.QUERY_ENABLED = self._get_bool("QUERY_ENABLED", False)
+        self.QUERY_PORT = self._get_int("QUERY_PORT", 25565)
+        self.QUERY_TIMEOUT = self._get_float("QUERY_TIMEOUT", 1.0)
+        self.QUERY_RETRIES = self._get_int("QUERY_RETRIES", 3)
+        self.QUERY_TOKEN_TTL = self._get_int("QUERY_TOKEN_TTL", 25)
+        self.QUERY_UNAVAILABLE_TTL = self._get_int("QUERY_UNAVAILABLE_TTL", 300)
         self.TPS_WARNING_THRESHOLD = self._get_float("TPS_WARNING_THRESHOLD", 15.0)
         self.TPS_CRITICAL_THRESHOLD = self._get_float("TPS_CRITICAL_THRESHOLD", 10.0)
 
@@ -214,6 +250,15 @@ class Settings:
             "timeout": self.RCON_TIMEOUT,
             "max_retries": self.RCON_MAX_RETRIES,
             "retry_delay": self.RCON_RETRY_DELAY,
+            "retry_max_delay": self.RCON_RETRY_MAX_DELAY,
+            "command_deadline": self.RCON_COMMAND_DEADLINE,
+            "pool_max_size": self.RCON_POOL_MAX_SIZE,
+            "pool_idle_timeout": self.RCON_POOL_IDLE_TIMEOUT,
+            "max_response_bytes": self.RCON_MAX_RESPONSE_BYTES,
+            "rate_limit": self.RCON_RATE_LIMIT,
+            "rate_burst": self.RCON_RATE_BURST,
+            "max_concurrency": self.RCON_MAX_CONCURRENCY,
+            "queue_size": self.RCON_QUEUE_SIZE,
         }
 
     def get_logging_config(self) -> dict:
@@ -252,8 +297,11 @@ class Settings:
         print(f"⚡ RCON:")
         print(f"   Таймаут: {self.RCON_TIMEOUT}с")
         print(f"   Попытки: {self.RCON_MAX_RETRIES}")
+        print(f"   Пул: до {self.RCON_POOL_MAX_SIZE} соединений на сервер")
+        print(f"   Лимит: {self.RCON_RATE_LIMIT} команд/с, очередь {self.RCON_QUEUE_SIZE}")
 
-        print(f"🔄 Сессии: {self.SESSION_DURATION_HOURS}ч")
+        print(f"📊 Мониторинг: каждые {self.MONITORING_INTERVAL_MINUTES} мин, до {self.MONITORING_MAX_CONCURRENCY} серверов одновременно")
+        print(f"🔄 Сессии: {self.SESSION_DURATION_HOURS}ч, кэш до {self.SESSION_CACHE_MAX_SIZE}")
         print(f"🔧 Режим отладки: {'ВКЛ' if self.DEBUG else 'ВЫКЛ'}")
         print("=" * 60)
 
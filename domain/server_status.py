@@ -14,12 +14,15 @@ class ServerStatus:
     memory_total_mb: int
     uptime_seconds: int
     last_checked: datetime
+    mspt: Optional[float] = None
     def __post_init__(self):
         """Валидация после создания объекта"""
         if self.player_count < 0:
             raise ValueError("Количество игроков не может быть отрицательным")
         if self.tps < 0:
             raise ValueError("TPS не может быть отрицательным")
+        if self.mspt is not None and self.mspt < 0:
+            raise ValueError("MSPT не может быть отрицательным")
 
     @property
     def player_ratio(self) -> float:
@@ -1,4 +1,6 @@
 from .command_validator import CommandValidator, CommandType
+from .session_cache import SessionCache
 from .session_manager import SessionManager
+from .status_monitor import StatusMonitor, StatusSnapshot, MonitoredServer
 
-__all__ = ["CommandValidator", "CommandType", "SessionManager"]
\ No newline at end of file
+__all__ = ["CommandValidator", "CommandType", "SessionCache", "SessionManager", "StatusMonitor", "StatusSnapshot", "MonitoredServer"]
\ No newline at end of file
@@ -0,0 +1,93 @@
+# domain/services/activity_tracker.py
+import asyncio
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from loggers.app_logger import logger
+
+
+class ActivityTracker:
+    """
+    Отложенная запись времени активности сессий (write-behind).
+
+    Проверка авторизации идет на каждое сообщение, и раньше каждая из них
+    обновляла last_activity в БД. Теперь touch() только запоминает время в
+    памяти (повторные вызовы для одного пользователя схлопываются в одну
+    запись), а раз в flush_interval секунд все накопленное записывается
+    одним UPDATE. При остановке несохраненное дописывается (stop()).
+    """
+
+    def __init__(self, database, flush_interval: float = 5.0,
+                 clock: Callable[[], datetime] = datetime.utcnow):
+        self.database = database
+        self.flush_interval = flush_interval
+        self.clock = clock
+
+        self._pending: Dict[int, datetime] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+        self.touches = 0
+        self.flushes = 0
+        self.written = 0
+        self.failures = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def touch(self, user_id: int):
+        """Пользователь активен сейчас"""
+        self._pending[user_id] = self.clock()
+        self.touches += 1
+        self._ensure_flush_task()
+
+    def forget(self, user_id: int):
+        """Сессия завершена - ее активность записывать не нужно"""
+        self._pending.pop(user_id, None)
+
+    async def flush(self) -> int:
+        """Записывает накопленную активность в БД, возвращает число обновленных сессий"""
+        if not self._pending:
+            return 0
+
+        batch, self._pending = self._pending, {}
+        try:
+            async with self.database.session_scope() as repos:
+                updated = await repos['sessions'].update_last_activity(batch)
+        except Exception as e:
+            # Вернем в очередь, не затирая более свежие отметки
+            for user_id, last_activity in batch.items():
+                self._pending.setdefault(user_id, last_activity)
+            self.failures += 1
+            logger.warning(f"⚠️  Не удалось сохранить активность {len(batch)} сессий: {e}")
+            return 0
+
+        self.flushes += 1
+        self.written += updated
+        return updated
+
+    def get_stats(self) -> dict:
+        """Статистика: сколько отметок пришло и сколько записей в БД понадобилось"""
+        return {
+            "pending": len(self._pending),
+            "touches": self.touches,
+            "flushes": self.flushes,
+            "written": self.written,
+            "failures": self.failures,
+        }
+
+    def _ensure_flush_task(self):
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def stop(self):
+        """Остановка фоновой записи с сохранением накопленного"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await self.flush()
@@ -20,6 +20,7 @@ class CommandValidator:
         "restart": CommandType.SERVER_MANAGEMENT,
         "save-all": CommandType.SERVER_MANAGEMENT,
         "list": CommandType.SERVER_INFO,
+        "version": CommandType.SERVER_INFO,
         "say": CommandType.OTHER,
         "time": CommandType.WORLD_MANAGEMENT,
         "weather": CommandType.WORLD_MANAGEMENT,
@@ -30,6 +31,17 @@ class CommandValidator:
 
     DANGEROUS_COMMANDS = {"stop", "restart", "ban", "kick", "op", "deop"}
 
+    # Подкоманды, которые только читают состояние, хотя сама команда его меняет
+    READ_ONLY_SUBCOMMANDS = {
+        "time": {"query"},
+    }
+
+    # Команды, повторное выполнение которых не меняет результат
+    IDEMPOTENT_COMMANDS = {"save-all", "weather", "gamemode"}
+    IDEMPOTENT_SUBCOMMANDS = {
+        "time": {"set", "query"},
+    }
+
     def validate_command(self, raw_command: str) -> Tuple[bool, str, Optional[str]]:
         """Валидация команды"""
         if not raw_command or not raw_command.strip():
@@ -56,4 +68,31 @@ class CommandValidator:
     def get_command_type(self, command: str) -> Optional[CommandType]:
         """Возвращает тип команды"""
         base_command = command.split()[0] if command else ""
-        return self.ALLOWED_COMMANDS.get(base_command)
\ No newline at end of file
+        return self.ALLOWED_COMMANDS.get(base_command)
+
+    def is_read_only_command(self, command: str) -> bool:
+        """Проверяет, что команда только читает состояние сервера"""
+        parts = command.strip().lower().split() if command else []
+        if not parts:
+            return False
+
+        if self.ALLOWED_COMMANDS.get(parts[0]) == CommandType.SERVER_INFO:
+            return True
+
+        read_only = self.READ_ONLY_SUBCOMMANDS.get(parts[0], set())
+        return len(parts) > 1 and parts[1] in read_only
+
+    def is_idempotent_command(self, command: str) -> bool:
+        """Проверяет, что команду безопасно отправить повторно"""
+        if self.is_read_only_command(command):
+            return True
+
+        parts = command.strip().lower().split() if command else []
+        if not parts:
+            return False
+
+        if parts[0] in self.IDEMPOTENT_COMMANDS:
+            return True
+
+        idempotent = self.IDEMPOTENT_SUBCOMMANDS.get(parts[0], set())
+        return len(parts) > 1 and parts[1] in idempotent
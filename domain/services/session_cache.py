@@ -0,0 +1,231 @@
+# domain/services/session_cache.py
+import asyncio
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from loggers.app_logger import logger
+
+
+class SessionCache:
+    """
+    Кэш активных сессий пользователей в памяти.
+
+    - размер ограничен max_size, вытесняются давно не использованные (LRU);
+    - у каждой записи есть expires_at; куча (expires_at, user_id) позволяет
+      фоновой задаче удалять просроченные записи по порядку истечения,
+      не просматривая весь кэш;
+    - устаревшие элементы кучи (запись обновлена или удалена) не удаляются
+      из нее сразу, а пропускаются при очистке;
+    - когда запись покидает кэш (истекла, вытеснена, заменена, удалена),
+      вызывается on_remove(user_id, session) - например, чтобы стереть
+      закэшированные вместе с сессией учетные данные.
+    """
+
+    def __init__(self, max_size: int = 10000, purge_interval: float = 60,
+                 clock: Callable[[], datetime] = datetime.utcnow,
+                 on_remove: Optional[Callable[[int, dict], None]] = None):
+        """
+        Args:
+            clock: текущее время в той же шкале, что и expires_at сессий (UTC)
+        """
+        self.max_size = max_size
+        self.purge_interval = purge_interval
+        self.clock = clock
+        self.on_remove = on_remove
+
+        self._entries: "OrderedDict[int, dict]" = OrderedDict()
+        self._expiry: List[Tuple[datetime, int, int]] = []
+        self._sequence = itertools.count()
+        self._purge_task: Optional[asyncio.Task] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, user_id: int) -> Optional[dict]:
+        """Возвращает активную сессию или None (нет в кэше или истекла)"""
+        session = self._entries.get(user_id)
+
+        if session is not None and self.clock() >= session["expires_at"]:
+            self._discard(user_id)
+            self.expirations += 1
+            session = None
+
+        if session is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return session
+
+    def put(self, user_id: int, session: dict):
+        """Сохраняет сессию (session["expires_at"] обязателен)"""
+        previous = self._entries.get(user_id)
+        if previous is not None and previous is not session:
+            self._discard(user_id)
+
+        self._entries[user_id] = session
+        self._entries.move_to_end(user_id)
+        heapq.heappush(self._expiry, (session["expires_at"], next(self._sequence), user_id))
+
+        while len(self._entries) > self.max_size:
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+        # Куча копит устаревшие элементы - пересобираем, когда их больше половины
+        if len(self._expiry) > 2 * len(self._entries) + 64:
+            self._expiry = [
+                (session["expires_at"], next(self._sequence), user_id)
+                for user_id, session in self._entries.items()
+            ]
+            heapq.heapify(self._expiry)
+
+        self._ensure_purge_task()
+
+    def remove(self, user_id: int) -> bool:
+        """Удаляет сессию пользователя (выход, завершение сессии)"""
+        return self._discard(user_id)
+
+    def purge_expired(self) -> int:
+        """Удаляет все истекшие сессии, возвращает их количество"""
+        now = self.clock()
+        purged = 0
+
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, _, user_id = heapq.heappop(self._expiry)
+            session = self._entries.get(user_id)
+            if session is not None and session["expires_at"] == expires_at:
+                self._discard(user_id)
+                purged += 1
+
+        self.expirations += purged
+        return purged
+
+    def clear(self):
+        for user_id in list(self._entries):
+            self._discard(user_id)
+        self._expiry.clear()
+
+    def get_stats(self) -> dict:
+        """Статистика кэша"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _discard(self, user_id: int) -> bool:
+        session = self._entries.pop(user_id, None)
+        if session is None:
+            return False
+        if self.on_remove is not None:
+            self.on_remove(user_id, session)
+        return True
+
+    def _ensure_purge_task(self):
+        if self._purge_task is None or self._purge_task.done():
+            self._purge_task = asyncio.create_task(self._purge_loop())
+
+    async def _purge_loop(self):
+        while self._entries:
+            await asyncio.sleep(self.purge_interval)
+            purged = self.purge_expired()
+            if purged:
+                logger.debug(f"🧹 Удалено {purged} истекших сессий из кэша: {self.get_stats()}")
+
+    def stop(self):
+        if self._purge_task is not None:
+            self._purge_task.cancel()
+            self._purge_task = None
+
+
+class NegativeCache:
+    """
+    Кэш отрицательных ответов: у пользователя нет активной сессии.
+
+    Неавторизованные пользователи (и боты) пишут так же часто, как остальные,
+    и без кэша каждое их сообщение - запрос к БД. Запись живет ttl секунд,
+    размер ограничен max_size (вытесняются самые старые).
+
+    Запрос к БД мог начаться до создания сессии, а закончиться после:
+    add() с версией, снятой до запроса, не сохранит устаревший ответ,
+    если с тех пор был вызван invalidate().
+    """
+
+    def __init__(self, ttl: float = 10, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.version = 0
+        self._entries: "OrderedDict[int, float]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def contains(self, user_id: int) -> bool:
+        """Известно ли, что у пользователя нет сессии"""
+        expires_at = self._entries.get(user_id)
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._entries[user_id]
+            expires_at = None
+
+        if expires_at is None:
+            self.misses += 1
+            return False
+
+        self.hits += 1
+        return True
+
+    def add(self, user_id: int, version: Optional[int] = None):
+        """
+        Запоминает, что сессии нет.
+
+        Args:
+            version: self.version на момент начала запроса к БД
+        """
+        if self.ttl <= 0 or (version is not None and version != self.version):
+            return
+
+        self._entries[user_id] = time.monotonic() + self.ttl
+        self._entries.move_to_end(user_id)
+        self.stores += 1
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: int):
+        """Сбрасывает запись (пользователь создал сессию)"""
+        self.version += 1
+        if self._entries.pop(user_id, None) is not None:
+            self.invalidations += 1
+
+    def get_stats(self) -> dict:
+        """Статистика кэша: hits - сколько запросов к БД не понадобилось"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
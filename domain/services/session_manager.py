@@ -1,43 +1,92 @@
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Optional, Dict, Any
+from cryptography.fernet import InvalidToken
 from infrastructure.adapters.crypto import CryptoService
+from loggers.app_logger import logger
+from domain.services.activity_tracker import ActivityTracker
+from domain.services.session_cache import NegativeCache, SessionCache
+
+
+def format_remaining(expires_at: datetime) -> str:
+    """Оставшееся время сессии: "5ч 12м" """
+    remaining = expires_at - datetime.utcnow()
+    hours = remaining.seconds // 3600
+    minutes = (remaining.seconds % 3600) // 60
+
+    return f"{hours}ч {minutes}м"
+
+
+@dataclass
+class AuthContext:
+    """
+    Авторизация пользователя в рамках одного апдейта.
+
+    AuthMiddleware получает ее один раз и передает обработчикам (data["auth"]),
+    чтобы они не проверяли сессию и не искали сервер повторно.
+    """
+    user_id: int
+    session: Dict[str, Any]
+    server: Dict[str, Any]
+    rcon_client: Any
+
+    @property
+    def remaining_time(self) -> str:
+        return format_remaining(self.session["expires_at"])
 
 
 class SessionManager:
-    """Менеджер сессий с интеграцией БД"""
+    """
+    Менеджер сессий с интеграцией БД.
+
+    Активные сессии (вместе с данными сервера) кэшируются в памяти, а для
+    каждой сессии один раз создается RCON клиент с расшифрованным паролем:
+    выполнение команды не требует ни запросов к БД, ни расшифровки.
+    Клиент живет, пока сессия в кэше, и забывается при выходе, истечении
+    или вытеснении сессии. Время активности пишется в БД пачками
+    (ActivityTracker), поэтому проверка авторизации в БД не пишет.
+    """
 
-    def __init__(self, database, session_duration_hours: int = 6):
+    def __init__(self, database, session_duration_hours: int = 6,
+                 cache_size: int = 10000, cache_purge_interval: float = 60,
+                 negative_cache_ttl: float = 10, negative_cache_size: int = 10000,
+                 activity_flush_interval: float = 5):
         self.database = database
         self.session_duration = session_duration_hours
         self.crypto = CryptoService()
-        self._memory_sessions: Dict[int, dict] = {}
+        # expires_at сессий в БД хранится в UTC
+        self.sessions = SessionCache(
+            max_size=cache_size,
+            purge_interval=cache_purge_interval,
+            on_remove=self._wipe_client
+        )
+        self._clients: Dict[int, Any] = {}
+        # Пользователи без сессии: не ходим в БД на каждое их сообщение
+        self.unauthorized = NegativeCache(ttl=negative_cache_ttl, max_size=negative_cache_size)
+        self.activity = ActivityTracker(database, flush_interval=activity_flush_interval)
 
     async def is_authorized(self, user_id: int) -> bool:
         """Проверка авторизации через БД"""
         # Сначала проверяем кэш
-        if user_id in self._memory_sessions:
-            session = self._memory_sessions[user_id]
-            if session["is_active"] and datetime.now() < session["expires_at"]:
-                return True
-            else:
-                del self._memory_sessions[user_id]
+        if self.sessions.get(user_id):
+            self.activity.touch(user_id)
+            return True
+        if self.unauthorized.contains(user_id):
+            return False
 
         # Проверяем в БД
+        version = self.unauthorized.version
         try:
             async with self.database.session_scope() as repos:
                 session = await repos['sessions'].get_active_session(user_id)
-                if session:
+                if not session:
+                    self.unauthorized.add(user_id, version)
+                else:
                     # Обновляем кэш
                     server = await repos['servers'].get_server(session.server_id)
                     if server:
-                        self._memory_sessions[user_id] = {
-                            "user_id": user_id,
-                            "server_id": session.server_id,
-                            "server_host": server.host,
-                            "server_port": server.port,
-                            "expires_at": session.expires_at,
-                            "is_active": True
-                        }
+                        self._cache_session(user_id, session, server)
+                    self.activity.touch(user_id)
                     return True
         except Exception:
             pass
@@ -69,22 +118,18 @@ class SessionManager:
                 )
 
                 # Создаем сессию
-                await repos['sessions'].create_session(
+                session = await repos['sessions'].create_session(
                     user_id=user_id,
                     server_id=server.id,
                     duration_hours=self.session_duration
                 )
 
-                # Обновляем кэш
-                self._memory_sessions[user_id] = {
-                    "user_id": user_id,
-                    "server_id": server.id,
-                    "server_host": host,
-                    "server_port": port,
-                    "expires_at": datetime.now() + timedelta(hours=self.session_duration),
-                    "is_active": True
-                }
+                # Обновляем кэш; проверенный клиент сразу используется для команд
+                self._cache_session(user_id, session, server)
+                self._clients[user_id] = rcon_client
 
+            # После коммита: запрос, начатый до создания сессии, не запомнит "нет сессии"
+            self.unauthorized.invalidate(user_id)
             return True
 
         except Exception as e:
@@ -94,64 +139,112 @@ class SessionManager:
     async def get_session(self, user_id: int) -> Optional[Dict[str, Any]]:
         """Получение сессии пользователя"""
         # Проверяем кэш
-        if user_id in self._memory_sessions:
-            session = self._memory_sessions[user_id]
-            if session["is_active"] and datetime.now() < session["expires_at"]:
-                return session
+        session = self.sessions.get(user_id)
+        if session:
+            self.activity.touch(user_id)
+            return session
+        if self.unauthorized.contains(user_id):
+            return None
 
         # Получаем из БД
+        version = self.unauthorized.version
         try:
             async with self.database.session_scope() as repos:
                 session_db = await repos['sessions'].get_active_session(user_id)
                 if not session_db:
+                    self.unauthorized.add(user_id, version)
                     return None
 
                 server = await repos['servers'].get_server(session_db.server_id)
                 if not server:
                     return None
 
-                session_data = {
-                    "user_id": user_id,
-                    "server_id": session_db.server_id,
-                    "server_host": server.host,
-                    "server_port": server.port,
-                    "expires_at": session_db.expires_at,
-                    "is_active": True
-                }
-
                 # Обновляем кэш
-                self._memory_sessions[user_id] = session_data
-                return session_data
+                self.activity.touch(user_id)
+                return self._cache_session(user_id, session_db, server)
         except Exception:
             return None
 
     async def get_server(self, user_id: int) -> Optional[Dict[str, Any]]:
-        """Получение информации о сервере с паролем"""
-        try:
-            async with self.database.session_scope() as repos:
-                session = await repos['sessions'].get_active_session(user_id)
-                if not session:
-                    return None
+        """Получение информации о сервере с паролем (зашифрованным)"""
+        session = await self.get_session(user_id)
+        if not session:
+            return None
+        return self._server_info(session)
 
-                server = await repos['servers'].get_server(session.server_id)
-                if not server:
-                    return None
+    async def get_rcon_client(self, user_id: int):
+        """
+        RCON клиент сервера текущей сессии.
 
-                return {
-                    "id": server.id,
-                    "host": server.host,
-                    "port": server.port,
-                    "encrypted_password": server.encrypted_password,
-                    "name": server.name
-                }
-        except Exception:
+        Пароль расшифровывается один раз за сессию; пока сессия в кэше,
+        вызов не обращается ни к БД, ни к шифрованию.
+
+        Returns:
+            RconClientAdapter или None, если активной сессии нет
+        """
+        session = await self.get_session(user_id)
+        if not session:
+            return None
+        return await self._client_or_logout(user_id, session)
+
+    async def get_auth_context(self, user_id: int) -> Optional[AuthContext]:
+        """Сессия, сервер и RCON клиент пользователя одним запросом (None - не авторизован)"""
+        session = await self.get_session(user_id)
+        if not session:
+            return None
+
+        rcon_client = await self._client_or_logout(user_id, session)
+        if rcon_client is None:
+            return None
+
+        return AuthContext(
+            user_id=user_id,
+            session=session,
+            server=self._server_info(session),
+            rcon_client=rcon_client
+        )
+
+    @staticmethod
+    def _server_info(session: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": session["server_id"],
+            "host": session["server_host"],
+            "port": session["server_port"],
+            "encrypted_password": session["encrypted_password"],
+            "name": session["server_name"]
+        }
+
+    def _client_for(self, user_id: int, session: Dict[str, Any]):
+        client = self._clients.get(user_id)
+        if client is None:
+            from infrastructure.adapters.rcon_client import RconClientAdapter
+            client = RconClientAdapter(
+                session["server_host"],
+                session["server_port"],
+                self.crypto.decrypt(session["encrypted_password"])
+            )
+            self._clients[user_id] = client
+        return client
+
+    async def _client_or_logout(self, user_id: int, session: Dict[str, Any]):
+        """
+        Клиент сессии; если пароль не расшифровывается, сессия завершается.
+
+        Без постоянного ключа шифрования после перезапуска бота пароли из БД
+        прочитать нельзя - такой пользователь должен авторизоваться заново.
+        """
+        try:
+            return self._client_for(user_id, session)
+        except InvalidToken:
+            logger.warning(f"⚠️  Не удалось расшифровать пароль сессии {user_id}, сессия завершена")
+            await self.end_session(user_id)
             return None
 
     async def end_session(self, user_id: int) -> bool:
         """Завершение сессии"""
         # Удаляем из кэша
-        if user_id in self._memory_sessions:
-            del self._memory_sessions[user_id]
+        self.sessions.remove(user_id)
+        self.activity.forget(user_id)
 
         # Удаляем из БД
         try:
@@ -167,8 +260,41 @@ class SessionManager:
         if not session:
             return None
 
-        remaining = session["expires_at"] - datetime.now()
-        hours = remaining.seconds // 3600
-        minutes = (remaining.seconds % 3600) // 60
+        return format_remaining(session["expires_at"])
+
+    def get_stats(self) -> dict:
+        """Статистика кэшей сессий"""
+        return {
+            "sessions": self.sessions.get_stats(),
+            "unauthorized": self.unauthorized.get_stats(),
+            "rcon_clients": len(self._clients),
+            "activity": self.activity.get_stats(),
+        }
+
+    def _cache_session(self, user_id: int, session, server) -> Dict[str, Any]:
+        """Сохраняет в кэш сессию из БД вместе с данными сервера"""
+        session_data = {
+            "user_id": user_id,
+            "server_id": server.id,
+            "server_host": server.host,
+            "server_port": server.port,
+            "server_name": server.name,
+            "encrypted_password": server.encrypted_password,
+            "expires_at": session.expires_at,
+            "is_active": True
+        }
+        self.sessions.put(user_id, session_data)
+        return session_data
+
+    def _wipe_client(self, user_id: int, session: dict):
+        """
+        Сессия покинула кэш - забываем расшифрованный пароль.
 
-        return f"{hours}ч {minutes}м"
\ No newline at end of file
+        Сам клиент не меняем: обработчики, которые сейчас его используют
+        (через AuthContext), должны доработать. Закрываем только простаивающие
+        соединения пула, в которых тоже хранится пароль.
+        """
+        client = self._clients.pop(user_id, None)
+        if client is not None:
+            from infrastructure.adapters.rcon_pool import rcon_pool
+            rcon_pool.drop_idle(client.host, client.port, client.password)
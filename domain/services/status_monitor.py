@@ -0,0 +1,341 @@
+# domain/services/status_monitor.py
+import asyncio
+import heapq
+import itertools
+import random
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from loggers.app_logger import logger
+from domain.server_status import ServerStatus
+from infrastructure.adapters.crypto import CryptoService
+
+
+@dataclass
+class MonitoredServer:
+    """Сервер для опроса (копия полей модели, чтобы не держать сессию БД)"""
+    id: int
+    host: str
+    port: int
+    encrypted_password: bytes
+
+
+@dataclass
+class StatusSnapshot:
+    """Последний результат опроса сервера"""
+    server_id: int
+    status: ServerStatus
+    details: dict
+    checked_at: float
+
+    @property
+    def age(self) -> float:
+        """Сколько секунд прошло с опроса"""
+        return time.monotonic() - self.checked_at
+
+
+def to_server_status(details: dict) -> ServerStatus:
+    """Статус от RconClientAdapter.get_server_status() -> ServerStatus"""
+    match = re.match(r'(\d+)/(\d+)', details.get("players") or "")
+    memory = details.get("memory") or {}
+
+    return ServerStatus(
+        is_online=bool(details.get("online")),
+        player_count=int(match.group(1)) if match else 0,
+        max_players=int(match.group(2)) if match else 0,
+        tps=details.get("tps") or 0.0,
+        memory_used_mb=memory.get("used_mb") or 0,
+        memory_total_mb=memory.get("total_mb") or 0,
+        uptime_seconds=details.get("uptime_seconds") or 0,
+        last_checked=datetime.now(),
+        mspt=details.get("mspt")
+    )
+
+
+class StatusMonitor:
+    """
+    Фоновый опрос всех зарегистрированных серверов.
+
+    Опросы планируются по куче (heapq) с временем следующего опроса
+    каждого сервера, поэтому нагрузка распределена по интервалу равномерно,
+    а не приходит пачкой раз в interval секунд. Частота опроса подстраивается
+    под сервер (см. next_interval): чаще, когда падает TPS или есть игроки,
+    реже - для пустых и выключенных серверов.
+
+    Одновременно выполняется не больше concurrency фоновых опросов. Если они не
+    успевают начаться вовремя, это видно по задержке очереди в get_stats().
+    Последний статус каждого сервера хранится в памяти, и контроллеры
+    отвечают сразу из него, не дожидаясь RCON.
+    """
+
+    def __init__(self, database, interval: float, concurrency: int = 10,
+                 min_interval: float = 30.0, idle_factor: float = 3.0,
+                 tps_warning: float = 15.0, tps_critical: float = 10.0,
+                 crypto: Optional[CryptoService] = None):
+        """
+        Args:
+            interval: базовый интервал опроса сервера с игроками, секунды
+            min_interval: минимальный интервал (для серверов с падающим TPS)
+            idle_factor: во сколько раз реже опрашивать пустые и выключенные серверы
+            crypto: тот же CryptoService, которым зашифрованы пароли серверов
+        """
+        self.database = database
+        self.interval = interval
+        self.min_interval = min(min_interval, interval)
+        self.idle_factor = idle_factor
+        self.tps_warning = tps_warning
+        self.tps_critical = tps_critical
+        self.crypto = crypto or CryptoService()
+
+        self._slots = asyncio.Semaphore(concurrency)
+        self._snapshots: Dict[int, StatusSnapshot] = {}
+        self._inflight: Dict[int, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        # Расписание: куча (время опроса, номер, server_id); устаревшие записи
+        # не удаляются из кучи, а пропускаются - актуальное время в _due
+        self._servers: Dict[int, MonitoredServer] = {}
+        self._schedule: List[Tuple[float, int, int]] = []
+        self._due: Dict[int, float] = {}
+        self._sequence = itertools.count()
+        self._workers: Set[asyncio.Task] = set()
+
+        # Задержка очереди: насколько позже запланированного начался опрос
+        self._probes = 0
+        self._lag_last = 0.0
+        self._lag_avg = 0.0
+        self._lag_max = 0.0
+
+    def start(self):
+        """Запуск фонового опроса"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Остановка фонового опроса"""
+        tasks = [task for task in [self._task, *self._workers, *self._inflight.values()] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._workers.clear()
+        self._inflight.clear()
+
+    def get(self, server_id: int) -> Optional[StatusSnapshot]:
+        """Последний известный статус сервера (None - еще не опрашивался)"""
+        return self._snapshots.get(server_id)
+
+    async def refresh(self, server: MonitoredServer) -> StatusSnapshot:
+        """
+        Опросить сервер сейчас.
+
+        Если сервер уже опрашивается (фоном или по другому запросу),
+        ждем тот же опрос, а не начинаем еще один.
+        """
+        task = self._inflight.get(server.id)
+        if task is None:
+            task = asyncio.create_task(self._probe(server))
+            self._inflight[server.id] = task
+            task.add_done_callback(lambda _: self._inflight.pop(server.id, None) if self._inflight.get(server.id) is task else None)
+        return await asyncio.shield(task)
+
+    def next_interval(self, snapshot: Optional[StatusSnapshot]) -> float:
+        """
+        Через сколько секунд опросить сервер снова.
+
+        - TPS ниже критического порога - в 4 раза чаще, ниже порога
+          предупреждения - в 2 раза чаще (не чаще min_interval);
+        - есть игроки - базовый интервал;
+        - пустой или выключенный сервер - в idle_factor раз реже.
+
+        Интервал случайно сдвигается на ±10%, чтобы опросы серверов,
+        добавленных одновременно, со временем не собирались в пачки.
+        """
+        if snapshot is None:
+            interval = self.interval
+        else:
+            status = snapshot.status
+            tps_known = snapshot.details.get("tps") is not None
+
+            if not status.is_online:
+                interval = self.interval * self.idle_factor
+            elif tps_known and status.tps < self.tps_critical:
+                interval = self.interval / 4
+            elif tps_known and status.tps < self.tps_warning:
+                interval = self.interval / 2
+            elif status.player_count > 0:
+                interval = self.interval
+            else:
+                interval = self.interval * self.idle_factor
+
+        return max(interval, self.min_interval) * random.uniform(0.9, 1.1)
+
+    def get_stats(self) -> dict:
+        """
+        Состояние мониторинга.
+
+        lag_* - насколько позже запланированного начинались опросы,
+        overdue и lag_pending - сколько опросов уже просрочено и на сколько
+        самый старый из них: если они растут, опросы не успевают.
+        """
+        now = asyncio.get_running_loop().time()
+        overdue = [now - due for due in self._due.values() if due <= now]
+        return {
+            "servers": len(self._servers),
+            "online": sum(1 for snapshot in self._snapshots.values() if snapshot.status.is_online),
+            "inflight": len(self._inflight),
+            "scheduled": len(self._due),
+            "overdue": len(overdue),
+            "lag_pending": round(max(overdue, default=0.0), 3),
+            "probes": self._probes,
+            "lag_last": round(self._lag_last, 3),
+            "lag_avg": round(self._lag_avg, 3),
+            "lag_max": round(self._lag_max, 3),
+        }
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        logger.info(f"📊 Запуск мониторинга серверов (базовый интервал {self.interval:.0f}с)")
+        next_reload = loop.time()
+
+        while True:
+            now = loop.time()
+
+            # Список серверов перечитываем раз в базовый интервал
+            if now >= next_reload:
+                try:
+                    await self._reload_servers()
+                except Exception as e:
+                    logger.error(f"❌ Ошибка загрузки серверов для мониторинга: {e}")
+                next_reload = now + self.interval
+                continue
+
+            if not self._schedule or self._schedule[0][0] > now:
+                wake_at = min(self._schedule[0][0], next_reload) if self._schedule else next_reload
+                await asyncio.sleep(wake_at - now)
+                continue
+
+            due, _, server_id = heapq.heappop(self._schedule)
+            if self._due.get(server_id) != due:
+                continue
+
+            # Ждем свободного места: пока все заняты, очередь копит задержку
+            await self._slots.acquire()
+            if self._due.pop(server_id, None) != due:
+                # Сервер удалили, пока ждали
+                self._slots.release()
+                continue
+            self._record_lag(loop.time() - due)
+
+            worker = asyncio.create_task(self._run_probe(self._servers[server_id]))
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+
+    async def _run_probe(self, server: MonitoredServer):
+        try:
+            snapshot = await self.refresh(server)
+        except Exception as e:
+            logger.warning(f"⚠️  Ошибка опроса сервера {server.host}:{server.port}: {e!r}")
+            snapshot = None
+        finally:
+            self._slots.release()
+
+        # Сервер могли удалить, пока шел опрос
+        if server.id in self._servers:
+            self._schedule_probe(server.id, asyncio.get_running_loop().time() + self.next_interval(snapshot))
+
+    def _schedule_probe(self, server_id: int, due: float):
+        self._due[server_id] = due
+        heapq.heappush(self._schedule, (due, next(self._sequence), server_id))
+
+    def _record_lag(self, lag: float):
+        lag = max(lag, 0.0)
+        self._probes += 1
+        self._lag_last = lag
+        self._lag_max = max(self._lag_max, lag)
+        self._lag_avg = lag if self._probes == 1 else self._lag_avg * 0.9 + lag * 0.1
+
+    async def _reload_servers(self):
+        """Синхронизация расписания со списком серверов в БД"""
+        servers = {server.id: server for server in await self._load_servers()}
+        now = asyncio.get_running_loop().time()
+
+        # Удаленные и деактивированные серверы больше не опрашиваем и не показываем
+        for server_id in list(self._servers):
+            if server_id not in servers:
+                del self._servers[server_id]
+                self._due.pop(server_id, None)
+        # Снимки, сохраненные refresh() для серверов вне мониторинга, тоже
+        for server_id in list(self._snapshots):
+            if server_id not in servers:
+                del self._snapshots[server_id]
+
+        # Новые серверы равномерно распределяем по интервалу
+        new_ids = [server_id for server_id in servers if server_id not in self._servers]
+        random.shuffle(new_ids)
+        for index, server_id in enumerate(new_ids):
+            self._schedule_probe(server_id, now + self.interval * index / len(new_ids))
+
+        self._servers = servers
+
+        # Куча копит устаревшие записи - пересобираем, когда их больше половины
+        if len(self._schedule) > 2 * len(self._due) + 64:
+            self._schedule = [(due, next(self._sequence), server_id) for server_id, due in self._due.items()]
+            heapq.heapify(self._schedule)
+
+        stats = self.get_stats()
+        if stats["overdue"] and self._lag_avg > self.min_interval:
+            logger.warning(
+                f"⚠️  Мониторинг не успевает: {stats['overdue']} опросов просрочено, "
+                f"средняя задержка {self._lag_avg:.1f}с"
+            )
+        logger.debug(f"📊 Мониторинг: {stats}")
+
+    async def _load_servers(self) -> List[MonitoredServer]:
+        async with self.database.session_scope() as repos:
+            servers = await repos['servers'].get_all_servers()
+            return [
+                MonitoredServer(server.id, server.host, server.port, server.encrypted_password)
+                for server in servers
+            ]
+
+    async def _probe(self, server: MonitoredServer) -> StatusSnapshot:
+        from infrastructure.adapters.rcon_client import RconClientAdapter
+
+        monitored = server.id in self._servers
+        password = self.crypto.decrypt(server.encrypted_password)
+        client = RconClientAdapter(server.host, server.port, password)
+        details = await client.get_server_status()
+
+        snapshot = StatusSnapshot(
+            server_id=server.id,
+            status=to_server_status(details),
+            details=details,
+            checked_at=time.monotonic()
+        )
+        if monitored and server.id not in self._servers:
+            # Сервер удалили, пока шел опрос: не показываем и не пишем в историю
+            return snapshot
+
+        self._snapshots[server.id] = snapshot
+        await self._save_stats(snapshot)
+        return snapshot
+
+    async def _save_stats(self, snapshot: StatusSnapshot):
+        """Сохранение замера в историю (server_stats)"""
+        status, details = snapshot.status, snapshot.details
+        try:
+            async with self.database.session_scope() as repos:
+                await repos['stats'].save_stats(
+                    server_id=snapshot.server_id,
+                    online=status.is_online,
+                    player_count=status.player_count,
+                    max_players=status.max_players,
+                    tps=status.tps if details.get("tps") is not None else None,
+                    memory_used_mb=status.memory_used_mb if details.get("memory") else None
+                )
+        except Exception as e:
+            logger.warning(f"⚠️  Не удалось сохранить статистику сервера {snapshot.server_id}: {e}")
@@ -1,7 +1,7 @@
 # infrastructure/adapters/database/repositories.py
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
-from sqlalchemy import select, update, delete, desc, func
+from sqlalchemy import select, update, delete, desc, func, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .models import (
@@ -64,6 +64,13 @@ class ServerRepository:
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    async def get_all_servers(self) -> List[ServerModel]:
+        """Получение всех активных серверов (для фонового мониторинга)"""
+        stmt = select(ServerModel).where(ServerModel.is_active == True)
+
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
     async def delete_server(self, server_id: int, user_id: int) -> bool:
         """Удаление сервера (только если принадлежит пользователю)"""
         stmt = delete(ServerModel).where(
@@ -107,14 +114,24 @@ class SessionRepository:
             UserSessionModel.expires_at > datetime.utcnow()
         )
         result = await self.session.execute(stmt)
-        session = result.scalar_one_or_none()
+        return result.scalar_one_or_none()
 
-        if session:
-            # Обновляем время последней активности
-            session.last_activity = datetime.utcnow()
-            await self.session.flush()
+    async def update_last_activity(self, activity: Dict[int, datetime]) -> int:
+        """Обновление времени активности сессий одним запросом (user_id -> время)"""
+        if not activity:
+            return 0
 
-        return session
+        table = UserSessionModel.__table__
+        stmt = update(table).where(
+            table.c.user_id == bindparam('b_user_id')
+        ).values(last_activity=bindparam('b_last_activity'))
+
+        result = await self.session.execute(stmt, [
+            {'b_user_id': user_id, 'b_last_activity': last_activity}
+            for user_id, last_activity in activity.items()
+        ])
+        await self.session.flush()
+        return result.rowcount
 
     async def delete_user_session(self, user_id: int) -> bool:
         """Удаление сессии пользователя"""
@@ -243,15 +260,15 @@ class StatsRepository:
         self.session = session
 
     async def save_stats(self, server_id: int, online: bool, player_count: int = 0,
-                         max_players: int = 20, tps: float = 20.0,
-                         memory_used_mb: int = 0) -> ServerStatsModel:
-        """Сохранение статистики сервера"""
+                         max_players: int = 20, tps: Optional[float] = 20.0,
+                         memory_used_mb: Optional[int] = 0) -> ServerStatsModel:
+        """Сохранение статистики сервера (None - метрика не получена)"""
         stats = ServerStatsModel(
             server_id=server_id,
             online=online,
             player_count=player_count,
             max_players=max_players,
-            tps=int(tps * 10),  # Сохраняем как integer (20.0 -> 200)
+            tps=int(tps * 10) if tps is not None else None,  # Сохраняем как integer (20.0 -> 200)
             memory_used_mb=memory_used_mb
         )
 
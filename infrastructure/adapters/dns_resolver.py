@@ -0,0 +1,121 @@
+# infrastructure/adapters/dns_resolver.py
+import asyncio
+import ipaddress
+import socket
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+from loggers.app_logger import logger
+from config.settings import settings
+
+T = TypeVar("T")
+
+
+class DnsCache:
+    """
+    Асинхронный резолвер с кэшем.
+
+    Разрешение идет через loop.getaddrinfo (в пуле потоков), поэтому
+    медленный DNS не блокирует цикл событий. Успешные ответы кэшируются
+    на ttl секунд, ошибки - на negative_ttl секунд.
+
+    Запоминаются все адреса в порядке getaddrinfo: на dual-stack хостах
+    первым обычно идет IPv6, а RCON часто слушает только IPv4, поэтому
+    подключаться нужно, перебирая адреса (см. resolve_all).
+    """
+
+    def __init__(self, ttl: float = 300, negative_ttl: float = 30):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # hostname -> (время истечения, IP адреса или ошибка)
+        self._cache: Dict[str, Tuple[float, Union[List[str], socket.gaierror]]] = {}
+
+    @staticmethod
+    def _is_ip_address(host: str) -> bool:
+        try:
+            ipaddress.ip_address(host)
+            return True
+        except ValueError:
+            return False
+
+    def _get_cached(self, host: str) -> Optional[Union[List[str], socket.gaierror]]:
+        entry = self._cache.get(host)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._cache[host]
+            return None
+        return value
+
+    async def resolve(self, host: str) -> str:
+        """
+        Возвращает первый IP адрес хоста.
+
+        Raises:
+            socket.gaierror: если хост не найден (в т.ч. из негативного кэша)
+        """
+        addresses = await self.resolve_all(host)
+        return addresses[0]
+
+    async def resolve_all(self, host: str) -> List[str]:
+        """
+        Возвращает все IP адреса хоста в порядке предпочтения getaddrinfo.
+
+        Raises:
+            socket.gaierror: если хост не найден (в т.ч. из негативного кэша)
+        """
+        if self._is_ip_address(host):
+            return [host]
+
+        cached = self._get_cached(host)
+        if isinstance(cached, socket.gaierror):
+            raise cached
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+            if not infos:
+                raise socket.gaierror(socket.EAI_NONAME, f"Нет адресов для {host}")
+        except socket.gaierror as e:
+            self._cache[host] = (time.monotonic() + self.negative_ttl, e)
+            raise
+
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._cache[host] = (time.monotonic() + self.ttl, addresses)
+        logger.debug(f"DNS: {host} -> {', '.join(addresses)} (кэш на {self.ttl}с)")
+        return addresses
+
+    def invalidate(self, host: str):
+        """Удаляет запись из кэша"""
+        self._cache.pop(host, None)
+
+    def clear(self):
+        self._cache.clear()
+
+
+
+async def connect_any(addresses: List[str], connect: Callable[[str], Awaitable[T]]) -> T:
+    """
+    Подключается к первому доступному адресу, как create_connection
+    для имени хоста: при ошибке пробуется следующий адрес.
+
+    Raises:
+        OSError, asyncio.TimeoutError: ошибка последнего адреса
+    """
+    for address in addresses[:-1]:
+        try:
+            return await connect(address)
+        except (OSError, asyncio.TimeoutError) as e:
+            logger.debug(f"Адрес {address} недоступен ({e!r}), пробуем следующий")
+    return await connect(addresses[-1])
+
+
+# Глобальный DNS кэш
+dns_cache = DnsCache(
+    ttl=settings.DNS_CACHE_TTL,
+    negative_ttl=settings.DNS_NEGATIVE_CACHE_TTL
+)
@@ -0,0 +1,247 @@
+# infrastructure/adapters/query_client.py
+import asyncio
+import random
+import struct
+import time
+from typing import Dict, List, Optional, Tuple
+
+from loggers.app_logger import logger
+from config.settings import settings
+from infrastructure.adapters.dns_resolver import dns_cache
+
+# Пакеты GameSpy4 Query: FE FD <тип> <session id> [<challenge token>] [<padding>]
+QUERY_MAGIC = b"\xfe\xfd"
+TYPE_HANDSHAKE = 0x09
+TYPE_STAT = 0x00
+FULL_STAT_PADDING = b"\x00\x00\x00\x00"
+
+# Ответ на full stat: заголовок, затем пары ключ/значение, затем список игроков
+KV_SECTION_PREFIX = b"splitnum\x00\x80\x00"
+PLAYERS_SECTION_PREFIX = b"\x01player_\x00\x00"
+
+SESSION_ID = struct.Struct(">i")
+CHALLENGE_TOKEN = struct.Struct(">i")
+
+
+class QueryError(Exception):
+    """Query недоступен или ответ не удалось разобрать"""
+
+
+class _QueryProtocol(asyncio.DatagramProtocol):
+    """Один UDP сокет на запрос: отправили датаграмму - ждем одну в ответ"""
+
+    def __init__(self):
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self._waiter: Optional[asyncio.Future] = None
+
+    def connection_made(self, transport: asyncio.DatagramTransport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(data)
+
+    def error_received(self, exc: Exception):
+        # ICMP port unreachable приходит сюда как ConnectionRefusedError
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_exception(exc)
+
+    async def request(self, packet: bytes, timeout: float) -> bytes:
+        self._waiter = asyncio.get_running_loop().create_future()
+        self.transport.sendto(packet)
+        return await asyncio.wait_for(self._waiter, timeout=timeout)
+
+
+class QueryServerCache:
+    """
+    Состояние Query по серверам.
+
+    - challenge token: сервер меняет его раз в 30 секунд, поэтому храним
+      чуть меньше и не делаем handshake перед каждым запросом;
+    - недоступность: если Query не ответил, некоторое время сразу
+      используем RCON, не дожидаясь таймаута.
+    """
+
+    def __init__(self, token_ttl: float = 25, unavailable_ttl: float = 300):
+        self.token_ttl = token_ttl
+        self.unavailable_ttl = unavailable_ttl
+        self._tokens: Dict[Tuple[str, int], Tuple[float, int]] = {}
+        self._unavailable: Dict[Tuple[str, int], float] = {}
+
+    def get_token(self, host: str, port: int) -> Optional[int]:
+        entry = self._tokens.get((host, port))
+        if entry is None:
+            return None
+        expires_at, token = entry
+        if time.monotonic() >= expires_at:
+            del self._tokens[(host, port)]
+            return None
+        return token
+
+    def put_token(self, host: str, port: int, token: int):
+        self._tokens[(host, port)] = (time.monotonic() + self.token_ttl, token)
+
+    def invalidate_token(self, host: str, port: int):
+        self._tokens.pop((host, port), None)
+
+    def is_unavailable(self, host: str, port: int) -> bool:
+        until = self._unavailable.get((host, port))
+        if until is None:
+            return False
+        if time.monotonic() >= until:
+            del self._unavailable[(host, port)]
+            return False
+        return True
+
+    def mark_unavailable(self, host: str, port: int):
+        self._unavailable[(host, port)] = time.monotonic() + self.unavailable_ttl
+
+    def mark_available(self, host: str, port: int):
+        self._unavailable.pop((host, port), None)
+
+
+# Глобальное состояние Query
+query_cache = QueryServerCache(
+    token_ttl=settings.QUERY_TOKEN_TTL,
+    unavailable_ttl=settings.QUERY_UNAVAILABLE_TTL
+)
+
+
+class QueryClientAdapter:
+    """
+    Клиент протокола GameSpy4 Query (enable-query=true в server.properties).
+
+    Полный список игроков, версия и плагины приходят одной UDP датаграммой
+    и не занимают основной поток сервера, в отличие от RCON команд.
+    """
+
+    def __init__(self, host: str, port: Optional[int] = None,
+                 timeout: Optional[float] = None, retries: Optional[int] = None):
+        self.host = host
+        self.port = port or settings.QUERY_PORT
+        self.timeout = timeout or settings.QUERY_TIMEOUT
+        self.retries = retries or settings.QUERY_RETRIES
+
+    @property
+    def is_available(self) -> bool:
+        """Не отказывал ли Query недавно"""
+        return not query_cache.is_unavailable(self.host, self.port)
+
+    async def get_full_stat(self) -> dict:
+        """
+        Полная статистика сервера.
+
+        Датаграммы могут теряться, поэтому запрос повторяется до retries раз;
+        если сервер не ответил на full stat, токен мог устареть - перед
+        следующей попыткой выполняется новый handshake.
+
+        Raises:
+            QueryError: Query выключен на сервере или не ответил
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            address = await dns_cache.resolve(self.host)
+            transport, protocol = await loop.create_datagram_endpoint(
+                _QueryProtocol,
+                remote_addr=(address, self.port)
+            )
+        except OSError as e:
+            # Хост не найден (gaierror) или сокет не создать - как и молчание сервера
+            query_cache.mark_unavailable(self.host, self.port)
+            raise QueryError(f"Query {self.host}:{self.port} недоступен: {e!r}") from e
+
+        try:
+            last_error: Optional[Exception] = None
+            for attempt in range(self.retries):
+                session_id = random.getrandbits(32) & 0x0F0F0F0F
+                try:
+                    token = query_cache.get_token(self.host, self.port)
+                    if token is None:
+                        token = await self._handshake(protocol, session_id)
+                        query_cache.put_token(self.host, self.port, token)
+
+                    packet = (
+                        QUERY_MAGIC + bytes([TYPE_STAT]) + SESSION_ID.pack(session_id)
+                        + CHALLENGE_TOKEN.pack(token) + FULL_STAT_PADDING
+                    )
+                    data = await protocol.request(packet, self.timeout)
+                    stat = self._parse_full_stat(data, session_id)
+
+                    query_cache.mark_available(self.host, self.port)
+                    return stat
+
+                except (asyncio.TimeoutError, OSError, QueryError) as e:
+                    last_error = e
+                    query_cache.invalidate_token(self.host, self.port)
+                    logger.debug(f"Query {self.host}:{self.port} попытка {attempt + 1} неудачна: {e!r}")
+                    if isinstance(e, ConnectionRefusedError):
+                        break
+        finally:
+            transport.close()
+
+        query_cache.mark_unavailable(self.host, self.port)
+        raise QueryError(f"Query {self.host}:{self.port} не отвечает: {last_error!r}")
+
+    async def get_players(self) -> Tuple[int, int, List[str]]:
+        """Возвращает (онлайн, максимум, ники игроков)"""
+        stat = await self.get_full_stat()
+        return stat["players_online"], stat["max_players"], stat["players"]
+
+    async def _handshake(self, protocol: _QueryProtocol, session_id: int) -> int:
+        packet = QUERY_MAGIC + bytes([TYPE_HANDSHAKE]) + SESSION_ID.pack(session_id)
+        data = await protocol.request(packet, self.timeout)
+
+        if len(data) < 6 or data[0] != TYPE_HANDSHAKE or SESSION_ID.unpack_from(data, 1)[0] != session_id:
+            raise QueryError("Неожиданный ответ на handshake")
+
+        try:
+            return int(data[5:].split(b"\x00", 1)[0])
+        except ValueError:
+            raise QueryError("Некорректный challenge token")
+
+    @staticmethod
+    def _parse_full_stat(data: bytes, session_id: int) -> dict:
+        if len(data) < 5 or data[0] != TYPE_STAT or SESSION_ID.unpack_from(data, 1)[0] != session_id:
+            raise QueryError("Неожиданный ответ на full stat")
+
+        body = data[5:]
+        if not body.startswith(KV_SECTION_PREFIX):
+            raise QueryError("Некорректный формат full stat")
+
+        kv_part, _, players_part = body[len(KV_SECTION_PREFIX):].partition(PLAYERS_SECTION_PREFIX)
+
+        values: Dict[str, str] = {}
+        items = kv_part.split(b"\x00")
+        for key, value in zip(items[::2], items[1::2]):
+            if not key:
+                break
+            values[key.decode("utf-8", errors="replace")] = value.decode("utf-8", errors="replace")
+
+        players = [
+            name.decode("utf-8", errors="replace")
+            for name in players_part.split(b"\x00")
+            if name
+        ]
+
+        # plugins: "Paper on 1.20.4: WorldEdit 7.2; Essentials 2.20"
+        plugins_raw = values.get("plugins", "")
+        plugins = []
+        if ":" in plugins_raw:
+            plugins = [plugin.strip() for plugin in plugins_raw.split(":", 1)[1].split(";") if plugin.strip()]
+
+        try:
+            players_online = int(values.get("numplayers", len(players)))
+            max_players = int(values.get("maxplayers", 0))
+        except ValueError:
+            raise QueryError("Некорректное количество игроков")
+
+        return {
+            "motd": values.get("hostname", ""),
+            "version": values.get("version", ""),
+            "software": plugins_raw.split(":", 1)[0].strip() if plugins_raw else "",
+            "plugins": plugins,
+            "map": values.get("map", ""),
+            "players_online": players_online,
+            "max_players": max_players,
+            "players": players,
+        }
@@ -0,0 +1,126 @@
+# infrastructure/adapters/rcon_cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from config.settings import settings
+from domain.services.command_validator import CommandType
+
+ServerKey = Tuple[str, int]
+
+
+class ResponseCache:
+    """
+    Кэш ответов RCON на команды только для чтения.
+
+    - время жизни записи задается по типу команды (ttls[тип]);
+    - размер ограничен max_entries, вытесняются давно не использованные (LRU);
+    - любая изменяющая команда сбрасывает все записи своего сервера.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttls: Optional[Dict[Any, float]] = None):
+        self.max_entries = max_entries
+        self.ttls = ttls or {}
+        # (server, password, command) -> (время истечения, ответ)
+        self._entries: "OrderedDict[Tuple[ServerKey, str, str], Tuple[float, str]]" = OrderedDict()
+        self._by_server: Dict[ServerKey, Set[Tuple[ServerKey, str, str]]] = {}
+        # Счетчик изменений сервера: ответ, полученный до изменения, не кэшируется
+        self._generations: Dict[ServerKey, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_ttl(self, command_type: Hashable) -> float:
+        return self.ttls.get(command_type, 0)
+
+    def generation(self, server: ServerKey) -> int:
+        """Текущее поколение данных сервера"""
+        return self._generations.get(server, 0)
+
+    def get(self, server: ServerKey, password: str, command: str) -> Optional[str]:
+        """Возвращает закэшированный ответ или None"""
+        key = (server, password, command)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, server: ServerKey, password: str, command: str,
+            command_type: Hashable, value: str, generation: Optional[int] = None):
+        """
+        Сохраняет ответ.
+
+        Args:
+            generation: поколение сервера на момент отправки команды; если с тех
+                пор на сервере выполнялась изменяющая команда, ответ не сохраняется
+        """
+        ttl = self.get_ttl(command_type)
+        if ttl <= 0:
+            return
+        if generation is not None and generation != self.generation(server):
+            return
+
+        key = (server, password, command)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        self._by_server.setdefault(server, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate_server(self, server: ServerKey):
+        """Сбрасывает все ответы сервера (после изменяющей команды)"""
+        self._generations[server] = self.generation(server) + 1
+
+        keys = self._by_server.pop(server, set())
+        for key in keys:
+            self._entries.pop(key, None)
+        if keys:
+            self.invalidations += 1
+
+    def _remove(self, key: Tuple[ServerKey, str, str]):
+        self._entries.pop(key, None)
+        server_keys = self._by_server.get(key[0])
+        if server_keys is not None:
+            server_keys.discard(key)
+            if not server_keys:
+                del self._by_server[key[0]]
+
+    def clear(self):
+        self._entries.clear()
+        self._by_server.clear()
+
+    def get_stats(self) -> dict:
+        """Статистика кэша"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# Глобальный кэш ответов RCON
+rcon_response_cache = ResponseCache(
+    max_entries=settings.RCON_CACHE_MAX_ENTRIES,
+    ttls={
+        CommandType.SERVER_INFO: settings.RCON_CACHE_TTL_SERVER_INFO,
+        CommandType.WORLD_MANAGEMENT: settings.RCON_CACHE_TTL_WORLD_MANAGEMENT,
+    }
+)
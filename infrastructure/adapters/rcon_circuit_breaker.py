@@ -0,0 +1,197 @@
+# infrastructure/adapters/rcon_circuit_breaker.py
+import asyncio
+import time
+from enum import Enum
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from loggers.app_logger import logger
+from config.settings import settings
+from infrastructure.adapters.dns_resolver import connect_any, dns_cache
+
+
+class CircuitState(Enum):
+    """Состояния предохранителя"""
+    CLOSED = "closed"        # Сервер доступен, запросы идут как обычно
+    OPEN = "open"            # Сервер недоступен, запросы сразу отклоняются
+    HALF_OPEN = "half_open"  # Фоновая проверка прошла, пробуем один реальный запрос
+
+
+class CircuitOpenError(Exception):
+    """Сервер известен как недоступный, запрос не отправлялся"""
+
+    def __init__(self, host: str, port: int, retry_after: float):
+        self.host = host
+        self.port = port
+        self.retry_after = retry_after
+        super().__init__(
+            f"Сервер {host}:{port} недоступен, повторная проверка через {int(retry_after)}с"
+        )
+
+
+class CircuitBreaker:
+    """
+    Предохранитель для одного RCON сервера.
+
+    После failure_threshold подряд ошибок подключения переходит в OPEN
+    и запускает фоновую проверку раз в reset_timeout секунд. Когда сервер
+    снова принимает соединения - HALF_OPEN: пропускается один пробный
+    запрос, успех закрывает предохранитель, ошибка снова открывает.
+    """
+
+    def __init__(self, host: str, port: int, probe: Callable[[], Awaitable[None]],
+                 failure_threshold: int = 3, reset_timeout: float = 30):
+        self.host = host
+        self.port = port
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._trial_in_progress = False
+        self._probe_task: Optional[asyncio.Task] = None
+
+    @property
+    def retry_after(self) -> float:
+        """Сколько секунд до следующей фоновой проверки"""
+        if self.opened_at is None:
+            return 0
+        elapsed = (time.monotonic() - self.opened_at) % self.reset_timeout
+        return self.reset_timeout - elapsed
+
+    def before_call(self) -> bool:
+        """
+        Проверяет, можно ли отправить запрос.
+
+        Returns:
+            True, если запрос пробный: вызывающий обязан завершить его
+            record_success, record_failure или cancel_trial
+
+        Raises:
+            CircuitOpenError: сервер недоступен или пробный запрос уже идет
+        """
+        if self.state == CircuitState.CLOSED:
+            return False
+
+        if self.state == CircuitState.HALF_OPEN and not self._trial_in_progress:
+            self._trial_in_progress = True
+            return True
+
+        raise CircuitOpenError(self.host, self.port, self.retry_after)
+
+    def cancel_trial(self):
+        """Пробный запрос отменен, не дождавшись результата"""
+        self._trial_in_progress = False
+
+    def record_success(self):
+        if self.state != CircuitState.CLOSED:
+            logger.info(f"🟢 RCON {self.host}:{self.port} снова доступен")
+
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self._trial_in_progress = False
+
+    def record_failure(self, error: Exception):
+        self.failures += 1
+        self.last_error = f"{type(error).__name__}: {error}"
+        self._trial_in_progress = False
+
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        if self.state != CircuitState.OPEN:
+            logger.warning(
+                f"🔴 RCON {self.host}:{self.port} недоступен ({self.last_error}), "
+                f"запросы отклоняются до восстановления"
+            )
+
+        self.state = CircuitState.OPEN
+        self.opened_at = time.monotonic()
+
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.create_task(self._probe_loop())
+
+    async def _probe_loop(self):
+        """Фоновая проверка доступности, пока предохранитель открыт"""
+        while self.state == CircuitState.OPEN:
+            await asyncio.sleep(self.reset_timeout)
+            try:
+                await self.probe()
+            except Exception as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.debug(f"RCON {self.host}:{self.port}: фоновая проверка неудачна: {e}")
+                continue
+
+            if self.state == CircuitState.OPEN:
+                self.state = CircuitState.HALF_OPEN
+                logger.info(f"🟡 RCON {self.host}:{self.port} отвечает, пробуем пробный запрос")
+
+    def stop(self):
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+
+    def get_info(self) -> dict:
+        """Состояние предохранителя для отображения"""
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "retry_after": round(self.retry_after) if self.state == CircuitState.OPEN else 0,
+            "last_error": self.last_error,
+        }
+
+
+class CircuitBreakerRegistry:
+    """Предохранители по host:port"""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30, probe_timeout: float = 5):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = probe_timeout
+        self._breakers: Dict[Tuple[str, int], CircuitBreaker] = {}
+
+    def get(self, host: str, port: int) -> CircuitBreaker:
+        key = (host, port)
+        if key not in self._breakers:
+            self._breakers[key] = CircuitBreaker(
+                host,
+                port,
+                probe=lambda: self._tcp_probe(host, port),
+                failure_threshold=self.failure_threshold,
+                reset_timeout=self.reset_timeout
+            )
+        return self._breakers[key]
+
+    def get_info(self, host: str, port: int) -> dict:
+        """Состояние без создания нового предохранителя"""
+        breaker = self._breakers.get((host, port))
+        if breaker is None:
+            return {"state": CircuitState.CLOSED.value, "failures": 0, "retry_after": 0, "last_error": None}
+        return breaker.get_info()
+
+    async def _tcp_probe(self, host: str, port: int):
+        """Проверка, что порт снова принимает соединения (без авторизации)"""
+        addresses = await asyncio.wait_for(dns_cache.resolve_all(host), timeout=self.probe_timeout)
+        _, writer = await connect_any(addresses, lambda address: asyncio.wait_for(
+            asyncio.open_connection(address, port),
+            timeout=self.probe_timeout
+        ))
+        writer.close()
+        await writer.wait_closed()
+
+    def stop(self):
+        """Останавливает фоновые проверки"""
+        for breaker in self._breakers.values():
+            breaker.stop()
+
+
+# Глобальный реестр предохранителей
+rcon_breakers = CircuitBreakerRegistry(
+    failure_threshold=settings.RCON_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.RCON_BREAKER_RESET_TIMEOUT
+)
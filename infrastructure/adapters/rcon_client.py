@@ -1,12 +1,24 @@
 ﻿# infrastructure/adapters/rcon_client.py
 import asyncio
+import random
+import re
 import socket
-from typing import Optional, Tuple
-from rcon.source import rcon as rcon_async
-from rcon.exceptions import EmptyResponse, SessionTimeout, WrongPassword
+from typing import Dict, List, Optional, Tuple, Union
+from rcon.exceptions import SessionTimeout, WrongPassword
 
 from loggers.app_logger import logger
 from config.settings import settings
+from infrastructure.adapters.rcon_pool import RconConnection, rcon_pool
+from infrastructure.adapters.dns_resolver import connect_any, dns_cache
+from infrastructure.adapters.rcon_coalescer import rcon_singleflight
+from infrastructure.adapters.rcon_cache import rcon_response_cache
+from infrastructure.adapters.rcon_circuit_breaker import CircuitOpenError, CircuitState, rcon_breakers
+from infrastructure.adapters.rcon_limiter import QueueTimeoutError, ServerBusyError, rcon_limiters
+from infrastructure.adapters.slp_client import server_list_ping
+from infrastructure.adapters.server_metrics import FLAVOR_UNKNOWN, clean_response, is_unsupported, server_flavors
+from domain.services.command_validator import CommandValidator
+
+PLAYERS_PATTERN = re.compile(r'(\d+)\s*(?:/|of a max(?: of)?)\s*(\d+)')
 
 
 class RconClientAdapter:
@@ -14,31 +26,70 @@ class RconClientAdapter:
     Адаптер для работы с RCON протоколом Minecraft серверов.
     """
 
-    def __init__(self, host: str, port: int, password: str):
+    command_validator = CommandValidator()
+
+    def __init__(self, host: str, port: int, password: str, game_port: Optional[int] = None):
         self.host = host
         self.port = port
         self.password = password
+        # Игровой порт нужен только для Server List Ping
+        self.game_port = game_port or settings.MINECRAFT_GAME_PORT
 
-    async def test_connection(self) -> Tuple[bool, str]:
+    async def test_connection(self, detailed: Optional[bool] = None) -> Tuple[bool, str]:
         """
-        Детальная проверка подключения к RCON серверу
+        Проверка подключения к RCON серверу
+
+        По умолчанию выполняется быстрая проверка: одно авторизованное
+        соединение из пула, на котором сразу выполняется list. Доступность
+        порта и правильность пароля следуют из самого факта авторизации,
+        а соединение остается в пуле для следующих команд.
+
+        Args:
+            detailed: трехэтапная диагностика (DNS -> порт -> авторизация)
+                для поиска проблем. По умолчанию берется из RCON_DETAILED_CHECK
 
         Returns:
             Tuple[bool, str]: (успешность подключения, детальное сообщение)
         """
-        logger.info(f"🔍 Детальная проверка RCON: {self.host}:{self.port}")
-
         # Если режим разработки - пропускаем реальную проверку
         if settings.DEBUG and hasattr(settings, 'DEV_SKIP_RCON_CHECK') and settings.DEV_SKIP_RCON_CHECK:
             logger.info(f"[DEV MODE] Пропускаем реальную RCON проверку")
             return True, "Режим разработки: проверка пропущена"
 
+        if detailed is None:
+            detailed = settings.RCON_DETAILED_CHECK
+
+        if detailed:
+            return await self._detailed_check()
+
+        logger.info(f"🔍 Проверка RCON: {self.host}:{self.port}")
+        try:
+            response = await rcon_pool.execute(
+                self.host,
+                self.port,
+                self.password,
+                "list",
+                timeout=settings.RCON_TIMEOUT
+            )
+        except Exception as e:
+            error_msg = self._describe_connection_error(e)
+            logger.error(f"   ❌ {error_msg}")
+            return False, error_msg
+
+        return True, self._describe_check_response(response)
+
+    async def _detailed_check(self) -> Tuple[bool, str]:
+        """
+        Детальная проверка подключения: каждый этап отдельным соединением
+        """
+        logger.info(f"🔍 Детальная проверка RCON: {self.host}:{self.port}")
+
         # 1. Проверка DNS разрешения
         try:
             logger.info("  1. Проверка DNS...")
-            ip_address = socket.gethostbyname(self.host)
-            logger.info(f"     ✅ DNS разрешен: {self.host} -> {ip_address}")
-        except socket.gaierror:
+            addresses = await asyncio.wait_for(dns_cache.resolve_all(self.host), timeout=5.0)
+            logger.info(f"     ✅ DNS разрешен: {self.host} -> {', '.join(addresses)}")
+        except (socket.gaierror, asyncio.TimeoutError):
             error_msg = f"DNS ошибка: хост '{self.host}' не найден"
             logger.error(f"     ❌ {error_msg}")
             return False, error_msg
@@ -46,10 +97,10 @@ class RconClientAdapter:
         # 2. Проверка доступности порта
         try:
             logger.info(f"  2. Проверка порта {self.port}...")
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(self.host, self.port),
+            reader, writer = await connect_any(addresses, lambda address: asyncio.wait_for(
+                asyncio.open_connection(address, self.port),
                 timeout=5.0
-            )
+            ))
             writer.close()
             await writer.wait_closed()
             logger.info(f"     ✅ Порт {self.port} доступен")
@@ -66,109 +117,259 @@ class RconClientAdapter:
             logger.error(f"     ❌ {error_msg}")
             return False, error_msg
 
-        # 3. Проверка RCON авторизации
+        # 3. Проверка RCON авторизации на отдельном (не пуловом) соединении
         logger.info("  3. Проверка RCON авторизации...")
+        connection = RconConnection(self.host, self.port, self.password)
         try:
-            # Пытаемся выполнить команду list с проверкой ответа
-            response = await rcon_async(
-                command="list",
-                host=self.host,
-                port=self.port,
-                passwd=self.password,
-                timeout=10
-            )
-
-            # Проверяем, что ответ содержит валидные данные
-            if response is None:
-                error_msg = "RCON: получен пустой ответ"
-                logger.warning(f"     ⚠️  {error_msg}")
-                return True, error_msg  # Считаем успехом, но с предупреждением
-
-            response_str = str(response).strip().lower()
-
-            # Проверяем типичные ответы Minecraft
-            if "there are" in response_str and "players online" in response_str:
-                logger.info(f"     ✅ RCON авторизация успешна")
-                logger.info(f"       Ответ: {response[:100]}")
-                return True, "RCON подключение успешно"
-            elif "cannot execute" in response_str or "unknown command" in response_str:
-                # Сервер ответил, но команда не распознана (может быть другая версия)
-                logger.info(f"     ⚠️  Сервер ответил, но команда не распознана")
-                logger.info(f"       Ответ: {response[:100]}")
-                return True, "RCON подключение установлено (команда не распознана)"
-            else:
-                # Нестандартный ответ, но соединение есть
-                logger.info(f"     ⚠️  Нестандартный ответ сервера")
-                logger.info(f"       Ответ: {response[:100]}")
-                return True, f"RCON подключение установлено: {response[:50]}..."
-
-        except WrongPassword:
-            error_msg = "Неверный пароль RCON"
-            logger.error(f"     ❌ {error_msg}")
-            return False, error_msg
-        except SessionTimeout:
-            error_msg = "Таймаут сессии RCON. Проверьте настройки сервера"
-            logger.error(f"     ❌ {error_msg}")
-            return False, error_msg
-        except ConnectionRefusedError:
-            error_msg = "RCON порт закрыт или сервер не принимает RCON соединения"
-            logger.error(f"     ❌ {error_msg}")
-            return False, error_msg
-        except asyncio.TimeoutError:
-            error_msg = "Таймаут ожидания ответа RCON"
-            logger.error(f"     ❌ {error_msg}")
-            return False, error_msg
+            await connection.connect(timeout=10)
+            response = await connection.execute("list", timeout=10)
         except Exception as e:
-            error_msg = self._parse_rcon_error(e)
+            error_msg = self._describe_connection_error(e)
             logger.error(f"     ❌ {error_msg}")
             return False, error_msg
+        finally:
+            await connection.close()
 
-    async def execute_command(self, command: str) -> str:
+        return True, self._describe_check_response(response)
+
+    def _describe_check_response(self, response: str) -> str:
         """
-        Выполняет команду на сервере с повторными попытками
+        Сообщение об успешной проверке по ответу на list
         """
-        return await self._execute_with_retry(command)
+        # Проверяем, что ответ содержит валидные данные
+        if not response:
+            error_msg = "RCON: получен пустой ответ"
+            logger.warning(f"     ⚠️  {error_msg}")
+            return error_msg  # Считаем успехом, но с предупреждением
+
+        response_str = response.strip().lower()
+
+        # Проверяем типичные ответы Minecraft
+        if "there are" in response_str and "players online" in response_str:
+            logger.info(f"     ✅ RCON авторизация успешна")
+            logger.info(f"       Ответ: {response[:100]}")
+            return "RCON подключение успешно"
+        elif "cannot execute" in response_str or "unknown command" in response_str:
+            # Сервер ответил, но команда не распознана (может быть другая версия)
+            logger.info(f"     ⚠️  Сервер ответил, но команда не распознана")
+            logger.info(f"       Ответ: {response[:100]}")
+            return "RCON подключение установлено (команда не распознана)"
+        else:
+            # Нестандартный ответ, но соединение есть
+            logger.info(f"     ⚠️  Нестандартный ответ сервера")
+            logger.info(f"       Ответ: {response[:100]}")
+            return f"RCON подключение установлено: {response[:50]}..."
 
-    async def send_command(self, command: str) -> Tuple[bool, str]:
+    def _describe_connection_error(self, error: Exception) -> str:
+        """
+        Понятное сообщение об ошибке подключения/авторизации
+        """
+        if isinstance(error, socket.gaierror):
+            return f"DNS ошибка: хост '{self.host}' не найден"
+        elif isinstance(error, WrongPassword):
+            return "Неверный пароль RCON"
+        elif isinstance(error, SessionTimeout):
+            return "Таймаут сессии RCON. Проверьте настройки сервера"
+        elif isinstance(error, ConnectionRefusedError):
+            return f"Соединение отклонено: порт {self.port} закрыт или сервер не принимает RCON соединения"
+        elif isinstance(error, QueueTimeoutError):
+            return "Сервер занят: команда не дождалась очереди, попробуйте позже"
+        elif isinstance(error, asyncio.TimeoutError):
+            return f"Таймаут: сервер {self.host} не отвечает на порту {self.port}"
+        elif isinstance(error, CircuitOpenError):
+            return str(error)
+        else:
+            return self._parse_rcon_error(error)
+
+    async def execute_command(self, command: str, deadline: Optional[float] = None) -> str:
+        """
+        Выполняет команду на сервере с повторными попытками.
+
+        Команды только на чтение (list, version, time query) кэшируются
+        на короткое время, а одинаковые, пришедшие одновременно для одного
+        сервера, выполняются одним RCON запросом с общим результатом.
+        Любая изменяющая команда сбрасывает кэш своего сервера.
+
+        Args:
+            deadline: общий лимит времени в секундах на все попытки
+                (по умолчанию RCON_COMMAND_DEADLINE)
+        """
+        server = (self.host, self.port)
+        normalized = self._normalize_command(command)
+
+        if not self.command_validator.is_read_only_command(normalized):
+            try:
+                return await self._execute_single(command, deadline)
+            finally:
+                rcon_response_cache.invalidate_server(server)
+
+        cached = rcon_response_cache.get(server, self.password, normalized)
+        if cached is not None:
+            return cached
+
+        async def fetch() -> str:
+            # Кэширует только тот, кто выполнил запрос, и с поколением на момент
+            # отправки: ответ, полученный до изменяющей команды, не сохранится
+            generation = rcon_response_cache.generation(server)
+            result = await self._execute_single(command, deadline)
+            rcon_response_cache.put(
+                server,
+                self.password,
+                normalized,
+                self.command_validator.get_command_type(normalized),
+                result,
+                generation=generation
+            )
+            return result
+
+        # Поколение в ключе: после изменяющей команды не присоединяемся к запросу,
+        # отправленному до нее
+        key = (self.host, self.port, self.password, normalized, rcon_response_cache.generation(server))
+        return await rcon_singleflight.do(key, fetch)
+
+    async def _execute_single(self, command: str, deadline: Optional[float] = None) -> str:
+        results = await self._execute_with_retry([command], deadline)
+        return results[0]
+
+    @staticmethod
+    def _normalize_command(command: str) -> str:
+        """Приводит команду к каноничному виду для ключей кэша/объединения"""
+        return " ".join(command.strip().lower().split())
+
+    async def execute_many(self, commands: List[str], deadline: Optional[float] = None) -> List[str]:
+        """
+        Выполняет несколько команд подряд на одном соединении.
+
+        Команды идут по очереди (Minecraft не принимает несколько пакетов
+        за раз), но без авторизации и места в очереди сервера на каждую.
+        """
+        if not commands:
+            return []
+
+        mutating = not all(self.command_validator.is_read_only_command(command) for command in commands)
+        try:
+            return await self._execute_with_retry(commands, deadline)
+        finally:
+            if mutating:
+                rcon_response_cache.invalidate_server((self.host, self.port))
+
+    async def send_command(self, command: str, deadline: Optional[float] = None) -> Tuple[bool, str]:
         """
         Выполняет команду и возвращает результат
         """
         try:
-            result = await self.execute_command(command)
+            result = await self.execute_command(command, deadline)
             return True, result
         except Exception as e:
             error_msg = self._parse_rcon_error(e)
             return False, f"Ошибка: {error_msg}"
 
-    async def _execute_with_retry(self, command: str) -> str:
+    async def _execute_with_retry(self, commands: List[str], deadline: Optional[float] = None) -> List[str]:
         """
-        Внутренний метод с повторными попытками
+        Внутренний метод с повторными попытками.
+
+        - все попытки вместе укладываются в deadline: таймаут попытки
+          урезается до оставшегося времени, а пауза, которая не влезает
+          в лимит, означает конец попыток;
+        - пауза растет экспоненциально со случайным разбросом, чтобы
+          клиенты не повторяли запросы синхронно после рестарта сервера;
+        - неидемпотентные команды (stop, ban, say...) повторяются только
+          если точно не дошли до сервера (отказ в соединении, ошибка DNS);
+        - если сервер известен как недоступный (предохранитель открыт),
+          команда сразу завершается CircuitOpenError;
+        - команды одного сервера проходят через его очередь с ограничением
+          частоты; если очередь заполнена - сразу ServerBusyError.
         """
         last_exception = None
+        description = "; ".join(commands)
 
-        for attempt in range(settings.RCON_MAX_RETRIES):
-            try:
-                logger.debug(f"RCON команда [{attempt + 1}/{settings.RCON_MAX_RETRIES}]: {command}")
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + (deadline or settings.RCON_COMMAND_DEADLINE)
+        idempotent = all(self.command_validator.is_idempotent_command(command) for command in commands)
+
+        breaker = rcon_breakers.get(self.host, self.port)
+        # Предохранитель проверяем до очереди: пока сервер недоступен, команда
+        # сразу получает CircuitOpenError, не занимая место и токен частоты.
+        # Пробный запрос (HALF_OPEN) должен закончиться record_* или cancel_trial,
+        # иначе предохранитель навсегда останется в ожидании его результата
+        trial = breaker.before_call()
 
-                response = await rcon_async(
-                    command=command,
-                    host=self.host,
-                    port=self.port,
-                    passwd=self.password,
-                    timeout=settings.RCON_TIMEOUT
-                )
+        try:
+            # Ждем места в очереди сервера; время ожидания входит в deadline
+            async with rcon_limiters.get(self.host, self.port).slot(timeout=deadline_at - loop.time()):
+                for attempt in range(settings.RCON_MAX_RETRIES):
+                    remaining = deadline_at - loop.time()
+                    if remaining <= 0:
+                        break
+
+                    try:
+                        logger.debug(f"RCON команда [{attempt + 1}/{settings.RCON_MAX_RETRIES}]: {description}")
+
+                        # Берем авторизованное соединение из пула вместо нового подключения
+                        responses = await rcon_pool.execute_many(
+                            self.host,
+                            self.port,
+                            self.password,
+                            commands,
+                            timeout=min(settings.RCON_TIMEOUT, remaining)
+                        )
+
+                        trial = False
+                        breaker.record_success()
+                        return [response.strip() if response else "" for response in responses]
+
+                    except Exception as e:
+                        last_exception = e
+                        logger.warning(f"Попытка {attempt + 1} неудачна: {e}")
+
+                        trial = False
+                        if self._is_connection_failure(e):
+                            breaker.record_failure(e)
+                            if breaker.state != CircuitState.CLOSED:
+                                # Сервер признан недоступным - оставшиеся попытки бессмысленны
+                                break
+                        else:
+                            # Сервер ответил (например, неверным паролем) - он доступен
+                            breaker.record_success()
+
+                        if not self._is_retryable(e, idempotent):
+                            break
+
+                        if attempt < settings.RCON_MAX_RETRIES - 1:
+                            delay = self._backoff_delay(attempt)
+                            if loop.time() + delay >= deadline_at:
+                                break
+                            await asyncio.sleep(delay)
+        finally:
+            if trial:
+                # Пробный запрос не дал результата (истек deadline, очередь, отмена)
+                breaker.cancel_trial()
+
+        raise last_exception or asyncio.TimeoutError("Истекло время на выполнение команды")
 
-                return response.strip() if response else ""
+    @staticmethod
+    def _backoff_delay(attempt: int) -> float:
+        """Экспоненциальная пауза с полным случайным разбросом"""
+        ceiling = min(settings.RCON_RETRY_MAX_DELAY, settings.RCON_RETRY_DELAY * 2 ** attempt)
+        return random.uniform(0, ceiling)
 
-            except EmptyResponse:
-                return ""
-            except Exception as e:
-                last_exception = e
-                logger.warning(f"Попытка {attempt + 1} неудачна: {e}")
-                if attempt < settings.RCON_MAX_RETRIES - 1:
-                    await asyncio.sleep(settings.RCON_RETRY_DELAY)
+    @staticmethod
+    def _is_retryable(error: Exception, idempotent: bool) -> bool:
+        """Можно ли повторить команду после такой ошибки"""
+        if isinstance(error, (WrongPassword, CircuitOpenError)):
+            return False
 
-        raise last_exception or Exception("Все попытки выполнения команды неудачны")
+        # Команда гарантированно не была отправлена
+        if isinstance(error, (ConnectionRefusedError, socket.gaierror)):
+            return True
+
+        # Ответ мог потеряться уже после выполнения - повторяем только безопасные
+        return idempotent
+
+    @staticmethod
+    def _is_connection_failure(error: Exception) -> bool:
+        """Ошибка говорит о недоступности сервера, а не об ответе с ошибкой"""
+        return isinstance(error, (OSError, asyncio.TimeoutError))
 
     def _parse_rcon_error(self, error: Exception) -> str:
         """
@@ -188,56 +389,308 @@ class RconClientAdapter:
             return "Неверный пароль RCON"
         elif isinstance(error, SessionTimeout):
             return "Таймаут сессии RCON"
+        elif isinstance(error, CircuitOpenError):
+            return str(error)
+        elif isinstance(error, ServerBusyError):
+            return "Сервер занят: слишком много команд в очереди, попробуйте позже"
+        elif isinstance(error, QueueTimeoutError):
+            return "Сервер занят: команда не дождалась очереди, попробуйте позже"
         else:
             return f"Ошибка RCON: {type(error).__name__}: {error}"
 
-    async def get_server_status(self) -> dict:
+    # Пробы статуса: поле -> команда. Выполняются параллельно вместе со
+    # сборщиками метрик (TPS, MSPT, память), команды которых зависят
+    # от разновидности сервера - см. server_metrics
+    STATUS_PROBES = {
+        "players": "list",
+        "version": "version",
+    }
+
+    # Поля, которые отдает Server List Ping без RCON
+    SLP_FIELDS = ("players", "version", "motd")
+
+    async def get_server_status(self, deadline: Optional[float] = None,
+                                use_slp: Optional[bool] = None) -> dict:
         """
-        Получение статуса сервера с проверкой
+        Получение статуса сервера.
+
+        С use_slp (по умолчанию STATUS_USE_SLP) онлайн, игроки, MOTD, версия
+        и задержка берутся из Server List Ping на игровом порту - без
+        авторизации, за один обмен пакетами. Одновременно по RCON собираются
+        только TPS и память; если SLP не ответил, игроки и версия тоже
+        берутся по RCON. Источник каждого поля - в status["sources"].
+
+        Если часть данных не получена, возвращается частичный результат,
+        а причина записывается в status["errors"][поле].
+
+        Args:
+            deadline: общий лимит времени в секундах (по умолчанию RCON_STATUS_DEADLINE)
+            use_slp: использовать Server List Ping
+        """
+        deadline = deadline or settings.RCON_STATUS_DEADLINE
+        use_slp = settings.STATUS_USE_SLP if use_slp is None else use_slp
+
+        if not use_slp:
+            return await self._rcon_status(self.STATUS_PROBES, deadline, metrics=True)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        rcon_probes = {
+            field: command for field, command in self.STATUS_PROBES.items()
+            if field not in self.SLP_FIELDS
+        }
+
+        slp, status = await asyncio.gather(
+            asyncio.wait_for(server_list_ping(self.host, self.game_port, timeout=deadline), timeout=deadline),
+            self._rcon_status(rcon_probes, deadline, metrics=True),
+            return_exceptions=True
+        )
+        if isinstance(status, BaseException):
+            raise status
+
+        if isinstance(slp, BaseException):
+            status["errors"]["slp"] = self._describe_slp_error(slp)
+
+            # SLP недоступен (закрыт порт, прокси) - добираем его поля по RCON
+            remaining = deadline - (loop.time() - started)
+            if status["online"] and remaining > 0:
+                fallback = {
+                    field: command for field, command in self.STATUS_PROBES.items()
+                    if field in self.SLP_FIELDS
+                }
+                extra = await self._rcon_status(fallback, remaining)
+                for field in fallback:
+                    if field in extra["sources"]:
+                        status[field] = extra[field]
+                        status["sources"][field] = "rcon"
+                    elif field in extra["errors"]:
+                        status["errors"][field] = extra["errors"][field]
+            return status
+
+        # Сервер ответил на SLP - он онлайн, даже если RCON недоступен
+        if not status["online"] and status["error"]:
+            status["errors"]["rcon"] = status["error"]
+            for field in [*rcon_probes, *server_flavors.get_collectors(self.host, self.port)]:
+                status["errors"].setdefault(field, status["error"])
+        status["online"] = True
+        status["error"] = None
+
+        status.update(slp)
+        status["sources"].update(online="slp", latency_ms="slp", **{field: "slp" for field in self.SLP_FIELDS})
+        return status
+
+    async def _rcon_status(self, probes: dict, deadline: float, metrics: bool = False) -> dict:
+        """
+        Статус по RCON.
+
+        Доступность и авторизация определяются по первому же соединению
+        из пула, затем пробы выполняются параллельно (см. _run_probes).
+        Общее время ограничено deadline: пробы, не успевшие ответить,
+        попадают в errors.
+
+        С metrics добавляются сборщики TPS/MSPT/памяти для разновидности
+        сервера; разновидность определяется при первом опросе и запоминается.
         """
         status = {
             "online": False,
             "players": "0/0",
             "version": "Неизвестно",
             "motd": "Неизвестно",
-            "error": None
+            "tps": None,
+            "mspt": None,
+            "memory": None,
+            "uptime_seconds": None,
+            "flavor": None,
+            "latency_ms": None,
+            "error": None,
+            "errors": {},
+            "sources": {},
+            "breaker": None
         }
 
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        breaker = rcon_breakers.get(self.host, self.port)
+
+        trial = False
         try:
-            # Проверяем базовое подключение
-            success, message = await self.test_connection()
+            # Пока сервер известен как недоступный, не ждем ни таймаута, ни очереди
+            trial = breaker.before_call()
+
+            # Пробы статуса занимают одно место в очереди сервера
+            async with rcon_limiters.get(self.host, self.port).slot(timeout=deadline):
+                async with rcon_pool.connection(self.host, self.port, self.password, timeout=deadline) as connection:
+                    status["online"] = True
+                    status["sources"]["online"] = "rcon"
+                    trial = False
+                    breaker.record_success()
+
+                    collectors, answered = {}, {}
+                    if metrics:
+                        collectors, answered = await self._get_collectors(
+                            connection, deadline - (loop.time() - started)
+                        )
+                        status["flavor"] = server_flavors.get(self.host, self.port)
+                        probes = {**probes, **{field: collector.command for field, collector in collectors.items()}}
+
+                    # Ответы, уже полученные при определении разновидности, не запрашиваем снова
+                    results = {field: answered[command] for field, command in probes.items() if command in answered}
+                    pending = {field: command for field, command in probes.items() if field not in results}
+                    results.update(await self._run_probes(connection, pending, started + deadline))
+
+                    for field in pending:
+                        if field not in results:
+                            status["errors"][field] = "Таймаут ожидания ответа"
+
+                    for field, response in results.items():
+                        if isinstance(response, Exception):
+                            status["errors"][field] = self._describe_connection_error(response)
+                            continue
+
+                        response = response.strip()
+                        if is_unsupported(response):
+                            status["errors"][field] = "Не поддерживается сервером"
+                            collector = collectors.get(field)
+                            if collector and not collector.optional and status["flavor"] != FLAVOR_UNKNOWN:
+                                # Ядро сервера сменилось - определим разновидность заново
+                                server_flavors.invalidate(self.host, self.port)
+                            continue
+
+                        self._apply_status_probe(status, field, response, collectors)
+                        if field not in status["errors"]:
+                            status["sources"][field] = "rcon"
 
-            if not success:
-                status["error"] = message
-                return status
+        except Exception as e:
+            if isinstance(e, QueueTimeoutError):
+                # Очередь бота, а не сервер - предохранитель не трогаем
+                pass
+            elif not status["online"] and self._is_connection_failure(e):
+                trial = False
+                breaker.record_failure(e)
+            elif not status["online"] and not isinstance(e, (CircuitOpenError, ServerBusyError)):
+                trial = False
+                breaker.record_success()
+            status["online"] = False
+            status["sources"].pop("online", None)
+            status["error"] = self._describe_connection_error(e)
+        finally:
+            if trial:
+                # Пробный запрос не дал результата (отмена)
+                breaker.cancel_trial()
+
+        status["breaker"] = breaker.get_info()
+        return status
+
+    def _describe_slp_error(self, error: BaseException) -> str:
+        """Понятное сообщение об ошибке Server List Ping"""
+        if isinstance(error, asyncio.TimeoutError):
+            return f"SLP: игровой порт {self.game_port} не ответил вовремя"
+        elif isinstance(error, ConnectionRefusedError):
+            return f"SLP: игровой порт {self.game_port} закрыт"
+        elif isinstance(error, socket.gaierror):
+            return f"SLP: хост '{self.host}' не найден"
+        return f"SLP: {type(error).__name__}: {error}"
+
+    async def _get_collectors(self, connection: RconConnection, timeout: float) -> Tuple[dict, Dict[str, str]]:
+        """
+        Сборщики метрик для сервера; при первом опросе определяет его разновидность.
+
+        Returns:
+            (сборщики, ответы на команды, выполненные при определении разновидности)
+        """
+        answered = {}
 
-            status["online"] = True
+        async def execute(command: str) -> str:
+            answered[command] = await connection.execute(command, timeout=timeout)
+            return answered[command]
 
-            # Получаем список игроков
+        if server_flavors.get(self.host, self.port) is None and timeout > 0:
             try:
-                list_response = await self.execute_command("list")
-                if list_response:
-                    import re
-                    # Ищем паттерн "There are X/Y players online:"
-                    match = re.search(r'(\d+)/(\d+)', list_response)
-                    if match:
-                        status["players"] = f"{match.group(1)}/{match.group(2)}"
-            except:
-                pass
+                await server_flavors.detect(self.host, self.port, execute)
+            except Exception as e:
+                # Не успели - попробуем в следующий раз, пока собираем как для неизвестного
+                logger.debug(f"Не удалось определить разновидность {self.host}:{self.port}: {e!r}")
+        return server_flavors.get_collectors(self.host, self.port), answered
 
-            # Получаем версию
+    async def _run_probes(self, connection: RconConnection, probes: Dict[str, str],
+                          deadline_at: float) -> Dict[str, Union[str, Exception]]:
+        """
+        Выполняет пробы параллельно на нескольких соединениях пула.
+
+        Соединение выполняет команды строго по очереди, поэтому пробы
+        разбираются несколькими соединениями: уже открытым и еще до
+        RCON_POOL_MAX_SIZE - 1 из пула. Так статус готов примерно за время
+        самой медленной пробы, а не за их сумму.
+
+        Returns:
+            поле -> ответ или ошибка; пробы, не успевшие до deadline_at, отсутствуют
+        """
+        loop = asyncio.get_running_loop()
+        queue = list(probes.items())
+        results: Dict[str, Union[str, Exception]] = {}
+        finished = asyncio.Event()
+
+        async def drain(worker: RconConnection):
+            while queue:
+                field, command = queue.pop(0)
+                try:
+                    results[field] = await worker.execute(command, timeout=max(deadline_at - loop.time(), 0))
+                except Exception as e:
+                    results[field] = e
+                if len(results) == len(probes):
+                    finished.set()
+
+        async def extra_worker():
             try:
-                version_response = await self.execute_command("version")
-                if version_response:
-                    status["version"] = version_response.split('\n')[0]
-            except:
-                pass
+                async with rcon_pool.connection(self.host, self.port, self.password,
+                                                timeout=max(deadline_at - loop.time(), 0)) as worker:
+                    await drain(worker)
+            except Exception as e:
+                # Пробы достанутся остальным соединениям
+                logger.debug(f"Дополнительное соединение к {self.host}:{self.port} не открылось: {e!r}")
 
-            return status
+        if not queue:
+            return results
 
-        except Exception as e:
-            status["error"] = str(e)
-            return status
+        extra = min(len(queue), rcon_pool.max_size) - 1
+        workers = [asyncio.create_task(drain(connection))]
+        workers += [asyncio.create_task(extra_worker()) for _ in range(extra)]
+        try:
+            await asyncio.wait_for(finished.wait(), timeout=max(deadline_at - loop.time(), 0))
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            # Все ответы получены, истек deadline или опрос отменен (например,
+            # остановка мониторинга): еще не подключившиеся соединения не нужны
+            for worker in workers:
+                worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+        return results
+
+    def _apply_status_probe(self, status: dict, field: str, response: str, collectors: Optional[dict] = None):
+        """
+        Разбор ответа одной пробы в поле статуса
+        """
+        clean = clean_response(response)
+
+        if field == "players":
+            # Ищем паттерн "There are X/Y players online:" или "X of a max of Y"
+            match = PLAYERS_PATTERN.search(clean)
+            if match:
+                status["players"] = f"{match.group(1)}/{match.group(2)}"
+            else:
+                status["errors"][field] = "Не удалось разобрать ответ"
+
+        elif field == "version":
+            status["version"] = clean.split('\n')[0]
+
+        elif collectors and field in collectors:
+            values = collectors[field].parse(clean)
+            if values is not None:
+                status.update(values)
+            else:
+                status["errors"][field] = "Не удалось разобрать ответ"
 
 
 # Фабрика с улучшенной проверкой
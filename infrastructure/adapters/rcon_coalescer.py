@@ -0,0 +1,56 @@
+# infrastructure/adapters/rcon_coalescer.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых одновременных запросов.
+
+    Пока запрос с некоторым ключом выполняется, все остальные вызовы
+    с тем же ключом не запускают свой, а ждут результат первого.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Выполняет factory() или присоединяется к уже идущему вызову с тем же ключом.
+
+        Общий вызов выполняется отдельной задачей, поэтому отмена одного
+        из ожидающих не отменяет запрос для остальных.
+        """
+        self.calls += 1
+        task = self._inflight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.shared += 1
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # Помечаем ошибку прочитанной, даже если все ожидающие были отменены
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self) -> dict:
+        """Статистика объединения запросов"""
+        return {
+            "calls": self.calls,
+            "shared": self.shared,
+            "inflight": len(self._inflight),
+        }
+
+
+# Глобальный объединитель RCON запросов на чтение
+rcon_singleflight = SingleFlight()
@@ -0,0 +1,118 @@
+# infrastructure/adapters/rcon_codec.py
+import struct
+from typing import Iterator, Tuple
+
+# Пакет Source RCON: <size:int32><id:int32><type:int32><payload>\0\0,
+# все числа little-endian, size не включает само поле size
+
+# Типы пакетов Source RCON
+SERVERDATA_AUTH = 3
+SERVERDATA_AUTH_RESPONSE = 2
+SERVERDATA_EXECCOMMAND = 2
+SERVERDATA_RESPONSE_VALUE = 0
+
+INT32_MAX = 2_147_483_647
+
+SIZE = struct.Struct("<i")
+HEADER = struct.Struct("<iii")
+TERMINATOR = b"\x00\x00"
+
+# id + type + терминатор - минимальный размер пакета с пустым payload
+MIN_PACKET_SIZE = 10
+# Minecraft режет ответ на фрагменты по 4096 байт, с запасом для других серверов
+MAX_PACKET_SIZE = 64 * 1024
+
+# Начальный размер приемного буфера - несколько максимальных пакетов Minecraft
+RECEIVE_BUFFER_SIZE = 16 * 1024
+
+
+class PacketFormatError(ValueError):
+    """В потоке пришел пакет с некорректным размером - поток рассинхронизирован"""
+
+
+def encode_packet(request_id: int, packet_type: int, payload: bytes) -> bytes:
+    """
+    Кодирует один пакет (команды короткие - склейка дешевле буфера).
+
+    Каждый пакет отправляется отдельной записью в сокет: Vanilla/Paper
+    рвут соединение, если за одно чтение пришло больше одного пакета.
+    """
+    return HEADER.pack(MIN_PACKET_SIZE + len(payload), request_id, packet_type) + payload + TERMINATOR
+
+
+class PacketReader:
+    """
+    Разбор входящего потока на пакеты.
+
+    Данные копируются в один переиспользуемый буфер, а payload
+    возвращается как memoryview на этот буфер - без копирования.
+    Поэтому payload действителен только до следующего feed():
+    его нужно сразу скопировать или декодировать.
+    """
+
+    __slots__ = ("_buffer", "_start", "_end", "max_packet_size")
+
+    def __init__(self, initial_size: int = RECEIVE_BUFFER_SIZE, max_packet_size: int = MAX_PACKET_SIZE):
+        self._buffer = bytearray(initial_size)
+        self._start = 0
+        self._end = 0
+        self.max_packet_size = max_packet_size
+
+    @property
+    def pending_bytes(self) -> int:
+        """Сколько байт ждут окончания пакета"""
+        return self._end - self._start
+
+    def feed(self, data: bytes):
+        """Добавляет пришедшие из сокета данные"""
+        size = len(data)
+        if self._end + size > len(self._buffer):
+            self._make_room(size)
+
+        with memoryview(self._buffer) as view:
+            view[self._end:self._end + size] = data
+        self._end += size
+
+    def _make_room(self, size: int):
+        pending = self._end - self._start
+        needed = pending + size
+
+        if needed <= len(self._buffer):
+            # Хватает места, если сдвинуть недочитанный хвост в начало
+            with memoryview(self._buffer) as view:
+                view[:pending] = view[self._start:self._end]
+        else:
+            # Буфер не изменяет размер на месте: на него могут ссылаться
+            # ранее выданные memoryview, поэтому выделяем новый
+            grown = bytearray(max(needed, len(self._buffer) * 2))
+            grown[:pending] = memoryview(self._buffer)[self._start:self._end]
+            self._buffer = grown
+
+        self._start = 0
+        self._end = pending
+
+    def read_packets(self) -> Iterator[Tuple[int, int, memoryview]]:
+        """
+        Возвращает все полностью пришедшие пакеты как (id, type, payload).
+
+        Raises:
+            PacketFormatError: размер пакета вне допустимых границ
+        """
+        view = memoryview(self._buffer)
+        buffer = self._buffer
+
+        while self._end - self._start >= HEADER.size:
+            size, request_id, packet_type = HEADER.unpack_from(buffer, self._start)
+            if not MIN_PACKET_SIZE <= size <= self.max_packet_size:
+                raise PacketFormatError(f"Некорректный размер RCON пакета: {size}")
+
+            end = self._start + SIZE.size + size
+            if end > self._end:
+                break
+
+            payload = view[self._start + HEADER.size:end - len(TERMINATOR)]
+            self._start = end
+            yield request_id, packet_type, payload
+
+        if self._start == self._end:
+            self._start = self._end = 0
@@ -0,0 +1,188 @@
+# infrastructure/adapters/rcon_limiter.py
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+
+from config.settings import settings
+
+
+class ServerBusyError(Exception):
+    """Очередь команд сервера заполнена, команда не принята"""
+
+    def __init__(self, host: str, port: int, queued: int):
+        self.host = host
+        self.port = port
+        self.queued = queued
+        super().__init__(f"Сервер {host}:{port} перегружен: в очереди {queued} команд")
+
+
+class QueueTimeoutError(asyncio.TimeoutError):
+    """Команда не дождалась своей очереди до истечения deadline"""
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self.host = host
+        self.port = port
+        super().__init__(f"Сервер {host}:{port} занят: команда не дождалась очереди за {timeout:.1f}с")
+
+
+class TokenBucket:
+    """
+    Ограничитель частоты: rate команд в секунду с запасом burst.
+
+    Токен резервируется сразу при вызове acquire(), поэтому одновременные
+    ожидающие получают время отправки по очереди, а не все разом.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Резервирует токен и возвращает, сколько секунд ждать"""
+        if self.rate <= 0:
+            return 0
+        self._refill()
+        self._tokens -= 1
+        return max(-self._tokens / self.rate, 0)
+
+    async def acquire(self) -> float:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+
+class ServerLimiter:
+    """
+    Очередь команд одного RCON сервера.
+
+    Одновременно выполняется не больше concurrency команд, остальные
+    ждут в очереди длиной не больше queue_size. Если очередь заполнена,
+    команда сразу отклоняется ServerBusyError - обработчики не копятся.
+    Частота отправки дополнительно ограничена токен-бакетом, чтобы всплеск
+    команд не вызывал лаги тиков на сервере.
+    """
+
+    def __init__(self, host: str, port: int, rate: float, burst: int,
+                 concurrency: int, queue_size: int):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self._bucket = TokenBucket(rate, burst)
+        self._slots = asyncio.Semaphore(concurrency)
+
+        self.queued = 0
+        self.active = 0
+        self.max_queued = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.throttled = 0
+        self.wait_time = 0.0
+
+    @asynccontextmanager
+    async def slot(self, timeout: Optional[float] = None):
+        """
+        Место в очереди на выполнение одной команды (или пакета команд).
+
+        Args:
+            timeout: сколько секунд можно ждать (остаток deadline команды);
+                не дождались - QueueTimeoutError
+        """
+        if self.queued >= self.queue_size:
+            self.rejected += 1
+            raise ServerBusyError(self.host, self.port, self.queued)
+
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._acquire(), timeout=max(timeout, 0) if timeout is not None else None)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise QueueTimeoutError(self.host, self.port, timeout) from None
+        finally:
+            self.queued -= 1
+
+        self.accepted += 1
+        self.wait_time += time.monotonic() - started
+        self.active += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._slots.release()
+
+    async def _acquire(self):
+        await self._slots.acquire()
+        try:
+            if await self._bucket.acquire() > 0:
+                self.throttled += 1
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def get_stats(self) -> dict:
+        return {
+            "queued": self.queued,
+            "active": self.active,
+            "max_queued": self.max_queued,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "throttled": self.throttled,
+            "avg_wait_ms": round(self.wait_time / self.accepted * 1000, 1) if self.accepted else 0,
+        }
+
+
+class ServerLimiterRegistry:
+    """Очереди команд по host:port"""
+
+    def __init__(self, rate: float = 10.0, burst: int = 20, concurrency: int = 4, queue_size: int = 32):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self._limiters: Dict[Tuple[str, int], ServerLimiter] = {}
+
+    def get(self, host: str, port: int) -> ServerLimiter:
+        key = (host, port)
+        if key not in self._limiters:
+            self._limiters[key] = ServerLimiter(
+                host,
+                port,
+                rate=self.rate,
+                burst=self.burst,
+                concurrency=self.concurrency,
+                queue_size=self.queue_size
+            )
+        return self._limiters[key]
+
+    def get_info(self, host: str, port: int) -> Optional[dict]:
+        """Очередь сервера без создания нового ограничителя (None - команд еще не было)"""
+        limiter = self._limiters.get((host, port))
+        return limiter.get_stats() if limiter is not None else None
+
+    def get_stats(self) -> dict:
+        """Глубина очередей и счетчики по серверам"""
+        return {
+            f"{host}:{port}": limiter.get_stats()
+            for (host, port), limiter in self._limiters.items()
+        }
+
+
+# Глобальные очереди команд RCON
+rcon_limiters = ServerLimiterRegistry(
+    rate=settings.RCON_RATE_LIMIT,
+    burst=settings.RCON_RATE_BURST,
+    concurrency=settings.RCON_MAX_CONCURRENCY,
+    queue_size=settings.RCON_QUEUE_SIZE
+)
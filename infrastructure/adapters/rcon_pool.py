@@ -0,0 +1,278 @@
+# infrastructure/adapters/rcon_pool.py
+import asyncio
+import time
+from functools import partial
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
+
+from loggers.app_logger import logger
+from config.settings import settings
+from infrastructure.adapters.rcon_protocol import RconProtocol
+from infrastructure.adapters.dns_resolver import connect_any, dns_cache
+
+PoolKey = Tuple[str, int, str]
+
+
+def _remaining(deadline_at: float) -> float:
+    """Сколько секунд осталось до deadline_at (по часам цикла событий)"""
+    return max(deadline_at - asyncio.get_running_loop().time(), 0)
+
+
+class RconConnection:
+    """
+    Авторизованное RCON соединение, которое можно переиспользовать
+    для нескольких команд подряд.
+    """
+
+    def __init__(self, host: str, port: int, password: str):
+        self.host = host
+        self.port = port
+        self.password = password
+        self.protocol: Optional[RconProtocol] = None
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+    async def connect(self, timeout: float):
+        """Открывает сокет и проходит авторизацию, все вместе - не дольше timeout"""
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + timeout
+        addresses = await asyncio.wait_for(dns_cache.resolve_all(self.host), timeout=_remaining(deadline_at))
+
+        _, self.protocol = await connect_any(addresses, lambda address: asyncio.wait_for(
+            loop.create_connection(
+                partial(RconProtocol, max_response_size=settings.RCON_MAX_RESPONSE_BYTES),
+                address,
+                self.port
+            ),
+            timeout=_remaining(deadline_at)
+        ))
+
+        try:
+            await asyncio.wait_for(self.protocol.login(self.password), timeout=_remaining(deadline_at))
+        except BaseException:
+            await self.close()
+            raise
+
+        self.last_used = time.monotonic()
+
+    @property
+    def is_alive(self) -> bool:
+        """Сокет открыт и сервер не закрыл соединение со своей стороны"""
+        return self.protocol is not None and self.protocol.is_alive
+
+    @property
+    def packets_sent(self) -> int:
+        return self.protocol.packets_sent if self.protocol is not None else 0
+
+    @property
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_used
+
+    async def execute_many(self, commands: List[str], timeout: float) -> List[str]:
+        """Выполняет несколько команд подряд на одном сокете"""
+        results = await asyncio.wait_for(self.protocol.execute_many(commands), timeout=timeout)
+        self.last_used = time.monotonic()
+        return results
+
+    async def execute(self, command: str, timeout: float) -> str:
+        """Выполняет одну команду на уже авторизованном соединении"""
+        results = await self.execute_many([command], timeout)
+        return results[0]
+
+    async def close(self):
+        """Закрывает сокет, игнорируя ошибки"""
+        self.close_now()
+
+    def close_now(self):
+        """То же, что close(), для синхронного кода"""
+        if self.protocol is None:
+            return
+
+        protocol, self.protocol = self.protocol, None
+        try:
+            protocol.close()
+        except Exception:
+            pass
+
+
+class RconConnectionPool:
+    """
+    Пул авторизованных RCON соединений по ключу (host, port, password).
+
+    Соединения переиспользуются между командами и пользователями,
+    простаивающие сокеты проверяются перед выдачей, а оборванные
+    (например, после рестарта сервера) прозрачно пересоздаются.
+    """
+
+    # Ошибки, означающие, что сокет умер, пока лежал в пуле.
+    # Повторяем только если в сокет еще ничего не записано: иначе команда
+    # могла выполниться, и решать о повторе должен вызывающий код
+    STALE_ERRORS = (ConnectionError,)
+
+    def __init__(self, max_size: int = 4, idle_timeout: float = 300):
+        """
+        :param max_size: Максимум одновременных соединений на один сервер
+        :param idle_timeout: Через сколько секунд простоя соединение закрывается
+        """
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._idle: Dict[PoolKey, List[RconConnection]] = {}
+        self._slots: Dict[PoolKey, asyncio.Semaphore] = {}
+
+        self.opened = 0
+        self.reused = 0
+
+    def _get_slots(self, key: PoolKey) -> asyncio.Semaphore:
+        if key not in self._slots:
+            self._slots[key] = asyncio.Semaphore(self.max_size)
+        return self._slots[key]
+
+    async def _checkout(self, key: PoolKey, timeout: float) -> Tuple[RconConnection, bool]:
+        """
+        Берет живое соединение из пула или открывает новое.
+
+        Returns:
+            Tuple[RconConnection, bool]: (соединение, взято ли оно из пула)
+        """
+        idle = self._idle.get(key, [])
+
+        while idle:
+            connection = idle.pop()
+            if connection.is_alive and connection.idle_seconds < self.idle_timeout:
+                self.reused += 1
+                return connection, True
+
+            logger.debug(f"RCON пул: закрываем устаревшее соединение {key[0]}:{key[1]}")
+            await connection.close()
+
+        connection = RconConnection(*key)
+        await connection.connect(timeout)
+        self.opened += 1
+        logger.debug(f"RCON пул: открыто новое соединение {key[0]}:{key[1]}")
+        return connection, False
+
+    def _checkin(self, key: PoolKey, connection: RconConnection):
+        """Возвращает соединение в пул"""
+        if connection.is_alive:
+            self._idle.setdefault(key, []).append(connection)
+
+    @asynccontextmanager
+    async def connection(self, host: str, port: int, password: str,
+                         timeout: float) -> AsyncGenerator[RconConnection, None]:
+        """
+        Выдает соединение в монопольное пользование.
+
+        timeout ограничивает ожидание места в пуле и подключение вместе.
+        При любой ошибке внутри блока соединение закрывается,
+        т.к. его состояние (непрочитанные пакеты) неизвестно.
+        """
+        key = (host, port, password)
+        slots = self._get_slots(key)
+        deadline_at = asyncio.get_running_loop().time() + timeout
+
+        await asyncio.wait_for(slots.acquire(), timeout=timeout)
+        try:
+            connection, _ = await self._checkout(key, _remaining(deadline_at))
+            try:
+                yield connection
+            except BaseException:
+                await connection.close()
+                raise
+            self._checkin(key, connection)
+        finally:
+            slots.release()
+
+    async def execute_many(self, host: str, port: int, password: str,
+                           commands: List[str], timeout: float) -> List[str]:
+        """
+        Выполняет команды через пул (по очереди, на одном соединении).
+
+        Если соединение из пула оказалось оборванным еще до отправки
+        команд, они повторяются на свежем соединении. Обрыв после отправки
+        пробрасывается: команда могла выполниться на сервере.
+
+        timeout - общий лимит на все этапы: ожидание места в пуле,
+        подключение с авторизацией и сами команды.
+        """
+        key = (host, port, password)
+        slots = self._get_slots(key)
+        deadline_at = asyncio.get_running_loop().time() + timeout
+
+        await asyncio.wait_for(slots.acquire(), timeout=timeout)
+        try:
+            while True:
+                connection, reused = await self._checkout(key, _remaining(deadline_at))
+                packets_sent = connection.packets_sent
+                try:
+                    results = await connection.execute_many(commands, _remaining(deadline_at))
+                except self.STALE_ERRORS as e:
+                    delivered = connection.packets_sent != packets_sent
+                    await connection.close()
+                    if not reused or delivered:
+                        raise
+                    logger.debug(f"RCON пул: соединение {host}:{port} оборвано ({e}), переподключаемся")
+                    continue
+                except BaseException:
+                    await connection.close()
+                    raise
+
+                self._checkin(key, connection)
+                return results
+        finally:
+            slots.release()
+
+    async def execute(self, host: str, port: int, password: str,
+                      command: str, timeout: float) -> str:
+        """Выполняет одну команду через пул"""
+        results = await self.execute_many(host, port, password, [command], timeout)
+        return results[0]
+
+    def drop_idle(self, host: str, port: int, password: str) -> int:
+        """
+        Закрывает простаивающие соединения с этими учетными данными
+        (пароль больше не нужен). Занятые сейчас соединения не трогаются:
+        идущие команды доработают.
+        """
+        idle = self._idle.pop((host, port, password), [])
+        for connection in idle:
+            connection.close_now()
+        return len(idle)
+
+    async def close_idle(self) -> int:
+        """Закрывает простаивающие и мертвые соединения. Возвращает их количество"""
+        closed = 0
+
+        for key, idle in list(self._idle.items()):
+            alive = []
+            for connection in idle:
+                if connection.is_alive and connection.idle_seconds < self.idle_timeout:
+                    alive.append(connection)
+                else:
+                    await connection.close()
+                    closed += 1
+            self._idle[key] = alive
+
+        return closed
+
+    async def close_all(self):
+        """Закрывает все соединения пула"""
+        for idle in self._idle.values():
+            for connection in idle:
+                await connection.close()
+        self._idle.clear()
+
+    def get_stats(self) -> dict:
+        """Статистика пула"""
+        return {
+            "servers": len(self._slots),
+            "idle_connections": sum(len(idle) for idle in self._idle.values()),
+            "opened": self.opened,
+            "reused": self.reused,
+        }
+
+
+# Глобальный пул соединений
+rcon_pool = RconConnectionPool(
+    max_size=settings.RCON_POOL_MAX_SIZE,
+    idle_timeout=settings.RCON_POOL_IDLE_TIMEOUT
+)
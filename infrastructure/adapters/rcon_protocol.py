@@ -0,0 +1,280 @@
+# infrastructure/adapters/rcon_protocol.py
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from rcon.exceptions import WrongPassword
+
+from loggers.app_logger import logger
+from infrastructure.adapters.rcon_codec import (
+    INT32_MAX,
+    SERVERDATA_AUTH,
+    SERVERDATA_AUTH_RESPONSE,
+    SERVERDATA_EXECCOMMAND,
+    SERVERDATA_RESPONSE_VALUE,
+    PacketFormatError,
+    PacketReader,
+    encode_packet,
+)
+
+# Начальный размер буфера ответа - один максимальный пакет Minecraft
+RESPONSE_CHUNK_SIZE = 4096
+
+
+class ResponseBuffer:
+    """
+    Буфер для сборки ответа, пришедшего несколькими пакетами.
+
+    Память выделяется заранее и растет удвоением (не больше limit),
+    фрагменты копируются в нее через memoryview - без склейки строк.
+    """
+
+    __slots__ = ("_data", "length", "limit", "truncated")
+
+    def __init__(self, limit: int, initial_size: int = RESPONSE_CHUNK_SIZE):
+        self._data = bytearray(min(initial_size, limit))
+        self.length = 0
+        self.limit = limit
+        self.truncated = False
+
+    def append(self, payload: bytes):
+        """Дописывает фрагмент; все, что не влезает в limit, отбрасывается"""
+        end = self.length + len(payload)
+        if end > self.limit:
+            payload = payload[:self.limit - self.length]
+            end = self.limit
+            self.truncated = True
+
+        if end > len(self._data):
+            grown = bytearray(min(max(end, len(self._data) * 2), self.limit))
+            grown[:self.length] = memoryview(self._data)[:self.length]
+            self._data = grown
+
+        memoryview(self._data)[self.length:end] = payload
+        self.length = end
+
+    def decode(self, encoding: str = "utf-8") -> str:
+        """
+        Декодирует собранный ответ.
+        Minecraft режет ответ по байтам, поэтому декодируем только целиком.
+        """
+        with memoryview(self._data) as view:
+            return str(view[:self.length], encoding, errors="replace")
+
+
+class _PendingRequest:
+    """Ожидающий ответа запрос"""
+
+    __slots__ = ("future", "buffer", "answered")
+
+    def __init__(self, future: asyncio.Future, buffer: Optional[ResponseBuffer]):
+        self.future = future
+        self.buffer = buffer
+        # Пришел первый фрагмент ответа: сервер прочитал пакет и снова ждет запроса
+        self.answered = asyncio.get_running_loop().create_future()
+
+
+class RconProtocol(asyncio.Protocol):
+    """
+    Асинхронная реализация Source RCON протокола.
+
+    RCON поток Vanilla/Paper читает сокет кусками до 1460 байт и рвет
+    соединение, если в прочитанном не ровно один пакет. Поэтому в сокете
+    никогда не бывает больше одного неотвеченного пакета: команды одного
+    соединения выполняются по очереди, каждый пакет - отдельной записью,
+    а следующий отправляется только после ответа на предыдущий.
+
+    Длинные ответы сервер присылает несколькими пакетами с одним ID.
+    После первого фрагмента ответа отправляется пустой пакет-маркер:
+    сервер обрабатывает пакеты строго по очереди, поэтому как только
+    пришел ответ на маркер, ответ на команду собран полностью.
+    """
+
+    def __init__(self, max_response_size: int = 1024 * 1024):
+        """
+        :param max_response_size: Максимальный размер одного собранного ответа в байтах
+        """
+        self.transport: Optional[asyncio.Transport] = None
+        self.max_response_size = max_response_size
+        self._reader = PacketReader()
+        self._pending: Dict[int, _PendingRequest] = {}
+        self._auth_id: Optional[int] = None
+        self._next_id = 0
+        self._lost = False
+        # Сколько пакетов записано в сокет (по нему видно, дошло ли что-то до сервера)
+        self.packets_sent = 0
+        # Один обмен пакетами за раз (см. описание класса)
+        self._lock = asyncio.Lock()
+
+    # ---------- asyncio.Protocol ----------
+
+    def connection_made(self, transport: asyncio.Transport):
+        self.transport = transport
+
+    def data_received(self, data: bytes):
+        self._reader.feed(data)
+
+        try:
+            for request_id, packet_type, payload in self._reader.read_packets():
+                self._dispatch(request_id, packet_type, payload)
+        except PacketFormatError as e:
+            # Границы пакетов потеряны - соединение дальше использовать нельзя
+            logger.warning(f"RCON: {e}, соединение закрывается")
+            self.transport.close()
+
+    def connection_lost(self, exc: Optional[Exception]):
+        self._lost = True
+        error = exc or ConnectionResetError("RCON соединение закрыто сервером")
+
+        for pending in self._pending.values():
+            if not pending.future.done():
+                pending.future.set_exception(error)
+        self._pending.clear()
+
+    # ---------- Маршрутизация ответов ----------
+
+    def _dispatch(self, request_id: int, packet_type: int, payload: memoryview):
+        """Передает пакет ожидающему запросу с тем же ID"""
+        if self._auth_id is not None:
+            # Source-серверы шлют пустой RESPONSE_VALUE перед AUTH_RESPONSE
+            if packet_type != SERVERDATA_AUTH_RESPONSE:
+                return
+
+            pending = self._pending.pop(self._auth_id, None)
+            self._auth_id = None
+            if pending and not pending.future.done():
+                if request_id == -1:
+                    pending.future.set_exception(WrongPassword())
+                else:
+                    pending.future.set_result(None)
+            return
+
+        target = self._pending.get(request_id)
+        if target is None:
+            # Поздний ответ на отмененный запрос или повторный ответ на маркер
+            return
+
+        # Все запросы, отправленные раньше этого, уже получили ответ целиком
+        for earlier_id in list(self._pending):
+            if earlier_id == request_id:
+                break
+            self._complete(earlier_id)
+
+        if target.buffer is None:
+            # Маркер: сам по себе результата не несет
+            self._complete(request_id)
+        else:
+            target.buffer.append(payload)
+            if not target.answered.done():
+                target.answered.set_result(None)
+
+    def _complete(self, request_id: int):
+        """Завершает запрос собранным ответом"""
+        pending = self._pending.pop(request_id)
+        if pending.future.done():
+            return
+
+        if pending.buffer is None:
+            pending.future.set_result(None)
+            return
+
+        if pending.buffer.truncated:
+            logger.warning(
+                f"RCON ответ больше {self.max_response_size} байт и был обрезан"
+            )
+        pending.future.set_result(pending.buffer)
+
+    def _allocate_id(self) -> int:
+        """Следующий request ID (положительный int32, -1 зарезервирован сервером)"""
+        self._next_id = self._next_id % INT32_MAX + 1
+        return self._next_id
+
+    def _send(self, packet: bytes):
+        self.transport.write(packet)
+        self.packets_sent += 1
+
+    def _register(self, collect: bool = True) -> Tuple[int, asyncio.Future]:
+        request_id = self._allocate_id()
+        future = asyncio.get_running_loop().create_future()
+        buffer = ResponseBuffer(self.max_response_size) if collect else None
+        self._pending[request_id] = _PendingRequest(future, buffer)
+        return request_id, future
+
+    # ---------- Публичный API ----------
+
+    @property
+    def is_alive(self) -> bool:
+        return (
+            self.transport is not None
+            and not self._lost
+            and not self.transport.is_closing()
+        )
+
+    async def login(self, password: str, encoding: str = "utf-8"):
+        """Авторизация на сокете. Бросает WrongPassword при неверном пароле"""
+        if not self.is_alive:
+            raise ConnectionResetError("RCON соединение закрыто")
+
+        async with self._lock:
+            request_id, future = self._register(collect=False)
+            self._auth_id = request_id
+            self._send(encode_packet(request_id, SERVERDATA_AUTH, password.encode(encoding)))
+
+            try:
+                await future
+            finally:
+                self._pending.pop(request_id, None)
+
+    async def execute_many(self, commands: List[str], encoding: str = "utf-8") -> List[str]:
+        """
+        Выполняет команды по очереди на этом соединении.
+
+        Ответы возвращаются в порядке команд и собираются из всех фрагментов.
+        Если ожидание прервано (таймаут, отмена), соединение закрывается:
+        в сокете мог остаться неотвеченный пакет.
+        """
+        async with self._lock:
+            if not self.is_alive:
+                raise ConnectionResetError("RCON соединение закрыто")
+
+            try:
+                return [await self._exchange(command, encoding) for command in commands]
+            except BaseException:
+                self.close()
+                raise
+
+    async def _exchange(self, command: str, encoding: str) -> str:
+        """Команда и маркер ее конца, каждый пакет - после ответа на предыдущий"""
+        request_id, future = self._register()
+        pending = self._pending[request_id]
+        sentinel_id = None
+
+        try:
+            self._send(encode_packet(request_id, SERVERDATA_EXECCOMMAND, command.encode(encoding)))
+            await asyncio.wait((pending.answered, future), return_when=asyncio.FIRST_COMPLETED)
+
+            if not future.done():
+                sentinel_id, sentinel = self._register(collect=False)
+                self._send(encode_packet(sentinel_id, SERVERDATA_RESPONSE_VALUE, b""))
+                await sentinel
+
+            buffer = await future
+        finally:
+            # При таймауте/отмене поздние ответы просто отбрасываются
+            self._pending.pop(request_id, None)
+            if sentinel_id is not None:
+                self._pending.pop(sentinel_id, None)
+            pending.answered.cancel()
+            if future.done() and not future.cancelled():
+                # Ошибка обрыва уже получена через маркер - не логируем ее повторно
+                future.exception()
+
+        return buffer.decode(encoding)
+
+    async def execute(self, command: str, encoding: str = "utf-8") -> str:
+        """Выполняет одну команду"""
+        results = await self.execute_many([command], encoding)
+        return results[0]
+
+    def close(self):
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.close()
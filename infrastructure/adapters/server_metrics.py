@@ -0,0 +1,239 @@
+# infrastructure/adapters/server_metrics.py
+import re
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from loggers.app_logger import logger
+
+# Разновидности серверов: у каждой свои команды для TPS и памяти
+FLAVOR_PAPER = "paper"          # Paper, Purpur, Pufferfish, Folia: tps, mspt
+FLAVOR_SPIGOT = "spigot"        # Spigot, CraftBukkit и гибриды: tps
+FLAVOR_FORGE = "forge"          # Forge / NeoForge: forge tps
+FLAVOR_VANILLA = "vanilla"      # Vanilla / Fabric 1.20.3+: tick query
+FLAVOR_UNKNOWN = "unknown"
+
+PAPER_MARKERS = ("paper", "purpur", "pufferfish", "folia")
+SPIGOT_MARKERS = ("spigot", "craftbukkit", "bukkit", "mohist", "arclight")
+
+# Ответы сервера, означающие что команда не поддерживается
+UNSUPPORTED_MARKERS = ("unknown command", "unknown or incomplete command", "cannot execute")
+
+COLOR_CODE = re.compile(r'§.')
+
+# §6TPS from last 1m, 5m, 15m: §a*20.0, §a20.0, §a20.0
+BUKKIT_TPS = re.compile(r'TPS from last[^:]*:\s*\*?(\d+(?:\.\d+)?)')
+# Server tick times (avg/min/max) from last 5s, 10s, 1m:\n◴ 1.2/0.8/3.4, ...
+PAPER_MSPT = re.compile(r'from last[^:]*:\s*\D*?(\d+(?:\.\d+)?)/(\d+(?:\.\d+)?)/(\d+(?:\.\d+)?)')
+# Forge: "Overall: Mean tick time: 2.345 ms. Mean TPS: 20.000"
+FORGE_OVERALL = re.compile(r'Overall\s*:\s*Mean tick time:\s*(\d+(?:\.\d+)?)\s*ms\.?\s*Mean TPS:\s*(\d+(?:\.\d+)?)')
+# NeoForge: "Overall: 20.000 TPS (2.345 ms/tick)"
+NEOFORGE_OVERALL = re.compile(r'Overall\s*:\s*(\d+(?:\.\d+)?)\s*TPS\s*\((\d+(?:\.\d+)?)\s*ms')
+# Vanilla tick query
+VANILLA_TARGET = re.compile(r'Target tick rate:\s*(\d+(?:\.\d+)?)')
+VANILLA_MSPT = re.compile(r'Average time per tick:\s*(\d+(?:\.\d+)?)\s*ms')
+# Essentials gc / memory
+MEMORY_MAXIMUM = re.compile(r'Maximum memory:\s*([\d,]+)')
+MEMORY_ALLOCATED = re.compile(r'Allocated memory:\s*([\d,]+)')
+MEMORY_FREE = re.compile(r'Free memory:\s*([\d,]+)')
+UPTIME = re.compile(r'Uptime:\s*([^\n]+)')
+UPTIME_PART = re.compile(r'(\d+)\s*(day|hour|minute|second)')
+
+UPTIME_UNITS = {"day": 86400, "hour": 3600, "minute": 60, "second": 1}
+MAX_TPS = 20.0
+
+
+def clean_response(response: str) -> str:
+    """Убирает цветовые коды Minecraft (§a, §6 ...)"""
+    return COLOR_CODE.sub('', response)
+
+
+def is_unsupported(response: str) -> bool:
+    """Ответ означает, что команды на сервере нет"""
+    response = response.strip().lower()
+    return not response or any(marker in response for marker in UNSUPPORTED_MARKERS)
+
+
+def parse_bukkit_tps(response: str) -> Optional[dict]:
+    match = BUKKIT_TPS.search(response)
+    if not match:
+        return None
+    return {"tps": min(float(match.group(1)), MAX_TPS)}
+
+
+def parse_paper_mspt(response: str) -> Optional[dict]:
+    match = PAPER_MSPT.search(response)
+    if not match:
+        return None
+    return {"mspt": float(match.group(1))}
+
+
+def parse_forge_tps(response: str) -> Optional[dict]:
+    match = FORGE_OVERALL.search(response)
+    if match:
+        mspt, tps = float(match.group(1)), float(match.group(2))
+    else:
+        match = NEOFORGE_OVERALL.search(response)
+        if not match:
+            return None
+        tps, mspt = float(match.group(1)), float(match.group(2))
+    return {"tps": min(tps, MAX_TPS), "mspt": mspt}
+
+
+def parse_tick_query(response: str) -> Optional[dict]:
+    mspt = VANILLA_MSPT.search(response)
+    if not mspt:
+        return None
+    target = VANILLA_TARGET.search(response)
+    target_tps = float(target.group(1)) if target else MAX_TPS
+    mspt_value = float(mspt.group(1))
+
+    # Тик короче целевого - сервер успевает, TPS равен целевому
+    tps = min(target_tps, 1000 / mspt_value) if mspt_value > 0 else target_tps
+    return {"tps": round(tps, 2), "mspt": mspt_value}
+
+
+def parse_memory(response: str) -> Optional[dict]:
+    allocated = MEMORY_ALLOCATED.search(response)
+    free = MEMORY_FREE.search(response)
+    if not (allocated and free):
+        return None
+
+    maximum = MEMORY_MAXIMUM.search(response)
+    used = int(allocated.group(1).replace(',', '')) - int(free.group(1).replace(',', ''))
+    values = {
+        "memory": {
+            "used_mb": used,
+            "total_mb": int(maximum.group(1).replace(',', '')) if maximum else None
+        }
+    }
+
+    uptime = UPTIME.search(response)
+    if uptime:
+        parts = UPTIME_PART.findall(uptime.group(1))
+        if parts:
+            values["uptime_seconds"] = sum(int(count) * UPTIME_UNITS[unit] for count, unit in parts)
+    return values
+
+
+@dataclass(frozen=True)
+class MetricCollector:
+    """
+    RCON команда и разбор ее ответа в поля статуса.
+
+    optional - команда от плагина (Essentials gc): если ее нет, это ничего
+    не говорит о ядре сервера и не повод определять разновидность заново.
+    """
+    command: str
+    parse: Callable[[str], Optional[dict]]
+    optional: bool = False
+
+
+BUKKIT_TPS_COLLECTOR = MetricCollector("tps", parse_bukkit_tps)
+MEMORY_COLLECTOR = MetricCollector("gc", parse_memory, optional=True)
+
+# Сборщики по разновидностям: имя пробы -> сборщик
+COLLECTORS: Dict[str, Dict[str, MetricCollector]] = {
+    FLAVOR_PAPER: {
+        "tps": BUKKIT_TPS_COLLECTOR,
+        "mspt": MetricCollector("mspt", parse_paper_mspt),
+        "memory": MEMORY_COLLECTOR,
+    },
+    FLAVOR_SPIGOT: {
+        "tps": BUKKIT_TPS_COLLECTOR,
+        "memory": MEMORY_COLLECTOR,
+    },
+    FLAVOR_FORGE: {
+        "tps": MetricCollector("forge tps", parse_forge_tps),
+    },
+    FLAVOR_VANILLA: {
+        "tps": MetricCollector("tick query", parse_tick_query),
+    },
+    # Не определили - пробуем самые распространенные команды (плагины вроде Essentials)
+    FLAVOR_UNKNOWN: {
+        "tps": BUKKIT_TPS_COLLECTOR,
+        "memory": MEMORY_COLLECTOR,
+    },
+}
+
+# Команды, по ответу на которые определяется разновидность (после version)
+DETECTION_PROBES: Tuple[Tuple[str, str, Callable[[str], Optional[dict]]], ...] = (
+    (FLAVOR_FORGE, "forge tps", parse_forge_tps),
+    (FLAVOR_FORGE, "neoforge tps", parse_forge_tps),
+    (FLAVOR_VANILLA, "tick query", parse_tick_query),
+)
+
+
+def flavor_from_version(response: str) -> Optional[str]:
+    """Разновидность по ответу на команду version"""
+    response = response.lower()
+    if any(marker in response for marker in PAPER_MARKERS):
+        return FLAVOR_PAPER
+    if any(marker in response for marker in SPIGOT_MARKERS):
+        return FLAVOR_SPIGOT
+    return None
+
+
+class ServerFlavorCache:
+    """
+    Разновидность сервера по (host, port).
+
+    Определяется один раз; сбрасывается, если команда сборщика перестала
+    поддерживаться (сервер переустановили на другое ядро).
+    """
+
+    def __init__(self):
+        self._flavors: Dict[Tuple[str, int], str] = {}
+        self._forge_commands: Dict[Tuple[str, int], str] = {}
+
+    def get(self, host: str, port: int) -> Optional[str]:
+        return self._flavors.get((host, port))
+
+    def put(self, host: str, port: int, flavor: str):
+        self._flavors[(host, port)] = flavor
+
+    def invalidate(self, host: str, port: int):
+        self._flavors.pop((host, port), None)
+        self._forge_commands.pop((host, port), None)
+
+    def get_collectors(self, host: str, port: int) -> Dict[str, MetricCollector]:
+        """Сборщики метрик для сервера (по умолчанию - как для неизвестного)"""
+        flavor = self._flavors.get((host, port), FLAVOR_UNKNOWN)
+        collectors = COLLECTORS[flavor]
+
+        # NeoForge отвечает на "neoforge tps", а не на "forge tps"
+        command = self._forge_commands.get((host, port))
+        if command:
+            collectors = {**collectors, "tps": MetricCollector(command, parse_forge_tps)}
+        return collectors
+
+    async def detect(self, host: str, port: int,
+                     execute: Callable[[str], Awaitable[str]]) -> str:
+        """
+        Определяет разновидность сервера и запоминает ее.
+
+        Args:
+            execute: выполнение команды на сервере, возвращает ответ
+        """
+        cached = self.get(host, port)
+        if cached:
+            return cached
+
+        flavor = flavor_from_version(clean_response(await execute("version")))
+
+        if flavor is None:
+            for candidate, command, parse in DETECTION_PROBES:
+                response = clean_response(await execute(command))
+                if not is_unsupported(response) and parse(response) is not None:
+                    flavor = candidate
+                    if command != COLLECTORS[candidate]["tps"].command:
+                        self._forge_commands[(host, port)] = command
+                    break
+
+        flavor = flavor or FLAVOR_UNKNOWN
+        self.put(host, port, flavor)
+        logger.debug(f"Сервер {host}:{port}: разновидность {flavor}")
+        return flavor
+
+
+# Глобальный кэш разновидностей серверов
+server_flavors = ServerFlavorCache()
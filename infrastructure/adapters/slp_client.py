@@ -0,0 +1,29 @@
+# infrastructure/adapters/slp_client.py
+from mcstatus import JavaServer
+
+from infrastructure.adapters.dns_resolver import dns_cache
+
+
+async def server_list_ping(host: str, port: int, timeout: float) -> dict:
+    """
+    Статус сервера через Server List Ping на игровом порту.
+
+    Не требует RCON пароля: один обмен пакетами (как список серверов
+    в клиенте игры) дает онлайн, игроков, MOTD, версию и задержку.
+
+    В handshake уходит исходное имя хоста, а не IP: прокси (Velocity,
+    BungeeCord) и виртуальные хосты выбирают сервер по нему. DNS кэш здесь
+    только отсекает заведомо неразрешимые хосты без сетевого ожидания.
+
+    Raises:
+        OSError, asyncio.TimeoutError: сервер не ответил
+    """
+    await dns_cache.resolve(host)
+    response = await JavaServer(host, port, timeout=timeout).async_status(tries=1)
+
+    return {
+        "players": f"{response.players.online}/{response.players.max}",
+        "version": response.version.name,
+        "motd": response.motd.to_plain().strip(),
+        "latency_ms": round(response.latency, 1),
+    }
@@ -28,6 +28,12 @@ from loggers.app_logger import logger
 
 # Импорт менеджера сессий
 from domain.services.session_manager import SessionManager
+from domain.services.status_monitor import StatusMonitor
+
+# Импорт пула RCON соединений и предохранителей
+from infrastructure.adapters.rcon_pool import rcon_pool
+from infrastructure.adapters.rcon_circuit_breaker import rcon_breakers
+from infrastructure.adapters.rcon_limiter import rcon_limiters
 
 # ============= ИМПОРТ КОНТРОЛЛЕРОВ =============
 from bot.controllers.start_controller import router as start_router
@@ -37,6 +43,7 @@ from bot.controllers.help_controller import router as help_router
 from bot.controllers.commands_controller import router as commands_router
 from bot.controllers.sessions_controller import router as sessions_router
 from bot.controllers.monitoring_controller import router as monitoring_router
+from bot.controllers.fleet_controller import router as fleet_router
 
 # ============= ИМПОРТ MIDDLEWARE =============
 from bot.middlewares.auth_middleware import AuthMiddleware
@@ -73,7 +80,12 @@ async def setup_session_manager(database: Database) -> SessionManager:
     try:
         session_manager = SessionManager(
             database=database,
-            session_duration_hours=settings.SESSION_DURATION_HOURS
+            session_duration_hours=settings.SESSION_DURATION_HOURS,
+            cache_size=settings.SESSION_CACHE_MAX_SIZE,
+            cache_purge_interval=settings.SESSION_CACHE_PURGE_INTERVAL,
+            negative_cache_ttl=settings.SESSION_NEGATIVE_CACHE_TTL,
+            negative_cache_size=settings.SESSION_NEGATIVE_CACHE_MAX_SIZE,
+            activity_flush_interval=settings.SESSION_ACTIVITY_FLUSH_INTERVAL
         )
 
         logger.info("✅ Менеджер сессий создан")
@@ -116,7 +128,8 @@ async def setup_routers(dp: Dispatcher):
         help_router,
         commands_router,
         sessions_router,
-        monitoring_router
+        monitoring_router,
+        fleet_router
     ]
 
     for router in routers:
@@ -155,6 +168,16 @@ async def periodic_tasks(database: Database):
             except Exception as e:
                 logger.warning(f"⚠️  Ошибка при периодической очистке: {e}")
 
+            # Закрытие простаивающих RCON соединений
+            closed = await rcon_pool.close_idle()
+            if closed:
+                logger.debug(f"🔌 Закрыто {closed} простаивающих RCON соединений")
+
+            # Состояние пула и очередей команд по серверам
+            logger.debug(f"🔌 RCON пул: {rcon_pool.get_stats()}")
+            for server, queue in rcon_limiters.get_stats().items():
+                logger.debug(f"📥 RCON очередь {server}: {queue}")
+
     except asyncio.CancelledError:
         logger.info("⏹ Фоновые задачи остановлены")
     except Exception as e:
@@ -205,6 +228,19 @@ async def main():
         setattr(bot, 'database', database)
         setattr(bot, 'session_manager', session_manager)
 
+        # Фоновый мониторинг серверов: контроллеры отвечают из его кэша
+        status_monitor = StatusMonitor(
+            database=database,
+            interval=settings.MONITORING_INTERVAL_MINUTES * 60,
+            concurrency=settings.MONITORING_MAX_CONCURRENCY,
+            min_interval=settings.MONITORING_MIN_INTERVAL_SECONDS,
+            idle_factor=settings.MONITORING_IDLE_FACTOR,
+            tps_warning=settings.TPS_WARNING_THRESHOLD,
+            tps_critical=settings.TPS_CRITICAL_THRESHOLD,
+            crypto=session_manager.crypto
+        )
+        setattr(bot, 'status_monitor', status_monitor)
+
         # Инициализируем команды бота
         from aiogram.types import BotCommand
         await bot.set_my_commands([
@@ -214,6 +250,7 @@ async def main():
             BotCommand(command="status", description="Статус сервера"),
             BotCommand(command="monitor", description="Мониторинг"),
             BotCommand(command="sessions", description="Управление сессиями"),
+            BotCommand(command="fleet", description="Команда на всех серверах"),
         ])
 
         # Получаем информацию о боте
@@ -240,6 +277,7 @@ async def main():
 
     # Запуск фоновых задач
     background_task = asyncio.create_task(periodic_tasks(database))
+    status_monitor.start()
 
     # Запуск бота
     try:
@@ -263,6 +301,10 @@ async def main():
             await background_task
         except asyncio.CancelledError:
             pass
+        await status_monitor.stop()
+        session_manager.sessions.stop()
+        # Дописываем накопленное время активности сессий до закрытия БД
+        await session_manager.activity.stop()
 
         # Закрытие соединений
         logger.info("🔌 Закрытие соединений...")
@@ -272,6 +314,12 @@ async def main():
         except Exception as e:
             logger.warning(f"⚠️  Ошибка при закрытии сессии бота: {e}")
 
+        try:
+            rcon_breakers.stop()
+            await rcon_pool.close_all()
+        except Exception as e:
+            logger.warning(f"⚠️  Ошибка при закрытии RCON соединений: {e}")
+
         try:
             await database.close() if database else None
         except Exception as e:
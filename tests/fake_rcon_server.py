@@ -0,0 +1,259 @@
+# fake_rcon_server.py
+"""
+Локальный RCON сервер для тестов и бенчмарков без настоящего Minecraft.
+
+Ведет себя как RCON слушатель Minecraft: авторизация, строго
+последовательная обработка пакетов одного соединения, длинные ответы
+фрагментами по 4096 байт, эхо "Unknown request" на пакеты неизвестного
+типа (так клиент узнает конец многопакетного ответа).
+
+Как и Minecraft, сокет читается кусками до 1460 байт, и если в
+прочитанном не ровно один пакет, соединение обрывается (strict_reads).
+
+Дополнительно умеет задержку с разбросом, обрывы соединений и
+заранее заданные ответы на команды.
+
+Запуск вручную (для скриптов из tests/, которым нужен живой сервер):
+    python tests/fake_rcon_server.py --port 25575 --password secret
+"""
+import argparse
+import asyncio
+import random
+import struct
+from typing import Callable, Dict, List, Optional, Union
+
+SERVERDATA_AUTH = 3
+SERVERDATA_AUTH_RESPONSE = 2
+SERVERDATA_EXECCOMMAND = 2
+SERVERDATA_RESPONSE_VALUE = 0
+
+HEADER = struct.Struct("<iii")
+
+# Максимальный размер фрагмента ответа у Minecraft
+FRAGMENT_SIZE = 4096
+# Размер буфера чтения RCON потока Minecraft
+READ_SIZE = 1460
+
+# Ответ: строка, последовательность строк (по одной на вызов) или функция от команды
+Response = Union[str, List[str], Callable[[str], str]]
+
+DEFAULT_RESPONSES: Dict[str, Response] = {
+    "list": "There are 0 of a max of 20 players online: ",
+    "version": "This server is running Paper version 1.20.4-496 (MC: 1.20.4)",
+    "tps": "§6TPS from last 1m, 5m, 15m: §a20.0, §a20.0, §a20.0",
+    "mspt": "§6Server tick times §e(§7avg§e/§7min§e/§7max§e)§6 from last 5s§7,§6 10s§7,§6 1m§e:\n"
+            "§6◴ §a1.2§7/§a0.8§7/§a3.4§7, §a1.1§7/§a0.7§7/§a3.9§7, §a1.3§7/§a0.6§7/§a10.2",
+    "gc": "Uptime: 1 hour\nMaximum memory: 4,096 MB.\nAllocated memory: 2,048 MB.\nFree memory: 1,024 MB.",
+    "seed": "Seed: [-4172144997902289642]",
+}
+
+
+def encode(request_id: int, packet_type: int, payload: bytes) -> bytes:
+    return HEADER.pack(10 + len(payload), request_id, packet_type) + payload + b"\x00\x00"
+
+
+class FakeRconServer:
+    """
+    Asyncio RCON сервер для тестов.
+
+    Пример:
+        async with FakeRconServer(password="secret", latency=0.01) as server:
+            client = RconClientAdapter(server.host, server.port, "secret")
+    """
+
+    def __init__(self, password: str = "secret", responses: Optional[Dict[str, Response]] = None,
+                 latency: float = 0.0, jitter: float = 0.0, fragment_size: int = FRAGMENT_SIZE,
+                 host: str = "127.0.0.1", port: int = 0, strict_reads: bool = True):
+        """
+        :param responses: ответы по команде целиком или по первому слову команды
+        :param latency: задержка перед ответом на каждую команду, секунд
+        :param jitter: случайная добавка к задержке, от 0 до jitter секунд
+        :param strict_reads: как Minecraft, рвать соединение, если за одно
+            чтение пришло не ровно один пакет
+        """
+        self.password = password
+        self.responses = dict(DEFAULT_RESPONSES if responses is None else responses)
+        self.latency = latency
+        self.jitter = jitter
+        self.fragment_size = fragment_size
+        self.host = host
+        self.port = port
+        self.strict_reads = strict_reads
+
+        # Задержка ответа на отдельные команды (по первому слову), вместо latency
+        self.command_latency: Dict[str, float] = {}
+        # Задержка ответа на авторизацию
+        self.auth_latency = 0.0
+
+        # Оборвать соединение вместо ответа на ближайшие N команд
+        self.drop_next = 0
+        # Вероятность оборвать соединение вместо ответа на команду
+        self.drop_probability = 0.0
+
+        self.connections = 0
+        self.active_connections = 0
+        self.auth_attempts = 0
+        self.commands: List[str] = []
+        self.dropped = 0
+        # Соединения, оборванные из-за нескольких (или неполного) пакетов за одно чтение
+        self.framing_errors = 0
+
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers = set()
+
+    # ---------- Управление ----------
+
+    async def start(self) -> "FakeRconServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is None:
+            return
+        self._server.close()
+        for writer in list(self._writers):
+            writer.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def __aenter__(self) -> "FakeRconServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def drop_connections(self):
+        """Обрывает все открытые соединения (как при рестарте сервера)"""
+        for writer in list(self._writers):
+            writer.transport.abort()
+
+    # ---------- Обработка соединения ----------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self.active_connections += 1
+        self._writers.add(writer)
+        authorized = False
+
+        try:
+            while True:
+                body = await self._read_packet(reader)
+                if body is None:
+                    self.framing_errors += 1
+                    return
+                request_id, packet_type = struct.unpack_from("<ii", body)
+                payload = body[8:-2]
+
+                if packet_type == SERVERDATA_AUTH:
+                    self.auth_attempts += 1
+                    authorized = payload.decode("utf-8", errors="replace") == self.password
+                    if self.auth_latency > 0:
+                        await asyncio.sleep(self.auth_latency)
+                    writer.write(encode(request_id, SERVERDATA_RESPONSE_VALUE, b""))
+                    writer.write(encode(request_id if authorized else -1, SERVERDATA_AUTH_RESPONSE, b""))
+                elif not authorized:
+                    writer.write(encode(-1, SERVERDATA_AUTH_RESPONSE, b""))
+                elif packet_type == SERVERDATA_EXECCOMMAND:
+                    command = payload.decode("utf-8", errors="replace")
+                    self.commands.append(command)
+
+                    if self._should_drop():
+                        self.dropped += 1
+                        writer.transport.abort()
+                        return
+
+                    await self._delay(command)
+                    self._write_response(writer, request_id, self._respond(command).encode("utf-8"))
+                else:
+                    # Как Minecraft: на неизвестный тип отвечает тем же ID
+                    message = f"Unknown request {packet_type:x}".encode("utf-8")
+                    writer.write(encode(request_id, SERVERDATA_RESPONSE_VALUE, message))
+
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.active_connections -= 1
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _read_packet(self, reader: asyncio.StreamReader) -> Optional[bytes]:
+        """Тело следующего пакета; None - нарушен формат чтения Minecraft"""
+        if not self.strict_reads:
+            header = await reader.readexactly(4)
+            size = struct.unpack("<i", header)[0]
+            return await reader.readexactly(size)
+
+        data = await reader.read(READ_SIZE)
+        if not data:
+            raise asyncio.IncompleteReadError(data, 4)
+        if len(data) < 14 or struct.unpack_from("<i", data)[0] != len(data) - 4:
+            return None
+        return data[4:]
+
+    def _should_drop(self) -> bool:
+        if self.drop_next > 0:
+            self.drop_next -= 1
+            return True
+        return self.drop_probability > 0 and random.random() < self.drop_probability
+
+    async def _delay(self, command: str):
+        latency = self.command_latency.get(command.split(" ", 1)[0], self.latency)
+        delay = latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _respond(self, command: str) -> str:
+        response = self.responses.get(command)
+        if response is None:
+            name = command.split(" ", 1)[0] if command else command
+            response = self.responses.get(name)
+        if response is None:
+            return f"Unknown or incomplete command, see below for error{command}<--[HERE]"
+
+        if callable(response):
+            return response(command)
+        if isinstance(response, list):
+            # Последовательность ответов: последний повторяется
+            return response.pop(0) if len(response) > 1 else response[0]
+        return response
+
+    def _write_response(self, writer: asyncio.StreamWriter, request_id: int, payload: bytes):
+        """Ответ фрагментами не больше fragment_size, все с одним ID"""
+        if not payload:
+            writer.write(encode(request_id, SERVERDATA_RESPONSE_VALUE, b""))
+            return
+
+        for offset in range(0, len(payload), self.fragment_size):
+            chunk = payload[offset:offset + self.fragment_size]
+            writer.write(encode(request_id, SERVERDATA_RESPONSE_VALUE, chunk))
+
+
+async def _serve(args):
+    server = FakeRconServer(
+        password=args.password,
+        latency=args.latency,
+        jitter=args.jitter,
+        host=args.host,
+        port=args.port
+    )
+    await server.start()
+    print(f"Fake RCON сервер слушает {server.host}:{server.port} (пароль: {server.password})")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Локальный RCON сервер для тестов")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=25575)
+    parser.add_argument("--password", default="secret")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
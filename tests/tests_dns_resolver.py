@@ -0,0 +1,110 @@
+import asyncio
+import socket
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from infrastructure.adapters.dns_resolver import DnsCache
+
+
+def addrinfo(*addresses: str) -> list:
+    return [
+        (socket.AF_INET6, socket.SOCK_STREAM, 6, "", (address, 0, 0, 0)) if ":" in address
+        else (socket.AF_INET, socket.SOCK_STREAM, 6, "", (address, 0))
+        for address in addresses
+    ]
+
+
+class TestDnsCache(unittest.IsolatedAsyncioTestCase):
+    """DNS кэш с подмененным резолвером и часами"""
+
+    async def asyncSetUp(self):
+        self.now = 1000.0
+        clock = MagicMock()
+        clock.monotonic.side_effect = lambda: self.now
+        time_patch = patch("infrastructure.adapters.dns_resolver.time", clock)
+        time_patch.start()
+        self.addCleanup(time_patch.stop)
+
+        self.getaddrinfo = AsyncMock(return_value=addrinfo("203.0.113.7"))
+        resolver_patch = patch.object(asyncio.get_running_loop(), "getaddrinfo", self.getaddrinfo)
+        resolver_patch.start()
+        self.addCleanup(resolver_patch.stop)
+
+        self.cache = DnsCache(ttl=300, negative_ttl=30)
+
+    async def test_answer_is_cached(self):
+        """Тест что повторное разрешение берется из кэша"""
+        self.assertEqual(await self.cache.resolve("mc.example.org"), "203.0.113.7")
+        self.now += 299
+        self.assertEqual(await self.cache.resolve("mc.example.org"), "203.0.113.7")
+
+        self.assertEqual(self.getaddrinfo.await_count, 1)
+
+    async def test_answer_expires_after_ttl(self):
+        """Тест что по истечении ttl адрес запрашивается заново"""
+        await self.cache.resolve("mc.example.org")
+        self.getaddrinfo.return_value = addrinfo("203.0.113.8")
+        self.now += 300
+
+        self.assertEqual(await self.cache.resolve("mc.example.org"), "203.0.113.8")
+        self.assertEqual(self.getaddrinfo.await_count, 2)
+
+    async def test_failure_is_cached(self):
+        """Тест что ошибка разрешения запоминается на negative_ttl"""
+        self.getaddrinfo.side_effect = socket.gaierror(socket.EAI_NONAME, "not found")
+
+        for _ in range(3):
+            with self.assertRaises(socket.gaierror):
+                await self.cache.resolve("missing.example.org")
+            self.now += 10
+
+        self.assertEqual(self.getaddrinfo.await_count, 1)
+
+    async def test_failure_expires_after_negative_ttl(self):
+        """Тест что после negative_ttl хост разрешается снова"""
+        self.getaddrinfo.side_effect = socket.gaierror(socket.EAI_NONAME, "not found")
+        with self.assertRaises(socket.gaierror):
+            await self.cache.resolve("mc.example.org")
+
+        self.getaddrinfo.side_effect = None
+        self.now += 30
+
+        self.assertEqual(await self.cache.resolve("mc.example.org"), "203.0.113.7")
+        self.assertEqual(self.getaddrinfo.await_count, 2)
+
+    async def test_empty_answer_is_negative(self):
+        """Тест что пустой ответ резолвера считается ошибкой и кэшируется"""
+        self.getaddrinfo.return_value = []
+
+        for _ in range(2):
+            with self.assertRaises(socket.gaierror):
+                await self.cache.resolve("mc.example.org")
+
+        self.assertEqual(self.getaddrinfo.await_count, 1)
+
+    async def test_all_addresses_are_cached(self):
+        """Тест что запоминаются все адреса в порядке getaddrinfo"""
+        self.getaddrinfo.return_value = addrinfo("2001:db8::7", "203.0.113.7", "2001:db8::7")
+
+        self.assertEqual(await self.cache.resolve_all("mc.example.org"), ["2001:db8::7", "203.0.113.7"])
+        self.assertEqual(await self.cache.resolve("mc.example.org"), "2001:db8::7")
+        self.assertEqual(self.getaddrinfo.await_count, 1)
+
+    async def test_ip_address_is_not_resolved(self):
+        """Тест что IP адрес возвращается без обращения к резолверу"""
+        self.assertEqual(await self.cache.resolve("192.0.2.1"), "192.0.2.1")
+        self.assertEqual(await self.cache.resolve("::1"), "::1")
+
+        self.getaddrinfo.assert_not_awaited()
+
+    async def test_invalidate(self):
+        """Тест что после invalidate адрес запрашивается заново"""
+        await self.cache.resolve("mc.example.org")
+        self.cache.invalidate("mc.example.org")
+        await self.cache.resolve("mc.example.org")
+
+        self.assertEqual(self.getaddrinfo.await_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
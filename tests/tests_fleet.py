@@ -0,0 +1,73 @@
+import asyncio
+import unittest
+
+from bot.controllers.fleet_controller import FleetServer, execute_on_servers, format_fleet_report
+from domain.services.session_manager import SessionManager
+from infrastructure.adapters.rcon_pool import rcon_pool
+from infrastructure.adapters.rcon_circuit_breaker import rcon_breakers
+from tests.fake_rcon_server import FakeRconServer
+
+
+class TestFleetCommand(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        # Пароли шифрует SessionManager - тем же ключом их должен расшифровать /fleet
+        self.manager = SessionManager(None)
+        self.crypto = self.manager.crypto
+        self.fast = await FakeRconServer(password="secret").start()
+        self.slow = await FakeRconServer(password="secret", latency=0.1).start()
+        self.servers = [
+            FleetServer(1, "slow", self.slow.host, self.slow.port, self.crypto.encrypt("secret")),
+            FleetServer(2, "fast", self.fast.host, self.fast.port, self.crypto.encrypt("secret")),
+            FleetServer(3, "wrong", self.fast.host, self.fast.port, self.crypto.encrypt("wrong")),
+        ]
+
+    async def asyncTearDown(self):
+        self.manager.sessions.stop()
+        await rcon_pool.close_all()
+        rcon_breakers.stop()
+        await self.fast.stop()
+        await self.slow.stop()
+
+    async def test_results_arrive_as_completed(self):
+        """Тест что результаты приходят по мере готовности, а не по порядку"""
+        self.fast.responses["say"] = "ok"
+        self.slow.responses["say"] = "ok"
+
+        order = [
+            result.server.name
+            async for result in execute_on_servers(self.servers, "say hi", self.crypto, concurrency=3)
+        ]
+
+        self.assertEqual(order[-1], "slow")
+        self.assertEqual(sorted(order), ["fast", "slow", "wrong"])
+
+    async def test_concurrent_execution(self):
+        """Тест что серверы опрашиваются параллельно"""
+        servers = [
+            FleetServer(index, f"s{index}", self.slow.host, self.slow.port, self.crypto.encrypt("secret"))
+            for index in range(4)
+        ]
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        results = [result async for result in execute_on_servers(servers, "list", self.crypto, concurrency=4)]
+
+        self.assertEqual(len(results), 4)
+        self.assertLess(loop.time() - started, 0.35)
+
+    async def test_report(self):
+        """Тест текста отчета"""
+        results = {
+            result.server.id: result
+            async for result in execute_on_servers(self.servers, "say hi", self.crypto, concurrency=3)
+        }
+        text = format_fleet_report("say hi", self.servers, results, elapsed=0.5)
+
+        self.assertIn("❌ wrong", text)
+        self.assertIn("✅ fast", text)
+        self.assertIn("ошибок: 1/3", text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import asyncio
+import socket
+import struct
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from infrastructure.adapters.query_client import QueryClientAdapter, QueryError, query_cache
+
+
+class FakeQueryServer(asyncio.DatagramProtocol):
+    """UDP Query сервер: отвечает только на full stat с актуальным токеном"""
+
+    def __init__(self):
+        self.token = 9513307
+        self.handshakes = 0
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        packet_type, session = data[2], data[3:7]
+
+        if packet_type == 0x09:
+            self.handshakes += 1
+            self.transport.sendto(b"\x09" + session + str(self.token).encode() + b"\x00", addr)
+        elif packet_type == 0x00 and struct.unpack(">i", data[7:11])[0] == self.token:
+            values = {
+                "hostname": "A Minecraft Server",
+                "gametype": "SMP",
+                "version": "1.20.4",
+                "plugins": "Paper on 1.20.4: WorldEdit 7.2.15; Essentials 2.20",
+                "map": "world",
+                "numplayers": "2",
+                "maxplayers": "20",
+            }
+            body = b"".join(key.encode() + b"\x00" + value.encode() + b"\x00" for key, value in values.items())
+            players = b"Steve\x00Alex_01\x00\x00"
+            self.transport.sendto(
+                b"\x00" + session + b"splitnum\x00\x80\x00" + body + b"\x00\x01player_\x00\x00" + players,
+                addr
+            )
+
+
+class TestQueryClient(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        loop = asyncio.get_running_loop()
+        self.transport, self.server = await loop.create_datagram_endpoint(
+            FakeQueryServer, local_addr=("127.0.0.1", 0)
+        )
+        self.port = self.transport.get_extra_info("sockname")[1]
+        self.client = QueryClientAdapter("127.0.0.1", self.port, timeout=0.2, retries=3)
+
+    async def asyncTearDown(self):
+        self.transport.close()
+        query_cache.invalidate_token("127.0.0.1", self.port)
+        query_cache.mark_available("127.0.0.1", self.port)
+
+    async def test_full_stat(self):
+        """Тест разбора полной статистики"""
+        stat = await self.client.get_full_stat()
+
+        self.assertEqual(stat["players"], ["Steve", "Alex_01"])
+        self.assertEqual(stat["players_online"], 2)
+        self.assertEqual(stat["max_players"], 20)
+        self.assertEqual(stat["software"], "Paper on 1.20.4")
+        self.assertEqual(stat["plugins"], ["WorldEdit 7.2.15", "Essentials 2.20"])
+
+    async def test_token_is_cached(self):
+        """Тест что handshake не повторяется, пока токен актуален"""
+        await self.client.get_players()
+        await self.client.get_players()
+        self.assertEqual(self.server.handshakes, 1)
+
+    async def test_rotated_token_rehandshakes(self):
+        """Тест повторного handshake после смены токена сервером"""
+        await self.client.get_players()
+        self.server.token = 1234
+
+        online, _, _ = await self.client.get_players()
+        self.assertEqual(online, 2)
+        self.assertEqual(self.server.handshakes, 2)
+
+    async def test_unavailable_server(self):
+        """Тест отказа и запоминания недоступности"""
+        self.transport.close()
+        await asyncio.sleep(0)
+
+        with self.assertRaises(QueryError):
+            await self.client.get_full_stat()
+        self.assertFalse(self.client.is_available)
+
+    async def test_unresolvable_host(self):
+        """Тест что ошибка DNS превращается в QueryError (и /list уходит на RCON)"""
+        failing = AsyncMock(side_effect=socket.gaierror(-2, "Name or service not known"))
+        with patch("infrastructure.adapters.query_client.dns_cache.resolve", failing):
+            with self.assertRaises(QueryError):
+                await self.client.get_full_stat()
+        self.assertFalse(self.client.is_available)
+
+
+if __name__ == '__main__':
+    unittest.main()
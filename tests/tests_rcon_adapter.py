@@ -0,0 +1,326 @@
+import asyncio
+import socket
+import unittest
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+from rcon.exceptions import WrongPassword
+
+from config.settings import settings
+from infrastructure.adapters.rcon_client import RconClientAdapter
+from infrastructure.adapters.dns_resolver import dns_cache
+from infrastructure.adapters.rcon_pool import rcon_pool
+from infrastructure.adapters.rcon_circuit_breaker import CircuitOpenError, CircuitState, rcon_breakers
+from infrastructure.adapters.rcon_limiter import QueueTimeoutError, rcon_limiters
+from infrastructure.adapters.slp_client import server_list_ping
+from tests.fake_rcon_server import FakeRconServer
+
+
+class TestRconClientAdapter(unittest.IsolatedAsyncioTestCase):
+    """Адаптер против локального fake RCON сервера"""
+
+    async def asyncSetUp(self):
+        self.server = await FakeRconServer(password="secret").start()
+        self.client = RconClientAdapter(self.server.host, self.server.port, "secret")
+
+    async def asyncTearDown(self):
+        await rcon_pool.close_all()
+        rcon_breakers.stop()
+        await self.server.stop()
+
+    async def test_execute_command(self):
+        """Тест выполнения команды"""
+        response = await self.client.execute_command("seed")
+        self.assertEqual(response, "Seed: [-4172144997902289642]")
+
+    async def test_multi_packet_response(self):
+        """Тест сборки длинного ответа из нескольких пакетов"""
+        self.server.responses["help"] = "x" * 10_000
+        response = await self.client.execute_command("help")
+        self.assertEqual(len(response), 10_000)
+        self.assertEqual(self.server.framing_errors, 0)
+
+    async def test_several_commands_on_one_connection(self):
+        """Тест нескольких команд подряд на одном соединении, по пакету за чтение"""
+        self.server.responses["say"] = lambda command: command[4:]
+        responses = await self.client.execute_many(["say a", "say b", "say c"])
+
+        self.assertEqual(responses, ["a", "b", "c"])
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.server.framing_errors, 0)
+
+    async def test_connection_reused(self):
+        """Тест повторного использования соединения из пула"""
+        await self.client.execute_command("say one")
+        await self.client.execute_command("say two")
+
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.server.auth_attempts, 1)
+
+    async def test_wrong_password_not_retried(self):
+        """Тест что неверный пароль не повторяется"""
+        client = RconClientAdapter(self.server.host, self.server.port, "wrong")
+        with self.assertRaises(WrongPassword):
+            await client.execute_command("seed")
+        self.assertEqual(self.server.auth_attempts, 1)
+
+    async def test_unreachable_first_address_is_skipped(self):
+        """Тест что при недоступном первом адресе (IPv6 на dual-stack хосте) берется следующий"""
+        getaddrinfo = AsyncMock(return_value=[
+            (socket.AF_INET6, socket.SOCK_STREAM, 6, "", ("::1", 0, 0, 0)),
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", (self.server.host, 0)),
+        ])
+        self.addCleanup(dns_cache.invalidate, "dual-stack.test")
+        client = RconClientAdapter("dual-stack.test", self.server.port, "secret")
+
+        with patch.object(asyncio.get_running_loop(), "getaddrinfo", getaddrinfo):
+            response = await client.execute_command("seed")
+
+        self.assertIn("Seed", response)
+        getaddrinfo.assert_awaited_once()
+
+    async def test_idempotent_command_retried_after_drop(self):
+        """Тест повтора безопасной команды после обрыва соединения"""
+        self.server.drop_next = 2
+        with patch.object(settings, "RCON_RETRY_DELAY", 0):
+            response = await self.client.execute_command("version")
+
+        self.assertIn("Paper", response)
+        self.assertEqual(self.server.commands, ["version", "version", "version"])
+
+    async def test_mutating_command_not_retried_after_drop(self):
+        """Тест что изменяющая команда не повторяется после обрыва"""
+        self.server.drop_next = 1
+        with patch.object(settings, "RCON_RETRY_DELAY", 0):
+            success, _ = await self.client.send_command("say hello")
+
+        self.assertFalse(success)
+        self.assertEqual(self.server.commands, ["say hello"])
+
+    async def test_mutating_command_not_retried_on_warm_connection(self):
+        """Тест что пул не повторяет команду, дошедшую до сервера по соединению из пула"""
+        await self.client.execute_command("list")
+        self.server.drop_next = 1
+        with patch.object(settings, "RCON_RETRY_DELAY", 0):
+            success, _ = await self.client.send_command("ban griefer")
+
+        self.assertFalse(success)
+        self.assertEqual(self.server.commands, ["list", "ban griefer"])
+
+    async def test_retries_fit_into_deadline(self):
+        """Тест что все попытки вместе не выходят за deadline"""
+        self.server.command_latency["list"] = 5
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        with patch.object(settings, "RCON_TIMEOUT", 0.3), \
+                patch.object(settings, "RCON_MAX_RETRIES", 10), \
+                patch.object(settings, "RCON_RETRY_DELAY", 0):
+            with self.assertRaises(asyncio.TimeoutError):
+                await self.client.execute_command("list", deadline=0.5)
+
+        # Вторая попытка урезана до остатка deadline (0.2с вместо 0.3с)
+        elapsed = loop.time() - started
+        self.assertGreaterEqual(elapsed, 0.5)
+        self.assertLess(elapsed, 0.58)
+        self.assertEqual(self.server.commands, ["list", "list"])
+
+    async def test_deadline_covers_connect_and_command(self):
+        """Тест что deadline общий для подключения и команды, а не для каждого этапа"""
+        self.server.auth_latency = 0.3
+        self.server.command_latency["list"] = 0.3
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await self.client.execute_command("list", deadline=0.5)
+
+        self.assertLess(loop.time() - started, 0.58)
+
+    async def test_backoff_schedule(self):
+        """Тест экспоненциальной паузы между попытками с потолком RCON_RETRY_MAX_DELAY"""
+        self.server.drop_next = 2
+        jitter = MagicMock()
+        jitter.uniform.side_effect = lambda low, high: high
+
+        with patch.object(settings, "RCON_RETRY_DELAY", 0.01), \
+                patch.object(settings, "RCON_RETRY_MAX_DELAY", 0.015), \
+                patch("infrastructure.adapters.rcon_client.random", jitter):
+            response = await self.client.execute_command("version")
+
+        self.assertIn("Paper", response)
+        # Разброс полный: от 0 до 0.01 * 2 ** attempt, но не больше потолка
+        self.assertEqual(jitter.uniform.call_args_list, [call(0, 0.01), call(0, 0.015)])
+
+    async def test_trial_without_attempt_is_released(self):
+        """Тест что пробный запрос, не успевший выполниться, не блокирует предохранитель"""
+        breaker = rcon_breakers.get(self.server.host, self.server.port)
+        breaker.state = CircuitState.HALF_OPEN
+
+        with patch.object(settings, "RCON_MAX_RETRIES", 0):
+            with self.assertRaises(TimeoutError):
+                await self.client.execute_command("seed")
+
+        # Следующий запрос снова допускается как пробный и закрывает предохранитель
+        self.assertEqual(await self.client.execute_command("seed"), "Seed: [-4172144997902289642]")
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    async def test_open_circuit_does_not_take_queue_slot(self):
+        """Тест что при открытом предохранителе команда не занимает очередь и токен частоты"""
+        breaker = rcon_breakers.get(self.server.host, self.server.port)
+        for _ in range(settings.RCON_BREAKER_FAILURE_THRESHOLD):
+            breaker.record_failure(ConnectionRefusedError())
+
+        with self.assertRaises(CircuitOpenError):
+            await self.client.execute_command("seed")
+        status = await self.client.get_server_status(use_slp=False)
+
+        self.assertFalse(status["online"])
+        stats = rcon_limiters.get(self.server.host, self.server.port).get_stats()
+        self.assertEqual(stats["accepted"], 0)
+        self.assertEqual(self.server.commands, [])
+
+    async def test_read_after_mutation_is_not_stale(self):
+        """Тест что чтение после изменяющей команды не получает и не кэширует старый ответ"""
+        self.server.responses["list"] = ["alice,bob", "alice"]
+        self.server.command_latency["list"] = 0.2
+
+        # list отправлен до kick, но ответит после него
+        before = asyncio.create_task(self.client.execute_command("list"))
+        await asyncio.sleep(0.02)
+        await self.client.execute_command("kick bob")
+        after = await self.client.execute_command("list")
+
+        self.assertEqual(await before, "alice,bob")
+        self.assertEqual(after, "alice")
+        self.assertEqual(await self.client.execute_command("list"), "alice")
+        self.assertEqual(self.server.commands.count("list"), 2)
+
+    async def test_queue_wait_respects_deadline(self):
+        """Тест что команда не ждет очереди сервера дольше своего deadline"""
+        limiter = rcon_limiters.get(self.server.host, self.server.port)
+        release = asyncio.Event()
+
+        async def busy():
+            async with limiter.slot():
+                await release.wait()
+
+        holders = [asyncio.create_task(busy()) for _ in range(settings.RCON_MAX_CONCURRENCY)]
+        await asyncio.sleep(0)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            with self.assertRaises(QueueTimeoutError):
+                await self.client.execute_command("seed", deadline=0.3)
+            self.assertLess(loop.time() - started, 0.6)
+        finally:
+            release.set()
+            await asyncio.gather(*holders)
+
+        # Ожидание в очереди бота не считается отказом сервера
+        self.assertEqual(rcon_breakers.get(self.server.host, self.server.port).failures, 0)
+        self.assertEqual(self.server.commands, [])
+
+    async def test_server_status(self):
+        """Тест сбора статуса"""
+        status = await self.client.get_server_status()
+
+        self.assertTrue(status["online"])
+        self.assertEqual(status["players"], "0/20")
+        self.assertEqual(status["tps"], 20.0)
+        self.assertEqual(status["mspt"], 1.2)
+        self.assertEqual(status["flavor"], "paper")
+        self.assertEqual(status["errors"], {})
+
+    async def test_status_probes_run_in_parallel(self):
+        """Тест что статус собирается примерно за время одной пробы, а не их суммы"""
+        with patch.object(rcon_pool, "max_size", 5):
+            await self.client.get_server_status()
+            self.server.latency = 0.1
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+
+            status = await self.client.get_server_status()
+
+        self.assertEqual(status["errors"], {})
+        # Пять проб (list, version, tps, mspt, gc) по очереди заняли бы 0.5с
+        self.assertLess(loop.time() - started, 0.18)
+
+    async def test_first_status_sends_version_once(self):
+        """Тест что ответ version при определении разновидности используется и как проба"""
+        status = await self.client.get_server_status()
+
+        self.assertIn("Paper", status["version"])
+        self.assertEqual(self.server.commands.count("version"), 1)
+
+    async def test_forge_server_status(self):
+        """Тест метрик Forge сервера: разновидность определяется один раз"""
+        del self.server.responses["version"], self.server.responses["tps"], self.server.responses["gc"]
+        self.server.responses["forge"] = (
+            "Dim 0 (overworld): Mean tick time: 12.500 ms. Mean TPS: 20.000\n"
+            "Overall: Mean tick time: 55.000 ms. Mean TPS: 18.182"
+        )
+
+        status = await self.client.get_server_status()
+        first_commands = len(self.server.commands)
+        await self.client.get_server_status()
+
+        self.assertEqual(status["flavor"], "forge")
+        self.assertEqual(status["tps"], 18.182)
+        self.assertEqual(status["mspt"], 55.0)
+        self.assertEqual(sorted(self.server.commands[first_commands:]), ["forge tps", "list", "version"])
+
+    async def test_missing_plugin_keeps_flavor(self):
+        """Тест что Paper без Essentials (нет gc) не определяется заново при каждом опросе"""
+        del self.server.responses["gc"]
+
+        await self.client.get_server_status()
+        first_commands = len(self.server.commands)
+        status = await self.client.get_server_status()
+
+        self.assertEqual(status["flavor"], "paper")
+        self.assertEqual(status["errors"], {"memory": "Не поддерживается сервером"})
+        # version - только проба статуса, без повторного определения разновидности
+        self.assertEqual(self.server.commands[first_commands:].count("version"), 1)
+
+    async def test_server_status_via_slp(self):
+        """Тест статуса через Server List Ping: по RCON только TPS и память"""
+        slp = {"players": "3/20", "version": "Paper 1.20.4", "motd": "Hello", "latency_ms": 0.5}
+        with patch("infrastructure.adapters.rcon_client.server_list_ping", AsyncMock(return_value=slp)):
+            status = await self.client.get_server_status(use_slp=True)
+
+        self.assertEqual(status["players"], "3/20")
+        self.assertEqual(status["sources"]["players"], "slp")
+        self.assertEqual(status["sources"]["tps"], "rcon")
+        # version - однократное определение разновидности сервера
+        self.assertEqual(sorted(self.server.commands), ["gc", "mspt", "tps", "version"])
+
+    async def test_server_status_slp_fallback(self):
+        """Тест перехода на RCON, если SLP не ответил"""
+        failing = AsyncMock(side_effect=ConnectionRefusedError())
+        with patch("infrastructure.adapters.rcon_client.server_list_ping", failing):
+            status = await self.client.get_server_status(use_slp=True)
+
+        self.assertEqual(status["players"], "0/20")
+        self.assertEqual(status["sources"]["players"], "rcon")
+        self.assertIn("slp", status["errors"])
+
+
+class TestServerListPing(unittest.IsolatedAsyncioTestCase):
+    """Server List Ping поверх mcstatus"""
+
+    async def test_handshake_uses_hostname(self):
+        """Тест что в mcstatus передается имя хоста, а не IP из DNS кэша"""
+        server = MagicMock()
+        server.async_status = AsyncMock(return_value=MagicMock(latency=1.23))
+        with patch("infrastructure.adapters.slp_client.dns_cache.resolve",
+                   AsyncMock(return_value="203.0.113.7")), \
+                patch("infrastructure.adapters.slp_client.JavaServer", return_value=server) as java_server:
+            result = await server_list_ping("mc.example.org", 25565, timeout=2)
+
+        java_server.assert_called_once_with("mc.example.org", 25565, timeout=2)
+        self.assertEqual(result["latency_ms"], 1.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from domain.services.command_validator import CommandType
+from infrastructure.adapters.rcon_cache import ResponseCache
+
+SERVER = ("mc.example.com", 25575)
+OTHER_SERVER = ("mc2.example.com", 25575)
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResponseCache(
+            max_entries=3,
+            ttls={CommandType.SERVER_INFO: 5.0, CommandType.WORLD_MANAGEMENT: 1.0}
+        )
+
+    def test_put_and_get(self):
+        """Тест сохранения и получения ответа"""
+        self.cache.put(SERVER, "pw", "list", CommandType.SERVER_INFO, "There are 0/20 players online:")
+        self.assertEqual(self.cache.get(SERVER, "pw", "list"), "There are 0/20 players online:")
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+
+    def test_password_is_part_of_key(self):
+        """Тест что ответ не отдается с другим паролем"""
+        self.cache.put(SERVER, "pw", "list", CommandType.SERVER_INFO, "ok")
+        self.assertIsNone(self.cache.get(SERVER, "wrong", "list"))
+
+    def test_ttl_expiry(self):
+        """Тест истечения времени жизни по типу команды"""
+        self.cache.put(SERVER, "pw", "time query daytime", CommandType.WORLD_MANAGEMENT, "The time is 1000")
+
+        with patch("infrastructure.adapters.rcon_cache.time.monotonic", return_value=time.monotonic() + 2):
+            self.assertIsNone(self.cache.get(SERVER, "pw", "time query daytime"))
+
+    def test_type_without_ttl_is_not_cached(self):
+        """Тест что типы без TTL не кэшируются"""
+        self.cache.put(SERVER, "pw", "say hi", CommandType.OTHER, "")
+        self.assertIsNone(self.cache.get(SERVER, "pw", "say hi"))
+
+    def test_lru_eviction(self):
+        """Тест вытеснения давно не использованных записей"""
+        for command in ("list", "version", "seed"):
+            self.cache.put(SERVER, "pw", command, CommandType.SERVER_INFO, command)
+
+        self.cache.get(SERVER, "pw", "list")
+        self.cache.put(SERVER, "pw", "help", CommandType.SERVER_INFO, "help")
+
+        self.assertIsNone(self.cache.get(SERVER, "pw", "version"))
+        self.assertEqual(self.cache.get(SERVER, "pw", "list"), "list")
+        self.assertEqual(self.cache.get_stats()["evictions"], 1)
+
+    def test_invalidate_server(self):
+        """Тест сброса кэша сервера после изменяющей команды"""
+        self.cache.put(SERVER, "pw", "list", CommandType.SERVER_INFO, "a")
+        self.cache.put(OTHER_SERVER, "pw", "list", CommandType.SERVER_INFO, "b")
+
+        self.cache.invalidate_server(SERVER)
+
+        self.assertIsNone(self.cache.get(SERVER, "pw", "list"))
+        self.assertEqual(self.cache.get(OTHER_SERVER, "pw", "list"), "b")
+
+    def test_stale_generation_is_not_cached(self):
+        """Тест что ответ, полученный до изменения, не кэшируется"""
+        generation = self.cache.generation(SERVER)
+        self.cache.invalidate_server(SERVER)
+
+        self.cache.put(SERVER, "pw", "list", CommandType.SERVER_INFO, "old", generation=generation)
+        self.assertIsNone(self.cache.get(SERVER, "pw", "list"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+
+from infrastructure.adapters.rcon_circuit_breaker import (
+    CircuitBreaker, CircuitOpenError, CircuitState
+)
+
+
+class TestCircuitBreaker(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server_up = False
+        self.breaker = CircuitBreaker(
+            "mc.example.com", 25575,
+            probe=self.probe,
+            failure_threshold=2,
+            reset_timeout=0.01
+        )
+
+    async def asyncTearDown(self):
+        self.breaker.stop()
+
+    async def probe(self):
+        if not self.server_up:
+            raise ConnectionRefusedError("down")
+
+    async def test_opens_after_threshold(self):
+        """Тест открытия после нескольких ошибок подряд"""
+        self.breaker.record_failure(ConnectionRefusedError())
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+        self.breaker.record_failure(ConnectionRefusedError())
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+    async def test_success_resets_failures(self):
+        """Тест сброса счетчика после успешного запроса"""
+        self.breaker.record_failure(ConnectionRefusedError())
+        self.breaker.record_success()
+        self.breaker.record_failure(ConnectionRefusedError())
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    async def test_background_probe_half_opens_and_trial_closes(self):
+        """Тест восстановления через фоновую проверку и пробный запрос"""
+        self.breaker.record_failure(ConnectionRefusedError())
+        self.breaker.record_failure(ConnectionRefusedError())
+
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+        self.server_up = True
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.breaker.state, CircuitState.HALF_OPEN)
+
+        # Пропускается только один пробный запрос
+        self.breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.before_call()
+
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitState.CLOSED)
+
+    async def test_cancelled_trial_admits_next(self):
+        """Тест что после отмены пробного запроса допускается следующий"""
+        self.breaker.state = CircuitState.HALF_OPEN
+        self.assertTrue(self.breaker.before_call())
+        self.breaker.cancel_trial()
+        self.assertTrue(self.breaker.before_call())
+
+    async def test_failed_trial_reopens(self):
+        """Тест повторного открытия при неудачном пробном запросе"""
+        self.breaker.state = CircuitState.HALF_OPEN
+        self.breaker.before_call()
+        self.breaker.record_failure(ConnectionRefusedError())
+        self.assertEqual(self.breaker.state, CircuitState.OPEN)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+
+from infrastructure.adapters.rcon_coalescer import SingleFlight
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.flight = SingleFlight()
+        self.executions = 0
+
+    async def slow_call(self, value: str = "ok") -> str:
+        self.executions += 1
+        await asyncio.sleep(0.01)
+        return value
+
+    async def test_concurrent_calls_share_one_execution(self):
+        """Тест объединения одновременных одинаковых запросов"""
+        results = await asyncio.gather(*(
+            self.flight.do("list", self.slow_call) for _ in range(5)
+        ))
+
+        self.assertEqual(results, ["ok"] * 5)
+        self.assertEqual(self.executions, 1)
+        self.assertEqual(self.flight.get_stats()["shared"], 4)
+
+    async def test_different_keys_are_not_shared(self):
+        """Тест что разные ключи выполняются отдельно"""
+        await asyncio.gather(
+            self.flight.do("list", self.slow_call),
+            self.flight.do("version", self.slow_call),
+        )
+        self.assertEqual(self.executions, 2)
+
+    async def test_error_is_shared(self):
+        """Тест что ошибка передается всем ожидающим"""
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ConnectionRefusedError("down")
+
+        results = await asyncio.gather(
+            self.flight.do("list", failing),
+            self.flight.do("list", failing),
+            return_exceptions=True
+        )
+        self.assertTrue(all(isinstance(r, ConnectionRefusedError) for r in results))
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Тест что отмена одного ожидающего не отменяет запрос"""
+        first = asyncio.create_task(self.flight.do("list", self.slow_call))
+        second = asyncio.create_task(self.flight.do("list", self.slow_call))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        self.assertEqual(await second, "ok")
+
+    async def test_sequential_calls_execute_again(self):
+        """Тест что после завершения запрос выполняется заново"""
+        await self.flight.do("list", self.slow_call)
+        await self.flight.do("list", self.slow_call)
+        self.assertEqual(self.executions, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import struct
+import unittest
+
+from infrastructure.adapters.rcon_codec import (
+    SERVERDATA_EXECCOMMAND,
+    SERVERDATA_RESPONSE_VALUE,
+    PacketFormatError,
+    PacketReader,
+    encode_packet,
+)
+
+
+def make_packet(request_id: int, packet_type: int, payload: bytes) -> bytes:
+    body = struct.pack("<ii", request_id, packet_type) + payload + b"\x00\x00"
+    return struct.pack("<i", len(body)) + body
+
+
+class TestEncode(unittest.TestCase):
+
+    def test_encode_packet(self):
+        """Тест кодирования одного пакета"""
+        self.assertEqual(
+            encode_packet(7, SERVERDATA_EXECCOMMAND, b"list"),
+            make_packet(7, SERVERDATA_EXECCOMMAND, b"list")
+        )
+
+
+class TestPacketReader(unittest.TestCase):
+
+    def read_all(self, reader):
+        return [(request_id, packet_type, bytes(payload)) for request_id, packet_type, payload in reader.read_packets()]
+
+    def test_split_packet(self):
+        """Тест сборки пакета, пришедшего частями"""
+        reader = PacketReader(initial_size=8)
+        data = make_packet(1, SERVERDATA_RESPONSE_VALUE, b"hello") + make_packet(2, SERVERDATA_RESPONSE_VALUE, b"")
+
+        reader.feed(data[:5])
+        self.assertEqual(self.read_all(reader), [])
+
+        reader.feed(data[5:])
+        self.assertEqual(self.read_all(reader), [(1, 0, b"hello"), (2, 0, b"")])
+        self.assertEqual(reader.pending_bytes, 0)
+
+    def test_buffer_is_reused(self):
+        """Тест повторного использования буфера без роста"""
+        reader = PacketReader(initial_size=64)
+        packet = make_packet(3, SERVERDATA_RESPONSE_VALUE, b"x" * 20)
+
+        for _ in range(100):
+            reader.feed(packet)
+            self.assertEqual(self.read_all(reader), [(3, 0, b"x" * 20)])
+        self.assertEqual(len(reader._buffer), 64)
+
+    def test_payload_survives_growth(self):
+        """Тест что выданный memoryview не мешает росту буфера"""
+        reader = PacketReader(initial_size=16)
+        reader.feed(make_packet(1, SERVERDATA_RESPONSE_VALUE, b""))
+        payloads = [payload for _, _, payload in reader.read_packets()]
+
+        reader.feed(make_packet(2, SERVERDATA_RESPONSE_VALUE, b"y" * 100))
+        self.assertEqual(self.read_all(reader), [(2, 0, b"y" * 100)])
+        self.assertEqual(len(payloads), 1)
+
+    def test_invalid_size(self):
+        """Тест отказа на пакете с некорректным размером"""
+        reader = PacketReader()
+        reader.feed(struct.pack("<iii", 3, 1, 0))
+        with self.assertRaises(PacketFormatError):
+            self.read_all(reader)
+
+
+if __name__ == '__main__':
+    unittest.main()
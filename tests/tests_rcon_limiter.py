@@ -0,0 +1,150 @@
+import asyncio
+import unittest
+
+from bot.controllers.status_controller import format_queue_state
+from infrastructure.adapters.rcon_limiter import (
+    QueueTimeoutError, ServerBusyError, ServerLimiter, ServerLimiterRegistry, TokenBucket
+)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_burst_then_wait(self):
+        """Тест что после запаса токенов появляется ожидание"""
+        bucket = TokenBucket(rate=10, burst=2)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1, places=2)
+        self.assertAlmostEqual(bucket.reserve(), 0.2, places=2)
+
+    def test_zero_rate_is_unlimited(self):
+        """Тест отключения лимита нулевой частотой"""
+        bucket = TokenBucket(rate=0, burst=1)
+        for _ in range(10):
+            self.assertEqual(bucket.reserve(), 0)
+
+
+class TestServerLimiter(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrency_limit(self):
+        """Тест ограничения одновременных команд"""
+        limiter = ServerLimiter("mc.example.com", 25575, rate=0, burst=1, concurrency=2, queue_size=10)
+        running = 0
+        peak = 0
+
+        async def command():
+            nonlocal running, peak
+            async with limiter.slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(command() for _ in range(6)))
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(limiter.get_stats()["accepted"], 6)
+        self.assertEqual(limiter.get_stats()["max_queued"], 4)
+
+    async def test_full_queue_rejects(self):
+        """Тест отказа при заполненной очереди"""
+        limiter = ServerLimiter("mc.example.com", 25575, rate=0, burst=1, concurrency=1, queue_size=1)
+        release = asyncio.Event()
+
+        async def command():
+            async with limiter.slot():
+                await release.wait()
+
+        first = asyncio.create_task(command())
+        second = asyncio.create_task(command())
+        await asyncio.sleep(0)
+
+        with self.assertRaises(ServerBusyError):
+            async with limiter.slot():
+                pass
+
+        release.set()
+        await asyncio.gather(first, second)
+        self.assertEqual(limiter.get_stats()["rejected"], 1)
+        self.assertEqual(limiter.get_stats()["queued"], 0)
+
+    async def test_wait_is_bounded_by_timeout(self):
+        """Тест что ожидание места в очереди ограничено остатком deadline"""
+        limiter = ServerLimiter("mc.example.com", 25575, rate=0, burst=1, concurrency=1, queue_size=5)
+        release = asyncio.Event()
+
+        async def command():
+            async with limiter.slot():
+                await release.wait()
+
+        first = asyncio.create_task(command())
+        await asyncio.sleep(0)
+
+        started = asyncio.get_running_loop().time()
+        with self.assertRaises(QueueTimeoutError):
+            async with limiter.slot(timeout=0.05):
+                pass
+        self.assertLess(asyncio.get_running_loop().time() - started, 0.5)
+
+        release.set()
+        await first
+        stats = limiter.get_stats()
+        self.assertEqual((stats["timed_out"], stats["queued"], stats["active"]), (1, 0, 0))
+
+        # Место, которое ждала отмененная команда, не потеряно
+        async with limiter.slot(timeout=0.05):
+            pass
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Тест что отмененная команда освобождает место в очереди"""
+        limiter = ServerLimiter("mc.example.com", 25575, rate=0, burst=1, concurrency=1, queue_size=5)
+        release = asyncio.Event()
+
+        async def command():
+            async with limiter.slot():
+                await release.wait()
+
+        first = asyncio.create_task(command())
+        waiter = asyncio.create_task(command())
+        await asyncio.sleep(0)
+        self.assertEqual(limiter.queued, 1)
+
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        self.assertEqual(limiter.queued, 0)
+
+        release.set()
+        await first
+        self.assertEqual(limiter.active, 0)
+
+
+class TestServerLimiterRegistry(unittest.IsolatedAsyncioTestCase):
+
+    async def test_queue_depth_is_visible(self):
+        """Тест что глубина очереди сервера видна в /status"""
+        registry = ServerLimiterRegistry(rate=0, burst=1, concurrency=1, queue_size=5)
+        self.assertIsNone(registry.get_info("mc.example.com", 25575))
+        self.assertEqual(format_queue_state(None), "")
+
+        limiter = registry.get("mc.example.com", 25575)
+        release = asyncio.Event()
+
+        async def command():
+            async with limiter.slot():
+                await release.wait()
+
+        tasks = [asyncio.create_task(command()) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        queue = registry.get_info("mc.example.com", 25575)
+        self.assertEqual((queue["queued"], queue["active"]), (2, 1))
+        self.assertIn("2 ждут, 1 выполняются", format_queue_state(queue))
+        self.assertIn("mc.example.com:25575", registry.get_stats())
+
+        release.set()
+        await asyncio.gather(*tasks)
+        self.assertEqual(format_queue_state(registry.get_info("mc.example.com", 25575)), "")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+import asyncio
+import struct
+import unittest
+
+from infrastructure.adapters.rcon_protocol import RconProtocol, ResponseBuffer
+
+
+def make_packet(request_id: int, packet_type: int, payload: bytes) -> bytes:
+    body = struct.pack("<ii", request_id, packet_type) + payload + b"\x00\x00"
+    return struct.pack("<i", len(body)) + body
+
+
+class FakeTransport:
+    """Транспорт, который просто запоминает отправленные данные"""
+
+    def __init__(self):
+        self.written = bytearray()
+        self.writes = []
+        self.closed = False
+
+    def write(self, data: bytes):
+        self.written += data
+        self.writes.append(bytes(data))
+
+    def is_closing(self) -> bool:
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+def parse_requests(data: bytes):
+    """Разбирает отправленные клиентом пакеты на (id, type, payload)"""
+    packets = []
+    offset = 0
+    while offset < len(data):
+        size, request_id, packet_type = struct.unpack_from("<iii", data, offset)
+        payload = bytes(data[offset + 12:offset + 4 + size - 2])
+        packets.append((request_id, packet_type, payload))
+        offset += 4 + size
+    return packets
+
+
+async def settle():
+    """Дает протоколу обработать полученные пакеты и отправить следующие"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestResponseBuffer(unittest.TestCase):
+
+    def test_append_grows_buffer(self):
+        """Тест сборки ответа из нескольких фрагментов"""
+        buffer = ResponseBuffer(limit=100_000, initial_size=4)
+        buffer.append(b"hello ")
+        buffer.append(b"world")
+        self.assertEqual(buffer.decode(), "hello world")
+        self.assertFalse(buffer.truncated)
+
+    def test_limit_truncates(self):
+        """Тест обрезки ответа по лимиту"""
+        buffer = ResponseBuffer(limit=8)
+        buffer.append(b"abcdef")
+        buffer.append(b"ghijkl")
+        self.assertEqual(buffer.decode(), "abcdefgh")
+        self.assertTrue(buffer.truncated)
+
+    def test_multibyte_split_between_fragments(self):
+        """Тест символа UTF-8, разрезанного между пакетами"""
+        data = "Игроки онлайн".encode("utf-8")
+        buffer = ResponseBuffer(limit=1024)
+        buffer.append(data[:3])
+        buffer.append(data[3:])
+        self.assertEqual(buffer.decode(), "Игроки онлайн")
+
+
+class TestRconProtocol(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.protocol = RconProtocol()
+        self.transport = FakeTransport()
+        self.protocol.connection_made(self.transport)
+
+    async def test_one_packet_in_flight(self):
+        """Тест что каждый пакет уходит отдельной записью после ответа на предыдущий"""
+        task = asyncio.create_task(self.protocol.execute_many(["say a", "say b"]))
+        await settle()
+
+        # Пока сервер не ответил на первую команду, больше ничего не отправлено
+        self.assertEqual(len(self.transport.writes), 1)
+        [(first_id, first_type, first_payload)] = parse_requests(self.transport.writes[0])
+        self.assertEqual((first_type, first_payload), (2, b"say a"))
+
+        self.protocol.data_received(make_packet(first_id, 0, b""))
+        await settle()
+        self.assertEqual(len(self.transport.writes), 2)
+        [(sentinel_id, _, _)] = parse_requests(self.transport.writes[1])
+
+        self.protocol.data_received(make_packet(sentinel_id, 0, b"Unknown request 0"))
+        await settle()
+        self.assertEqual(len(self.transport.writes), 3)
+        [(second_id, _, second_payload)] = parse_requests(self.transport.writes[2])
+        self.assertEqual(second_payload, b"say b")
+
+        self.protocol.data_received(make_packet(second_id, 0, b"ok"))
+        await settle()
+        [(sentinel_id, _, _)] = parse_requests(self.transport.writes[3])
+        self.protocol.data_received(make_packet(sentinel_id, 0, b"Unknown request 0"))
+
+        self.assertEqual(await task, ["", "ok"])
+        self.assertTrue(all(len(parse_requests(data)) == 1 for data in self.transport.writes))
+
+    async def test_multi_packet_response_is_reassembled(self):
+        """Тест сборки ответа больше 4096 байт: маркер уходит отдельно, после первого фрагмента"""
+        task = asyncio.create_task(self.protocol.execute("help"))
+        await settle()
+        [(help_id, _, _)] = parse_requests(self.transport.writes[0])
+
+        chunk = b"x" * 4096
+        self.protocol.data_received(make_packet(help_id, 0, chunk))
+        await settle()
+        self.assertEqual(len(self.transport.writes), 2)
+        [(sentinel_id, sentinel_type, _)] = parse_requests(self.transport.writes[1])
+        self.assertEqual(sentinel_type, 0)
+
+        self.protocol.data_received(make_packet(help_id, 0, chunk) + make_packet(help_id, 0, b"end"))
+        await settle()
+        self.assertFalse(task.done())
+
+        # Ответ на маркер приходит частями
+        sentinel = make_packet(sentinel_id, 0, b"Unknown request 0")
+        self.protocol.data_received(sentinel[:5])
+        self.protocol.data_received(sentinel[5:])
+
+        self.assertEqual(len(await task), 4096 * 2 + 3)
+
+    async def test_cancelled_exchange_closes_connection(self):
+        """Тест что прерванный обмен закрывает соединение (в сокете остался пакет)"""
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(self.protocol.execute("list"), timeout=0.01)
+        self.assertTrue(self.transport.closed)
+
+    async def test_connection_lost_fails_pending(self):
+        """Тест обрыва соединения во время ожидания ответа"""
+        task = asyncio.create_task(self.protocol.execute("list"))
+        await asyncio.sleep(0)
+
+        self.protocol.connection_lost(None)
+
+        with self.assertRaises(ConnectionResetError):
+            await task
+        self.assertFalse(self.protocol.is_alive)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+
+from infrastructure.adapters.server_metrics import (
+    ServerFlavorCache, FLAVOR_FORGE, FLAVOR_PAPER, FLAVOR_SPIGOT, FLAVOR_UNKNOWN, FLAVOR_VANILLA,
+    clean_response, parse_bukkit_tps, parse_forge_tps, parse_memory, parse_paper_mspt, parse_tick_query
+)
+
+UNKNOWN = "Unknown or incomplete command, see below for error"
+
+
+class TestMetricParsers(unittest.TestCase):
+
+    def test_bukkit_tps(self):
+        response = clean_response("§6TPS from last 1m, 5m, 15m: §a*20.52, §a19.8, §e17.1")
+        self.assertEqual(parse_bukkit_tps(response), {"tps": 20.0})
+        self.assertIsNone(parse_bukkit_tps(UNKNOWN))
+
+    def test_paper_mspt(self):
+        response = clean_response(
+            "§6Server tick times §e(§7avg§e/§7min§e/§7max§e)§6 from last 5s§7,§6 10s§7,§6 1m§e:\n"
+            "§6◴ §a4.7§7/§a0.8§7/§a3.4§7, §a1.1§7/§a0.7§7/§a3.9"
+        )
+        self.assertEqual(parse_paper_mspt(response), {"mspt": 4.7})
+
+    def test_forge_tps(self):
+        response = (
+            "Dim  0 (overworld): Mean tick time: 1.500 ms. Mean TPS: 20.000\n"
+            "Overall: Mean tick time: 62.500 ms. Mean TPS: 16.000"
+        )
+        self.assertEqual(parse_forge_tps(response), {"tps": 16.0, "mspt": 62.5})
+        self.assertEqual(parse_forge_tps("Overall: 19.500 TPS (51.282 ms/tick)"), {"tps": 19.5, "mspt": 51.282})
+
+    def test_tick_query(self):
+        response = (
+            "The game is running normally\n"
+            "Target tick rate: 20.0 per second.\n"
+            "Average time per tick: 100.0ms (Target: 50.0ms)"
+        )
+        self.assertEqual(parse_tick_query(response), {"tps": 10.0, "mspt": 100.0})
+
+    def test_memory_and_uptime(self):
+        response = (
+            "Uptime: 1 day 2 hours 3 minutes 4 seconds\n"
+            "Maximum memory: 4,096 MB.\nAllocated memory: 2,048 MB.\nFree memory: 1,024 MB."
+        )
+        values = parse_memory(response)
+        self.assertEqual(values["memory"], {"used_mb": 1024, "total_mb": 4096})
+        self.assertEqual(values["uptime_seconds"], 93784)
+
+
+class TestFlavorDetection(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.cache = ServerFlavorCache()
+        self.commands = []
+
+    def executor(self, responses: dict):
+        async def execute(command: str) -> str:
+            self.commands.append(command)
+            return responses.get(command, UNKNOWN)
+        return execute
+
+    async def test_detect_from_version(self):
+        """Тест определения по ответу version"""
+        paper = self.executor({"version": "This server is running Purpur version 1.20.4-2176 (MC: 1.20.4)"})
+        spigot = self.executor({"version": "This server is running CraftBukkit version 4034-Spigot-a7a3e3b"})
+
+        self.assertEqual(await self.cache.detect("a", 1, paper), FLAVOR_PAPER)
+        self.assertEqual(await self.cache.detect("b", 1, spigot), FLAVOR_SPIGOT)
+
+    async def test_detect_neoforge(self):
+        """Тест NeoForge: сборщик использует команду, на которую сервер ответил"""
+        execute = self.executor({"neoforge tps": "Overall: 20.000 TPS (3.100 ms/tick)"})
+
+        self.assertEqual(await self.cache.detect("host", 25575, execute), FLAVOR_FORGE)
+        self.assertEqual(self.cache.get_collectors("host", 25575)["tps"].command, "neoforge tps")
+
+    async def test_detect_once(self):
+        """Тест что разновидность определяется один раз и сбрасывается по invalidate"""
+        execute = self.executor({"tick query": "Target tick rate: 20.0 per second.\nAverage time per tick: 2.0ms"})
+
+        self.assertEqual(await self.cache.detect("host", 25575, execute), FLAVOR_VANILLA)
+        await self.cache.detect("host", 25575, execute)
+        self.assertEqual(self.commands.count("version"), 1)
+
+        self.cache.invalidate("host", 25575)
+        await self.cache.detect("host", 25575, execute)
+        self.assertEqual(self.commands.count("version"), 2)
+
+    async def test_unknown(self):
+        """Тест сервера без поддерживаемых команд"""
+        self.assertEqual(await self.cache.detect("host", 25575, self.executor({})), FLAVOR_UNKNOWN)
+        self.assertEqual(self.cache.get_collectors("host", 25575)["tps"].command, "tps")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import asyncio
+import unittest
+from datetime import datetime, timedelta
+
+from domain.services.session_cache import SessionCache
+
+
+class TestSessionCache(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.now = datetime(2024, 1, 1, 12, 0, 0)
+        self.cache = SessionCache(max_size=3, purge_interval=0.01, clock=lambda: self.now)
+
+    async def asyncTearDown(self):
+        self.cache.stop()
+
+    def session(self, user_id: int, minutes: int = 60) -> dict:
+        return {"user_id": user_id, "expires_at": self.now + timedelta(minutes=minutes)}
+
+    async def test_hit_and_miss(self):
+        self.cache.put(1, self.session(1))
+
+        self.assertEqual(self.cache.get(1)["user_id"], 1)
+        self.assertIsNone(self.cache.get(2))
+        self.assertEqual(self.cache.get_stats()["hits"], 1)
+        self.assertEqual(self.cache.get_stats()["misses"], 1)
+
+    async def test_lru_eviction(self):
+        """Тест что при переполнении вытесняется давно не использованная сессия"""
+        for user_id in (1, 2, 3):
+            self.cache.put(user_id, self.session(user_id))
+        self.cache.get(1)
+        self.cache.put(4, self.session(4))
+
+        self.assertIsNone(self.cache.get(2))
+        self.assertIsNotNone(self.cache.get(1))
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache.get_stats()["evictions"], 1)
+
+    async def test_expired_session_is_not_returned(self):
+        self.cache.put(1, self.session(1, minutes=5))
+        self.now += timedelta(minutes=6)
+
+        self.assertIsNone(self.cache.get(1))
+        self.assertEqual(self.cache.get_stats()["expirations"], 1)
+
+    async def test_purge_in_expiry_order(self):
+        """Тест очистки: удаляются только истекшие, продленная сессия остается"""
+        self.cache.put(1, self.session(1, minutes=5))
+        self.cache.put(2, self.session(2, minutes=10))
+        self.cache.put(3, self.session(3, minutes=60))
+        # Продление: старый элемент кучи становится устаревшим
+        self.cache.put(1, self.session(1, minutes=120))
+
+        self.now += timedelta(minutes=30)
+
+        self.assertEqual(self.cache.purge_expired(), 1)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNotNone(self.cache.get(1))
+
+    async def test_background_purge(self):
+        self.cache.put(1, self.session(1, minutes=5))
+        self.now += timedelta(minutes=6)
+
+        await asyncio.sleep(0.05)
+
+        self.assertEqual(len(self.cache), 0)
+
+    async def test_on_remove_callback(self):
+        """Тест что об уходе записи из кэша сообщается при любой причине"""
+        removed = []
+        self.cache.on_remove = lambda user_id, session: removed.append(user_id)
+
+        for user_id in (1, 2, 3, 4):
+            self.cache.put(user_id, self.session(user_id, minutes=user_id))
+        self.cache.put(2, self.session(2, minutes=60))
+        self.cache.remove(3)
+        self.now += timedelta(minutes=10)
+        self.cache.purge_expired()
+
+        self.assertEqual(removed, [1, 2, 3, 4])
+
+    async def test_remove(self):
+        self.cache.put(1, self.session(1))
+
+        self.assertTrue(self.cache.remove(1))
+        self.assertFalse(self.cache.remove(1))
+        self.assertIsNone(self.cache.get(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from domain.services.session_manager import SessionManager
+from infrastructure.adapters.database import Database
+from infrastructure.adapters.rcon_pool import rcon_pool
+from infrastructure.adapters.rcon_circuit_breaker import rcon_breakers
+from tests.fake_rcon_server import FakeRconServer
+
+
+class TestSessionManager(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = Database(f"sqlite+aiosqlite:///{os.path.join(self.directory.name, 'bot.db')}")
+        await self.database.initialize()
+        self.server = await FakeRconServer(password="secret").start()
+        self.manager = SessionManager(self.database, negative_cache_ttl=60, activity_flush_interval=60)
+
+    async def asyncTearDown(self):
+        self.manager.sessions.stop()
+        await self.manager.activity.stop()
+        await rcon_pool.close_all()
+        rcon_breakers.stop()
+        await self.server.stop()
+        await self.database.close()
+        self.directory.cleanup()
+
+    async def test_unauthorized_user_is_cached(self):
+        """Тест что повторные проверки неавторизованного пользователя не идут в БД"""
+        for _ in range(5):
+            self.assertFalse(await self.manager.is_authorized(42))
+        self.assertIsNone(await self.manager.get_session(42))
+
+        stats = self.manager.get_stats()["unauthorized"]
+        self.assertEqual(stats["stores"], 1)
+        self.assertEqual(stats["hits"], 5)
+
+    async def test_create_session_invalidates_negative_entry(self):
+        """Тест что после входа пользователь сразу авторизован"""
+        self.assertFalse(await self.manager.is_authorized(42))
+
+        created = await self.manager.create_session(42, self.server.host, self.server.port, "secret")
+
+        self.assertTrue(created)
+        self.assertTrue(await self.manager.is_authorized(42))
+        self.assertEqual(self.manager.get_stats()["unauthorized"]["invalidations"], 1)
+
+    async def test_rcon_client_is_cached_per_session(self):
+        """Тест что команды используют один клиент без БД и расшифровки"""
+        await self.manager.create_session(42, self.server.host, self.server.port, "secret")
+
+        with patch.object(self.manager.database, "session_scope") as session_scope, \
+                patch.object(self.manager.crypto, "decrypt") as decrypt:
+            first = await self.manager.get_rcon_client(42)
+            second = await self.manager.get_rcon_client(42)
+
+        self.assertIs(first, second)
+        session_scope.assert_not_called()
+        decrypt.assert_not_called()
+        self.assertIn("Paper", await first.execute_command("version"))
+
+    async def test_rcon_client_after_restart_decrypts_once(self):
+        """Тест что после загрузки сессии из БД пароль расшифровывается один раз"""
+        await self.manager.create_session(42, self.server.host, self.server.port, "secret")
+        self.manager.sessions.clear()
+
+        with patch.object(self.manager.crypto, "decrypt", wraps=self.manager.crypto.decrypt) as decrypt:
+            client = await self.manager.get_rcon_client(42)
+            await self.manager.get_rcon_client(42)
+
+        self.assertEqual(decrypt.call_count, 1)
+        self.assertEqual(client.password, "secret")
+
+    async def test_logout_wipes_credentials(self):
+        """Тест что при выходе клиент и простаивающие соединения забываются"""
+        await self.manager.create_session(42, self.server.host, self.server.port, "secret")
+        client = await self.manager.get_rcon_client(42)
+        await client.execute_command("list")
+        key = (self.server.host, self.server.port, "secret")
+        self.assertTrue(rcon_pool._idle.get(key))
+
+        await self.manager.end_session(42)
+
+        self.assertFalse(rcon_pool._idle.get(key))
+        self.assertIsNone(await self.manager.get_rcon_client(42))
+        self.assertEqual(self.manager.get_stats()["rcon_clients"], 0)
+
+    async def test_logout_keeps_in_flight_client_working(self):
+        """Тест что выход не ломает клиента, которым еще пользуется обработчик"""
+        await self.manager.create_session(42, self.server.host, self.server.port, "secret")
+        client = await self.manager.get_rcon_client(42)
+
+        await self.manager.end_session(42)
+
+        self.assertEqual(client.password, "secret")
+        response = await client.execute_command("list")
+        self.assertNotIn("Ошибка", response)
+
+    async def test_auth_context_resolves_session_once(self):
+        """Тест что контекст авторизации собирается одной проверкой сессии"""
+        await self.manager.create_session(42, self.server.host, self.server.port, "secret")
+
+        with patch.object(self.manager, "get_session", wraps=self.manager.get_session) as get_session:
+            auth = await self.manager.get_auth_context(42)
+
+        get_session.assert_called_once_with(42)
+        self.assertEqual(auth.server["host"], self.server.host)
+        self.assertEqual(auth.server["port"], self.server.port)
+        self.assertIs(auth.rcon_client, await self.manager.get_rcon_client(42))
+        self.assertRegex(auth.remaining_time, r"^\d+ч \d+м$")
+        self.assertIsNone(await self.manager.get_auth_context(43))
+
+    async def last_activity(self, user_id):
+        async with self.database.session_scope() as repos:
+            session = await repos['sessions'].get_active_session(user_id)
+            return session.last_activity
+
+    async def test_activity_is_written_in_batches(self):
+        """Тест что проверка авторизации не пишет в БД, а активность сохраняется пачкой"""
+        for user_id in (42, 43):
+            await self.manager.create_session(user_id, self.server.host, self.server.port, "secret")
+        created_at = await self.last_activity(42)
+        self.manager.sessions.clear()
+
+        for _ in range(10):
+            self.assertTrue(await self.manager.is_authorized(42))
+        await self.manager.get_session(43)
+
+        self.assertEqual(await self.last_activity(42), created_at)
+        self.assertEqual(len(self.manager.activity), 2)
+
+        self.assertEqual(await self.manager.activity.flush(), 2)
+        self.assertGreater(await self.last_activity(42), created_at)
+        self.assertEqual(self.manager.get_stats()["activity"]["flushes"], 1)
+
+    async def test_activity_is_flushed_on_stop(self):
+        """Тест что при остановке накопленная активность дописывается"""
+        await self.manager.create_session(42, self.server.host, self.server.port, "secret")
+        created_at = await self.last_activity(42)
+        await self.manager.is_authorized(42)
+
+        await self.manager.activity.stop()
+
+        self.assertEqual(len(self.manager.activity), 0)
+        self.assertGreater(await self.last_activity(42), created_at)
+
+    async def test_stale_negative_result_is_not_stored(self):
+        """Тест что ответ БД, полученный до создания сессии, не запоминается"""
+        version = self.manager.unauthorized.version
+        self.manager.unauthorized.invalidate(42)
+        self.manager.unauthorized.add(42, version)
+
+        self.assertEqual(len(self.manager.unauthorized), 0)
+
+    async def test_session_from_previous_run_requires_new_login(self):
+        """Тест что сессия, зашифрованная другим ключом, завершается без ошибки"""
+        await self.manager.create_session(42, self.server.host, self.server.port, "secret")
+        # Перезапуск бота без постоянного ключа: новый менеджер, новый ключ
+        restarted = SessionManager(self.database, negative_cache_ttl=60, activity_flush_interval=60)
+        try:
+            self.assertIsNone(await restarted.get_auth_context(42))
+            self.assertIsNone(await restarted.get_rcon_client(42))
+            self.assertFalse(await restarted.is_authorized(42))
+        finally:
+            restarted.sessions.stop()
+            await restarted.activity.stop()
+
+        async with self.database.session_scope() as repos:
+            self.assertIsNone(await repos['sessions'].get_active_session(42))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+from domain.server_status import ServerStatus
+from domain.services.status_monitor import StatusMonitor, StatusSnapshot, MonitoredServer, to_server_status
+from infrastructure.adapters.crypto import CryptoService
+from infrastructure.adapters.database import Database
+from infrastructure.adapters.rcon_pool import rcon_pool
+from infrastructure.adapters.rcon_circuit_breaker import rcon_breakers
+from infrastructure.adapters.rcon_cache import rcon_response_cache
+from bot.utils.status import format_age, format_status_lines
+from tests.fake_rcon_server import FakeRconServer
+
+
+class TestStatusMonitor(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.database = Database(f"sqlite+aiosqlite:///{os.path.join(self.directory.name, 'bot.db')}")
+        await self.database.initialize()
+
+        self.crypto = CryptoService()
+        self.first = await FakeRconServer(password="secret", latency=0.05).start()
+        self.second = await FakeRconServer(password="secret", latency=0.05).start()
+
+        async with self.database.session_scope() as repos:
+            first = await repos['servers'].save_server(1, self.first.host, self.first.port, self.crypto.encrypt("secret"))
+            second = await repos['servers'].save_server(2, self.second.host, self.second.port, self.crypto.encrypt("secret"))
+            self.first_id, self.second_id = first.id, second.id
+
+        self.monitor = StatusMonitor(self.database, interval=0.2, concurrency=2, min_interval=0.05, idle_factor=1,
+                                     crypto=self.crypto)
+
+    async def asyncTearDown(self):
+        await self.monitor.stop()
+        await rcon_pool.close_all()
+        rcon_breakers.stop()
+        rcon_response_cache.clear()
+        await self.first.stop()
+        await self.second.stop()
+        await self.database.close()
+        self.directory.cleanup()
+
+    async def wait_for_snapshots(self, *server_ids):
+        for _ in range(100):
+            if all(self.monitor.get(server_id) for server_id in server_ids):
+                return
+            await asyncio.sleep(0.02)
+        self.fail("Серверы не опрошены")
+
+    async def test_background_poll_fills_cache(self):
+        """Тест что фоновый опрос сохраняет статус каждого сервера"""
+        self.first.responses["list"] = "There are 2 of a max of 20 players online: Steve, Alex"
+        self.assertIsNone(self.monitor.get(self.first_id))
+
+        self.monitor.start()
+        await self.wait_for_snapshots(self.first_id, self.second_id)
+
+        snapshot = self.monitor.get(self.first_id)
+        self.assertTrue(snapshot.status.is_online)
+        self.assertEqual(snapshot.status.player_count, 2)
+        self.assertEqual(snapshot.status.max_players, 20)
+        self.assertEqual(self.monitor.get_stats()["online"], 2)
+        self.assertEqual(snapshot.status.tps, 20.0)
+        self.assertEqual(snapshot.status.memory_used_mb, 1024)
+
+    async def test_stats_are_persisted(self):
+        """Тест что замеры сохраняются в историю"""
+        server = MonitoredServer(self.first_id, self.first.host, self.first.port, self.crypto.encrypt("secret"))
+        await self.monitor.refresh(server)
+
+        async with self.database.session_scope() as repos:
+            stats = await repos['stats'].get_server_stats(self.first_id)
+
+        self.assertEqual(len(stats), 1)
+        self.assertTrue(stats[0].online)
+        self.assertEqual(stats[0].tps, 200)
+        self.assertEqual(stats[0].memory_used_mb, 1024)
+
+    async def test_offline_server(self):
+        """Тест что недоступный сервер попадает в кэш как offline"""
+        await self.second.stop()
+        self.monitor.start()
+        await self.wait_for_snapshots(self.second_id)
+
+        snapshot = self.monitor.get(self.second_id)
+        self.assertFalse(snapshot.status.is_online)
+        self.assertIn("Offline", format_status_lines(snapshot))
+
+    async def test_servers_are_polled_repeatedly(self):
+        """Тест что серверы опрашиваются снова по расписанию"""
+        self.monitor.start()
+        await asyncio.sleep(1)
+
+        self.assertGreaterEqual(self.monitor.get_stats()["probes"], 4)
+
+    async def test_queue_lag(self):
+        """Тест что задержка очереди растет, когда опросы не успевают"""
+        self.first.latency = self.second.latency = 0.3
+        monitor = StatusMonitor(self.database, interval=0.05, concurrency=1, min_interval=0.05, crypto=self.crypto)
+        monitor.start()
+        await asyncio.sleep(0.5)
+        stats = monitor.get_stats()
+        await monitor.stop()
+
+        self.assertGreaterEqual(stats["overdue"], 1)
+        self.assertGreater(stats["lag_pending"], 0.1)
+
+    async def test_concurrent_refresh_is_shared(self):
+        """Тест что одновременные запросы статуса используют один опрос"""
+        server = MonitoredServer(self.first_id, self.first.host, self.first.port, self.crypto.encrypt("secret"))
+
+        first, second = await asyncio.gather(self.monitor.refresh(server), self.monitor.refresh(server))
+
+        self.assertIs(first, second)
+
+    async def test_server_removed_during_probe(self):
+        """Тест что опрос удаленного сервера не оставляет снимок и запись в истории"""
+        await self.monitor._reload_servers()
+        probe = asyncio.create_task(self.monitor.refresh(self.monitor._servers[self.first_id]))
+        await asyncio.sleep(0.01)
+
+        remaining = [self.monitor._servers[self.second_id]]
+        with patch.object(self.monitor, "_load_servers", AsyncMock(return_value=remaining)):
+            await self.monitor._reload_servers()
+        await probe
+
+        self.assertIsNone(self.monitor.get(self.first_id))
+        self.assertEqual(self.monitor.get_stats()["online"], 0)
+        async with self.database.session_scope() as repos:
+            self.assertEqual(await repos['stats'].get_server_stats(self.first_id), [])
+
+    async def test_unmonitored_snapshot_is_dropped_on_reload(self):
+        """Тест что снимок сервера вне мониторинга удаляется при синхронизации"""
+        server = MonitoredServer(999, self.first.host, self.first.port, self.crypto.encrypt("secret"))
+        await self.monitor.refresh(server)
+        self.assertIsNotNone(self.monitor.get(999))
+
+        await self.monitor._reload_servers()
+
+        self.assertIsNone(self.monitor.get(999))
+        self.assertEqual(self.monitor.get_stats()["online"], 0)
+
+    def test_adaptive_interval(self):
+        """Тест что частота опроса зависит от состояния сервера"""
+        def snapshot(online=True, players=0, tps=20.0):
+            status = ServerStatus(online, players, 20, tps, 0, 0, 0, datetime.now())
+            return StatusSnapshot(1, status, {"tps": tps}, 0)
+
+        monitor = StatusMonitor(None, interval=100, min_interval=10, idle_factor=3,
+                                tps_warning=15, tps_critical=10, crypto=self.crypto)
+
+        self.assertAlmostEqual(monitor.next_interval(snapshot(players=5)), 100, delta=10)
+        self.assertAlmostEqual(monitor.next_interval(snapshot(players=0)), 300, delta=30)
+        self.assertAlmostEqual(monitor.next_interval(snapshot(online=False)), 300, delta=30)
+        self.assertAlmostEqual(monitor.next_interval(snapshot(players=5, tps=12)), 50, delta=5)
+        self.assertAlmostEqual(monitor.next_interval(snapshot(players=5, tps=5)), 25, delta=2.5)
+
+    def test_to_server_status(self):
+        """Тест преобразования результата опроса в ServerStatus"""
+        status = to_server_status({
+            "online": True, "players": "3/10", "tps": None,
+            "memory": {"used_mb": 512, "total_mb": None}
+        })
+
+        self.assertEqual((status.player_count, status.max_players), (3, 10))
+        self.assertEqual(status.tps, 0.0)
+        self.assertEqual(status.memory_total_mb, 0)
+
+    def test_format_age(self):
+        self.assertEqual(format_age(5), "только что")
+        self.assertEqual(format_age(150), "2 мин назад")
+        self.assertEqual(format_age(7300), "2 ч назад")
+
+
+if __name__ == '__main__':
+    unittest.main()